@@ -0,0 +1,100 @@
+# =========================================================
+# IMPORT TIME BUDGET
+# =========================================================
+# Imports a module in a fresh interpreter with -X importtime and reports
+# how much of the cold start is ccxt (out of the adapter's hands) and how
+# much the adapter adds on top. With --check the run fails when the
+# adapter's share exceeds --budget-ms or a module that must stay lazy
+# (aiohttp, solders, numpy, ...) got imported.
+#
+#   python -m benchmarks.importtime --check
+#   python -m benchmarks.importtime --module pacifica_ccxt_adapter.async_support --allow aiohttp --budget-ms 150
+
+import argparse
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# loaded on first use only, never by importing the sync exchange class
+LAZY = ("aiohttp", "solders", "numpy", "dotenv", "coincurve", "base58", "opentelemetry")
+
+
+def import_times(module: str) -> Tuple[List[Tuple[int, str, int]], List[str]]:
+    """``(depth, name, cumulative_us)`` per import of one cold start, plus every module loaded."""
+    code = f"import sys, {module}; print(','.join(sorted(sys.modules)))"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((depth, name.strip(), int(cumulative_us)))
+    return rows, proc.stdout.strip().split(",")
+
+
+def ccxt_share(rows: List[Tuple[int, str, int]]) -> int:
+    """Microseconds spent in ccxt packages, counting nested ccxt imports once."""
+    total, stack = 0, []
+    # importtime prints children before their parent, walk it parent first
+    for depth, name, cumulative_us in reversed(rows):
+        while stack and stack[-1][0] >= depth:
+            stack.pop()
+        is_ccxt = name == "ccxt" or name.startswith("ccxt.")
+        if is_ccxt and not any(ancestor for _, ancestor in stack):
+            total += cumulative_us
+        stack.append((depth, is_ccxt))
+    return total
+
+
+def measure(module: str, runs: int) -> Dict:
+    total, ccxt, adapter = [], [], []
+    loaded: List[str] = []
+    for _ in range(runs):
+        rows, loaded = import_times(module)
+        module_us = next(us for depth, name, us in rows if name == module)
+        ccxt_us = ccxt_share(rows)
+        total.append(module_us / 1000)
+        ccxt.append(ccxt_us / 1000)
+        adapter.append((module_us - ccxt_us) / 1000)
+    lazy = sorted({name.split(".")[0] for name in loaded} & set(LAZY))
+    return {
+        "module": module,
+        "total_ms": statistics.median(total),
+        "ccxt_ms": statistics.median(ccxt),
+        "adapter_ms": statistics.median(adapter),
+        "eager": lazy,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Cold import time of the Pacifica adapter")
+    parser.add_argument("--module", default="pacifica_ccxt_adapter.Pacifica")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters, the median is reported")
+    parser.add_argument("--budget-ms", type=float, default=100.0, help="import time allowed on top of ccxt")
+    parser.add_argument("--allow", nargs="*", default=[], help="lazy modules this import may load")
+    parser.add_argument("--check", action="store_true", help="exit 1 when over budget")
+    args = parser.parse_args(argv)
+
+    result = measure(args.module, args.runs)
+    print(f"{result['module']}: {result['total_ms']:.1f} ms total, "
+          f"{result['ccxt_ms']:.1f} ms ccxt, {result['adapter_ms']:.1f} ms adapter "
+          f"(budget {args.budget_ms:.0f} ms)")
+
+    failures = []
+    if result["adapter_ms"] > args.budget_ms:
+        failures.append(f"adapter import takes {result['adapter_ms']:.1f} ms, budget {args.budget_ms:.0f} ms")
+    eager = [name for name in result["eager"] if name not in args.allow]
+    if eager:
+        failures.append(f"imported eagerly: {', '.join(eager)}")
+    for failure in failures:
+        print("OVER BUDGET", failure, file=sys.stderr)
+    return 1 if args.check and failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
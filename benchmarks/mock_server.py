@@ -0,0 +1,383 @@
+# =========================================================
+# LOCAL PACIFICA STAND-IN (REST + WEBSOCKET)
+# =========================================================
+# Serves the endpoints the adapter calls with synthetic data so the
+# benchmarks run offline. Latency and payload sizes are configurable and
+# every request is counted per endpoint.
+
+import asyncio
+import json
+import random
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from aiohttp import WSMsgType, web
+
+BASE_TIME = 1700000000000
+MINUTE = 60000
+
+
+@dataclass
+class MockConfig:
+    latency: float = 0.0  # seconds added to every REST response
+    jitter: float = 0.0  # +/- seconds of uniform noise on top of latency
+    markets: int = 50  # rows in /info and /info/prices
+    open_orders: int = 20
+    positions: int = 5
+    trades: int = 100
+    kline_cap: int = 1000  # candles per /kline response at most
+    funding_rows: int = 1000  # total /funding_rate/history rows across all pages
+    history_rows: int = 1000  # rows of /trades/history, /orders/history and /funding/history
+    book_levels: int = 20  # levels per side of /book and the book stream, 1.0 each, 0.01 apart
+    ws_interval: float = 0.01  # seconds between pushed websocket frames per subscription
+
+
+class MockPacifica:
+    """aiohttp app answering like the Pacifica REST API and websocket.
+
+    ``start()`` runs it on a background thread; ``url`` / ``ws_url`` are
+    the values for the adapter's ``baseUrl`` / ``wsUrl`` config keys.
+    """
+
+    def __init__(self, config: Optional[MockConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or MockConfig()
+        self.host = host
+        self.port = port
+        self.counts: Counter = Counter()
+        self.symbols = ["BTC", "ETH", "SOL", "SUI"] + [f"M{i}" for i in range(max(0, self.config.markets - 4))]
+        self.symbols = self.symbols[:max(1, self.config.markets)]
+        self._next_order_id = 1000
+        self._orders: Dict[int, Dict] = {}
+        self._filled: Dict[int, Dict] = {}  # orders no longer open, final state for /orders/history*
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._runner: Optional[web.AppRunner] = None
+        self._thread: Optional[threading.Thread] = None
+        self._seed_orders()
+
+    # -----------------------------------------------------
+    # lifecycle
+    # -----------------------------------------------------
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/api/v1"
+
+    @property
+    def ws_url(self) -> str:
+        return f"ws://{self.host}:{self.port}/ws"
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/ws", self._ws)
+        app.router.add_route("*", "/api/v1/{endpoint:.*}", self._rest)
+        return app
+
+    def start(self) -> "MockPacifica":
+        started = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            self._runner = web.AppRunner(self.app(), access_log=None)
+            self._loop.run_until_complete(self._runner.setup())
+            site = web.TCPSite(self._runner, self.host, self.port)
+            self._loop.run_until_complete(site.start())
+            self.port = site._server.sockets[0].getsockname()[1]
+            started.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name="mock-pacifica", daemon=True)
+        self._thread.start()
+        started.wait()
+        return self
+
+    def stop(self):
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop = None
+
+    def reset_counts(self):
+        self.counts.clear()
+
+    # -----------------------------------------------------
+    # synthetic data
+    # -----------------------------------------------------
+    def _seed_orders(self):
+        for i in range(self.config.open_orders):
+            self._add_order(self.symbols[i % len(self.symbols)], "bid" if i % 2 else "ask", "1", "1", f"seed-{i}")
+
+    def _add_order(self, symbol: str, side: str, price: str, amount: str, client_order_id: Optional[str]) -> int:
+        order_id = self._next_order_id
+        self._next_order_id += 1
+        self._orders[order_id] = {
+            "order_id": order_id,
+            "client_order_id": client_order_id,
+            "symbol": symbol,
+            "side": side,
+            "price": price,
+            "initial_amount": amount,
+            "filled_amount": "0",
+            "cancelled_amount": "0",
+            "order_type": "limit",
+            "stop_price": None,
+            "reduce_only": False,
+            "created_at": BASE_TIME,
+            "updated_at": BASE_TIME,
+        }
+        return order_id
+
+    def _ioc(self, symbol: str, side: str, price: str, amount: str, client_order_id: Optional[str]) -> int:
+        # fill against the synthetic book, cancel the rest
+        order_id = self._add_order(symbol, side, price, amount, client_order_id)
+        order = self._orders.pop(order_id)
+        bids, asks = self._book_levels()
+        levels = asks if side == "bid" else bids
+        wanted, filled, cost = float(amount), 0.0, 0.0
+        for level in levels:
+            p = float(level["p"])
+            if filled >= wanted or (p > float(price) if side == "bid" else p < float(price)):
+                break
+            take = min(float(level["a"]), wanted - filled)
+            filled += take
+            cost += take * p
+        order.update({
+            "order_type": "limit", "filled_amount": str(filled), "cancelled_amount": str(wanted - filled),
+            "average_filled_price": str(cost / filled) if filled else "0",
+            "order_status": "filled" if filled >= wanted else "cancelled",
+        })
+        self._filled[order_id] = order
+        return order_id
+
+    def close_order(self, order_id: int, status: str = "filled") -> Dict:
+        """Move an open order to the order history as ``filled`` or ``cancelled``."""
+        order = self._orders.pop(order_id)
+        amount = order["initial_amount"]
+        order.update({
+            "filled_amount": amount if status == "filled" else "0",
+            "cancelled_amount": "0" if status == "filled" else amount,
+            "average_filled_price": order["price"] if status == "filled" else "0",
+            "order_status": status,
+        })
+        self._filled[order_id] = order
+        return order
+
+    def _book_levels(self) -> List[List[Dict]]:
+        n = self.config.book_levels
+        return [
+            [{"p": str(round(100 - i * 0.01, 2)), "a": "1.0", "n": 1} for i in range(n)],
+            [{"p": str(round(100.01 + i * 0.01, 2)), "a": "1.0", "n": 1} for i in range(n)],
+        ]
+
+    def _info(self) -> List[Dict]:
+        return [{
+            "symbol": s, "tick_size": "0.01", "lot_size": "0.001", "min_order_size": "10",
+            "max_order_size": "1000000", "min_tick": "0", "max_tick": "1000000",
+            "max_leverage": 20, "isolated_only": False,
+            "funding_rate": "0.0001", "next_funding_rate": "0.0001",
+        } for s in self.symbols]
+
+    def _prices(self) -> List[Dict]:
+        return [{
+            "symbol": s, "mark": "100.0", "mid": "100.01", "oracle": "100.0", "timestamp": BASE_TIME,
+            "volume_24h": "1000", "open_interest": "10", "yesterday_price": "99",
+            "funding": "0.0001", "next_funding": "0.00012",
+        } for s in self.symbols]
+
+    def _positions(self) -> List[Dict]:
+        return [{
+            "symbol": self.symbols[i % len(self.symbols)], "side": "bid" if i % 2 else "ask",
+            "amount": "1.5", "entry_price": "98.0", "margin": None, "funding": "0", "isolated": False,
+            "created_at": BASE_TIME, "updated_at": BASE_TIME,
+        } for i in range(self.config.positions)]
+
+    def _settings(self) -> List[Dict]:
+        return [{"symbol": s, "isolated": False, "leverage": 10} for s in self.symbols[:self.config.positions]]
+
+    def _account(self) -> Dict:
+        return {
+            "balance": "10000", "account_equity": "10050", "available_to_spend": "9000",
+            "total_margin_used": "1000", "positions_count": self.config.positions,
+            "orders_count": len(self._orders), "fee_level": 0,
+        }
+
+    def _klines(self, q) -> List[Dict]:
+        start, end = int(q["start_time"]), int(q.get("end_time", int(q["start_time"]) + self.config.kline_cap * MINUTE))
+        first = start - start % MINUTE + (MINUTE if start % MINUTE else 0)
+        return [{
+            "t": t, "T": t + MINUTE - 1, "s": q["symbol"], "i": q.get("interval", "1m"),
+            "o": "100", "h": "101", "l": "99", "c": "100.5", "v": "12.5", "n": 7,
+        } for t in range(first, end, MINUTE)][:self.config.kline_cap]
+
+    def _trades(self) -> List[Dict]:
+        return [{
+            "trade_id": i, "order_id": 1000 + i, "symbol": self.symbols[i % len(self.symbols)],
+            "side": "open_long" if i % 2 else "close_long", "price": "100.0", "size": "0.5",
+            "fee": "0.01", "timestamp": BASE_TIME / 1000 - i,
+        } for i in range(self.config.trades)]
+
+    def _funding_page(self, q) -> Dict:
+        cursor, limit = int(q.get("cursor", 0)), int(q.get("limit", 100))
+        end = min(cursor + limit, self.config.funding_rows)
+        rows = [{
+            "oracle_price": "100", "bid_impact_price": "99.9", "ask_impact_price": "100.1",
+            "funding_rate": "0.0001", "next_funding_rate": "0.0001",
+            "created_at": BASE_TIME - i * 3600000,
+        } for i in range(cursor, end)]
+        more = end < self.config.funding_rows
+        return {"success": True, "data": rows, "next_cursor": str(end) if more else None, "has_more": more}
+
+    def _history_row(self, endpoint: str, i: int) -> Dict:
+        # row i is i minutes older than BASE_TIME, newest first; order ids are
+        # apart from the live orders' (which start at 1000)
+        symbol, created_at = self.symbols[i % len(self.symbols)], BASE_TIME - i * MINUTE
+        if endpoint == "/trades/history":
+            return {
+                "history_id": i, "order_id": 900000 + i, "client_order_id": None, "symbol": symbol,
+                "amount": "0.5", "price": "100", "entry_price": "99", "fee": "0.01", "pnl": "0",
+                "event_type": "fulfill_taker", "side": "open_long", "created_at": created_at, "cause": "normal",
+            }
+        if endpoint == "/funding/history":
+            return {
+                "history_id": i, "symbol": symbol, "side": "bid", "amount": "1.5",
+                "payout": "-0.015", "rate": "0.0001", "created_at": created_at,
+            }
+        return {
+            "history_id": i, "order_id": 900000 + i, "client_order_id": None, "symbol": symbol,
+            "side": "bid", "price": "100", "initial_amount": "1", "filled_amount": "1",
+            "cancelled_amount": "0", "order_type": "limit", "order_status": "filled",
+            "reduce_only": False, "created_at": created_at, "updated_at": created_at,
+        }
+
+    def _history_page(self, endpoint: str, q) -> Dict:
+        # /orders/history starts with the orders closed on this server, newest first
+        closed = [{**o, "history_id": o["order_id"]} for o in reversed(self._filled.values())] if endpoint == "/orders/history" else []
+        total = len(closed) + self.config.history_rows
+        cursor, limit = int(q.get("cursor", 0)), int(q.get("limit", 100))
+        end = min(cursor + limit, total)
+        rows = [closed[i] if i < len(closed) else self._history_row(endpoint, i - len(closed)) for i in range(cursor, end)]
+        more = end < total
+        return {"success": True, "data": rows, "next_cursor": str(end) if more else None, "has_more": more}
+
+    # -----------------------------------------------------
+    # handlers
+    # -----------------------------------------------------
+    @staticmethod
+    def _ok(data) -> web.Response:
+        return web.json_response({"success": True, "data": data})
+
+    async def _rest(self, request: web.Request) -> web.Response:
+        endpoint = "/" + request.match_info["endpoint"]
+        self.counts[f"{request.method} {endpoint}"] += 1
+        delay = self.config.latency + random.uniform(-self.config.jitter, self.config.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        q = request.query
+        if request.method == "GET":
+            if endpoint == "/info":
+                return self._ok(self._info())
+            if endpoint == "/info/prices":
+                return self._ok(self._prices())
+            if endpoint == "/orders":
+                return self._ok(list(self._orders.values()))
+            if endpoint in ("/orders/history", "/trades/history", "/funding/history"):
+                return web.json_response(self._history_page(endpoint, q))
+            if endpoint == "/orders/history_by_id":
+                order = self._filled.get(int(q.get("order_id", 0)))
+                return self._ok([order] if order else [])
+            if endpoint == "/book":
+                return self._ok({"s": q.get("symbol", "BTC"), "t": BASE_TIME, "l": self._book_levels()})
+            if endpoint == "/positions":
+                return self._ok(self._positions())
+            if endpoint == "/account":
+                return self._ok(self._account())
+            if endpoint == "/account/settings":
+                return self._ok(self._settings())
+            if endpoint == "/kline":
+                return self._ok(self._klines(q))
+            if endpoint == "/funding_rate/history":
+                return web.json_response(self._funding_page(q))
+            return web.json_response({"success": False, "error": f"unknown endpoint {endpoint}"}, status=404)
+
+        body = await request.json()
+        if endpoint == "/orders/create":
+            create = self._ioc if body.get("tif") == "ioc" else self._add_order
+            order_id = create(body["symbol"], body["side"], body.get("price", "0"), body["amount"], body.get("client_order_id"))
+            return self._ok({"order_id": order_id})
+        if endpoint == "/cancel":
+            if int(body.get("order_id", 0)) in self._orders:
+                self.close_order(int(body["order_id"]), "cancelled")
+            return self._ok({})
+        if endpoint == "/orders/batch":
+            results = []
+            for action in body["actions"]:
+                data = action["data"]
+                if action["type"] == "Create":
+                    order_id = self._add_order(data["symbol"], data["side"], data.get("price", "0"), data["amount"], data.get("client_order_id"))
+                    results.append({"success": True, "order_id": order_id, "error": None})
+                elif int(data.get("order_id", 0)) in self._orders:
+                    self.close_order(int(data["order_id"]), "cancelled")
+                    results.append({"success": True, "order_id": data.get("order_id"), "error": None})
+                else:
+                    results.append({"success": False, "order_id": data.get("order_id"), "error": "Order not found"})
+            return self._ok({"results": results})
+        if endpoint == "/account/leverage":
+            return self._ok({})
+        if endpoint == "/trades":
+            return self._ok(self._trades())
+        return web.json_response({"success": False, "error": f"unknown endpoint {endpoint}"}, status=404)
+
+    async def _ws(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        pushers = []
+        try:
+            async for msg in ws:
+                if msg.type != WSMsgType.TEXT:
+                    continue
+                message = json.loads(msg.data)
+                self.counts[f"WS {message.get('method')}"] += 1
+                if message.get("method") == "ping":
+                    await ws.send_str(json.dumps({"channel": "pong"}))
+                elif message.get("method") == "subscribe":
+                    pushers.append(asyncio.ensure_future(self._push(ws, message["params"])))
+        finally:
+            for task in pushers:
+                task.cancel()
+        return ws
+
+    async def _push(self, ws: web.WebSocketResponse, params: Dict):
+        source, symbol, n = params.get("source"), params.get("symbol", "BTC"), 0
+        while not ws.closed:
+            n += 1
+            if source == "book":
+                frame = {"channel": "book", "data": {"s": symbol, "t": BASE_TIME + n, "li": n, "l": self._book_levels()}}
+            elif source == "prices":
+                frame = {"channel": "prices", "data": self._prices()}
+            elif source == "trades":
+                frame = {"channel": "trades", "data": [{
+                    "h": n, "s": symbol, "a": "0.1", "p": "100", "d": "open_long", "tc": "normal",
+                    "t": BASE_TIME + n, "u": "someone",
+                }]}
+            else:
+                return
+            await ws.send_str(json.dumps(frame))
+            await asyncio.sleep(self.config.ws_interval)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the Pacifica mock server in the foreground")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per REST response")
+    parser.add_argument("--markets", type=int, default=50)
+    args = parser.parse_args()
+
+    server = MockPacifica(MockConfig(latency=args.latency, markets=args.markets), port=args.port)
+    print(f"serving {server.url} and {server.ws_url}")
+    web.run_app(server.app(), host=server.host, port=args.port, print=None)
@@ -0,0 +1,231 @@
+# =========================================================
+# BENCHMARK HARNESS
+# =========================================================
+# Runs every public method a number of times against the local mock
+# server and reports throughput, p50 / p99 latency and the REST requests
+# each call made. With --check the run fails when a method needs more
+# requests than its budget (catches N+1 regressions).
+#
+#   python -m benchmarks.run --iterations 200 --latency 0.002 --check
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+from solders.keypair import Keypair
+
+from benchmarks.mock_server import BASE_TIME, MINUTE, MockConfig, MockPacifica
+
+SYMBOL = "BTC/USDC:USDC"
+
+# REST requests one call may make with response caching disabled
+BUDGETS = {
+    "fetch_markets": 1,
+    "fetch_ticker": 1,
+    "fetch_tickers": 1,
+    "fetch_balance": 1,
+    "fetch_positions": 3,
+    "fetch_position": 3,
+    "fetch_portfolio": 4,
+    "fetch_open_orders": 1,
+    "fetch_order": 0,
+    "fetch_my_trades": 1,
+    "fetch_order_book": 1,
+    "fetch_order_book_compact": 1,
+    "fetch_funding_rate": 1,
+    "fetch_funding_rates": 1,
+    "fetch_funding_rate_history": 5,
+    "fetch_ohlcv": 1,
+    "fetch_ohlcv_5000": 5,
+    "create_order": 1,
+    "cancel_order": 1,
+    "create_orders": 1,
+    "set_leverage": 1,
+}
+
+NO_CACHE = {"/info": 0, "/account/settings": 0, "/info/prices": 0, "fundingRates": 0}
+
+
+def exchange_config(server: MockPacifica) -> Dict:
+    return {
+        "l1walletAddress": "benchmark",
+        "privateKey": str(Keypair()),
+        "baseUrl": server.url,
+        "wsUrl": server.ws_url,
+        "enableRateLimit": False,
+        "cacheTTL": NO_CACHE,
+        "options": {"orderStoreMaxAge": 0},
+    }
+
+
+def scenarios(exchange) -> Dict[str, Callable]:
+    """name -> zero-argument callable, the same names for the sync and async class."""
+    since = BASE_TIME - 1000 * MINUTE
+    order = {"symbol": SYMBOL, "type": "limit", "side": "buy", "amount": 0.1, "price": 100.0}
+    return {
+        "fetch_markets": lambda: exchange.fetch_markets(),
+        "fetch_ticker": lambda: exchange.fetch_ticker(SYMBOL),
+        "fetch_tickers": lambda: exchange.fetch_tickers(),
+        "fetch_balance": lambda: exchange.fetch_balance(),
+        "fetch_positions": lambda: exchange.fetch_positions(),
+        "fetch_position": lambda: exchange.fetch_position(SYMBOL),
+        "fetch_portfolio": lambda: exchange.fetch_portfolio(),
+        "fetch_open_orders": lambda: exchange.fetch_open_orders(SYMBOL),
+        "fetch_order": lambda: exchange.fetch_order("seed-0"),
+        "fetch_my_trades": lambda: exchange.fetch_my_trades(SYMBOL),
+        "fetch_order_book": lambda: exchange.fetch_order_book(SYMBOL),
+        "fetch_order_book_compact": lambda: exchange.fetch_order_book(SYMBOL, params={"compact": True}),
+        "fetch_funding_rate": lambda: exchange.fetch_funding_rate(SYMBOL),
+        "fetch_funding_rates": lambda: exchange.fetch_funding_rates(),
+        "fetch_funding_rate_history": lambda: exchange.fetch_funding_rate_history(SYMBOL, limit=1000),
+        "fetch_ohlcv": lambda: exchange.fetch_ohlcv(SYMBOL, "1m", since, 1000),
+        "fetch_ohlcv_5000": lambda: exchange.fetch_ohlcv(SYMBOL, "1m", since - 4000 * MINUTE, 5000),
+        "create_order": lambda: exchange.create_order(SYMBOL, order["type"], order["side"], order["amount"], order["price"]),
+        "cancel_order": lambda: exchange.cancel_order("1", SYMBOL),
+        "create_orders": lambda: exchange.create_orders([order] * 5),
+        "set_leverage": lambda: exchange.set_leverage(5, SYMBOL),
+    }
+
+
+def percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def summarize(name: str, samples: List[float], elapsed: float, counts: Dict[str, int]) -> Dict:
+    calls = len(samples)
+    requests = sum(counts.values())
+    return {
+        "method": name,
+        "calls": calls,
+        "throughput": calls / elapsed if elapsed else float("inf"),
+        "p50_ms": percentile(samples, 0.50) * 1000,
+        "p99_ms": percentile(samples, 0.99) * 1000,
+        "mean_ms": statistics.fmean(samples) * 1000,
+        "requests_per_call": requests / calls,
+        "requests": dict(counts),
+    }
+
+
+def run_sync(server: MockPacifica, iterations: int, only: Optional[List[str]]) -> List[Dict]:
+    from pacifica_ccxt_adapter.Pacifica import Pacifica
+
+    exchange = Pacifica(exchange_config(server))
+    exchange.load_markets()
+    exchange.fetch_orders()  # seeds the order store for fetch_order
+
+    results = []
+    for name, call in scenarios(exchange).items():
+        if only and name not in only:
+            continue
+        call()  # warm up connections
+        server.reset_counts()
+        samples = []
+        started = time.perf_counter()
+        for _ in range(iterations):
+            t = time.perf_counter()
+            call()
+            samples.append(time.perf_counter() - t)
+        results.append(summarize(name, samples, time.perf_counter() - started, server.counts))
+    exchange.transport.close()
+    return results
+
+
+def run_async(server: MockPacifica, iterations: int, only: Optional[List[str]], concurrency: int) -> List[Dict]:
+    from pacifica_ccxt_adapter.async_support import Pacifica
+
+    async def main():
+        exchange = Pacifica(exchange_config(server))
+        await exchange.load_markets()
+        await exchange.fetch_orders()
+
+        results = []
+        semaphore = asyncio.Semaphore(concurrency)
+        for name, call in scenarios(exchange).items():
+            if only and name not in only:
+                continue
+            await call()
+            server.reset_counts()
+            samples = []
+
+            async def timed():
+                async with semaphore:
+                    t = time.perf_counter()
+                    await call()
+                    samples.append(time.perf_counter() - t)
+
+            started = time.perf_counter()
+            await asyncio.gather(*[timed() for _ in range(iterations)])
+            results.append(summarize(name, samples, time.perf_counter() - started, server.counts))
+        await exchange.close()
+        return results
+
+    return asyncio.run(main())
+
+
+def report(results: List[Dict]):
+    print(f"{'method':<28}{'calls':>7}{'calls/s':>10}{'p50 ms':>9}{'p99 ms':>9}{'req/call':>10}")
+    for r in results:
+        print(
+            f"{r['method']:<28}{r['calls']:>7}{r['throughput']:>10.1f}"
+            f"{r['p50_ms']:>9.2f}{r['p99_ms']:>9.2f}{r['requests_per_call']:>10.2f}"
+        )
+
+
+def over_budget(results: List[Dict]) -> List[str]:
+    failures = []
+    for r in results:
+        budget = BUDGETS.get(r["method"])
+        if budget is not None and r["requests_per_call"] > budget:
+            failures.append(f"{r['method']}: {r['requests_per_call']:.2f} requests per call, budget {budget} ({r['requests']})")
+    return failures
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Offline Pacifica adapter benchmarks")
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.0, help="mock server seconds per REST response")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--markets", type=int, default=50, help="rows in /info and /info/prices")
+    parser.add_argument("--open-orders", type=int, default=20)
+    parser.add_argument("--trades", type=int, default=100)
+    parser.add_argument("--async", dest="use_async", action="store_true", help="benchmark the asyncio class")
+    parser.add_argument("--concurrency", type=int, default=10, help="calls in flight with --async")
+    parser.add_argument("--only", nargs="*", help="method names to run")
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("--check", action="store_true", help="exit 1 when a method exceeds its request budget")
+    args = parser.parse_args(argv)
+
+    config = MockConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        markets=args.markets,
+        open_orders=args.open_orders,
+        trades=args.trades,
+    )
+    server = MockPacifica(config).start()
+    try:
+        if args.use_async:
+            results = run_async(server, args.iterations, args.only, args.concurrency)
+        else:
+            results = run_sync(server, args.iterations, args.only)
+    finally:
+        server.stop()
+
+    report(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    failures = over_budget(results)
+    for failure in failures:
+        print("OVER BUDGET", failure, file=sys.stderr)
+    return 1 if args.check and failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
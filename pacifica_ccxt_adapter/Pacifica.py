@@ -2,380 +2,219 @@
 # PACIFICA CCXT ADAPTER (AGENT WALLET, NO SDK)
 # =========================================================
 
-import asyncio
 import time
-import json
-from inspect import signature
-
-import base58
-import requests
-from decimal import Decimal
-from typing import Dict, Any, Optional, List
-import math
-import ccxt
-from ccxt import AuthenticationError, InvalidOrder, OrderNotFound
-from ccxt.base.types import Market, Ticker, Trade, Order, Position, Balances
-from coincurve.ecdsa import signature_normalize
-from decimal import Decimal, ROUND_CEILING, ROUND_FLOOR
-
-from pacifica_ccxt_adapter.const import EOrderType, EOrderSide, EOrderStatus
-#from const import EOrderType, EOrderSide, EOrderStatus
-
-from ccxt.base.types import (
-    Market,
-    Ticker,
-    Trade,
-    Order,
-    Position,
-    Balances,
-    FundingRate, Int, Str,
-)
-import os
-import time
-import json
-import base58
-import requests
-import logging
-import traceback
-import uuid
-import aiohttp
-import asyncio
-from typing import Optional, Dict, Any, List
-from datetime import datetime
-from pathlib import Path
-from dotenv import load_dotenv
-from solders.keypair import Keypair
-
-from solders.keypair import Keypair
-
-# =========================================================
-# SIGNING HELPERS (FROM YOUR DOCUMENT)
-# =========================================================
-def sort_json_keys(value):
-    if isinstance(value, dict):
-        return {k: sort_json_keys(value[k]) for k in sorted(value.keys())}
-    if isinstance(value, list):
-        return [sort_json_keys(v) for v in value]
-    return value
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
 
+# any ccxt submodule runs ccxt/__init__.py, which loads every exchange class,
+# so this import cannot be made cheaper from here; everything else the adapter
+# does not need at import time (solders, numpy, aiohttp) is loaded on first use
+from ccxt.base.exchange import Exchange
+from ccxt.base.errors import ArgumentsRequired, ExchangeError, InvalidOrder, NetworkError, NotSupported, OrderNotFound
+from ccxt.base.types import Balances, FundingRate, Int, Market, Order, Position, Str, Ticker, Trade
 
-def prepare_message(header: dict, payload: dict) -> str:
-    data = {**header, "data": payload}
-    return json.dumps(sort_json_keys(data), separators=(",", ":"))
+from pacifica_ccxt_adapter.base import PacificaBase
+from pacifica_ccxt_adapter.const import EOrderStatus
+from pacifica_ccxt_adapter.instrumentation import map_in_context
+from pacifica_ccxt_adapter.retry import AMBIGUOUS, classify
+# module level signing helpers, kept importable from here for existing callers
+from pacifica_ccxt_adapter.signing import prepare_message, sign_message, sort_json_keys
+from pacifica_ccxt_adapter.transport import HttpTransport
 
+__all__ = ["Pacifica", "prepare_message", "sign_message", "sort_json_keys"]
 
-def sign_message(message: str, keypair: Keypair) -> str:
-    signature = keypair.sign_message(message.encode("utf-8"))
-    return base58.b58encode(bytes(signature)).decode("utf-8")
 
 # =========================================================
 # EXCHANGE
 # =========================================================
-class Pacifica(ccxt.Exchange):
-    id = "pacifica"
-    name = "Pacifica"
-    rateLimit = 1000
+class Pacifica(PacificaBase, Exchange):
 
     def __init__(self, config: Dict[str, Any] = {}):
         super().__init__(config)
-
-        self.id = "pacifica"
-
-        self.base_url = config.get(
-            "baseUrl", "https://api.pacifica.fi/api/v1"
-        )
+        self._setup(config)
+        # a session passed in the config (e.g. by AccountManager) belongs to the caller
+        self.own_session = config.get("session") is None
 
         # -------------------------
-        # Credentials
-        # -------------------------
-        self.l1_wallet_address = self.safe_string(config, "l1walletAddress")
-        agent_private_key = self.safe_string(config, "privateKey")
-
-        if not self.l1_wallet_address or not agent_private_key:
-            raise AuthenticationError(
-                "Pacifica requires l1walletAddress + agentPrivateKey"
-            )
-
-        self.agent_keypair = Keypair.from_base58_string(agent_private_key)
-        self.agent_public_key = str(self.agent_keypair.pubkey())
-
-        self.currency = "USDC"
-
+        # Transport (one pooled keep-alive session for every call)
         # -------------------------
-        # Capabilities
-        # -------------------------
-        self.has.update({
-            "spot": False,
-            "margin": False,
-            "swap": True,
-            "future": False,
-            "option": False,
-
-            "fetchMarkets": True,
-            "fetchTicker": True,
-            "fetchTickers": True,
-            "fetchOrderBook": True,
-            "fetchOHLCV": False,
-
-            "fetchBalance": True,
-            "fetchTrades": True,
-            "fetchMyTrades": True,
-
-            "createOrder": True,
-            "cancelOrder": True,
-            "cancelAllOrders": True,
-            "fetchOrder": True,
-            "fetchOrders": True,
-            "fetchOpenOrders": False,
-            "fetchClosedOrders": True,
-
-            "fetchPositions": True,
-            "fetchPosition": True,
-
-            "fetchFundingRate": True,
-            "fetchFundingRates": True,
-        })
-
-        self.options = self.deep_extend({
-            "defaultType": "swap",
-        }, self.options)
-
-        self.fees.update({
-            'swap': {
-                'taker': self.parse_number('0.0002'),
-                'maker': self.parse_number('0.0002'),
-            },
-            'spot': {
-                'taker': self.parse_number('0.0002'),
-                'maker': self.parse_number('0.0002'),
-            },
-        })
-
-        self.name = "Pacifica"
-        self.rateLimit = 1000
-
-    # =====================================================
-    # INTERNAL REQUEST
-    # =====================================================
-    def _private_post(self, endpoint: str, payload: dict, type_name: str):
-        ts = int(time.time() * 1000)
-
-        signature_header = {
-            "type": type_name,
-            "timestamp": ts,
-            "expiry_window": 30000,
-        }
-
-        signature_payload = {
-            **payload
-        }
-
-        message = prepare_message(signature_header, signature_payload)
-        signature = sign_message(message, self.agent_keypair)
-
-        body = {
-            "account": self.l1_wallet_address,
-            "agent_wallet": self.agent_public_key,
-            "signature": signature,
-            "timestamp": signature_header["timestamp"],
-            "expiry_window": signature_header["expiry_window"],
-            **signature_payload
-        }
-
-        r = requests.post(
-            self.base_url + endpoint,
-            json=body,
-            timeout=15,
+        self.transport = HttpTransport(
+            self.base_url,
+            session=self.session,
+            pool_size=int(config.get("poolSize", 10)),
+            timeout=self.timeout / 1000,
+            timeouts=config.get("timeouts"),
+            limiter=self.rate_limiter,
         )
-
-        if r.status_code != 200:
-            raise ccxt.ExchangeError(r.text)
-
-        data = r.json()
-        if not data.get("success", True):
-            raise ccxt.ExchangeError(data.get("error"))
-
-        return data.get("data", data)
+        self.transport.observer = self.instrumentation.record_request
+        self.instrumentation.attach(self, type(self))
 
     # =====================================================
-    # HELPERS
+    # INTERNAL REQUEST
     # =====================================================
-    def _ccxt_symbol(self, market: str):
-        if "-" in market:
-            base, quote = market.split("-")
-        else:
-            base = market
-            quote = self.currency
-        return f"{base}/{quote}:{quote}"
-
-    def _market_name(self, symbol: str):
-        return symbol.replace("/", "-").split(":")[0]
-
-    def _crypto_name(self, symbol: str):
-        if "/" in symbol:
-            return symbol.split("/")[0]
-        return symbol
-
-    def _decimal_places(self, x):
-        return int(-math.log10(float(x)))
+    def _private_post(self, endpoint: str, payload: dict, type_name: str, confirm=None, landed=None):
+        # every attempt is signed when the rate limiter admits it, so a resend
+        # carries a fresh timestamp; landed(error) tells whether a resend failing
+        # with error means an earlier attempt already took effect ({} is returned)
+        body = lambda: self._sign_request(payload, type_name)
+        attempts = 0
+
+        def send():
+            nonlocal attempts
+            attempts += 1
+            try:
+                return self._check_response(self.transport.post(endpoint, body, timeout=15))
+            except ExchangeError as e:
+                if attempts > 1 and landed is not None and landed(e):
+                    return {}
+                raise
+
+        data = self._with_retry(endpoint, send, confirm=confirm)
+        self.cache.invalidate_after(endpoint)
+        return data
+
+    def _with_retry(self, endpoint: str, call, idempotent: bool = True, confirm=None):
+        """Run ``call()`` until it succeeds or the retry policy gives up.
+
+        ``idempotent=False`` resends only after errors the server did not act on
+        (429). After an ambiguous failure ``confirm()`` is asked whether the
+        attempt landed anyway: its data is returned instead of resending, None resends.
+        """
+        attempt = 0
+        while True:
+            try:
+                return call()
+            except Exception as e:
+                delay = self.retry_policy.delay_for(e, attempt, idempotent=idempotent)
+                if delay is None:
+                    raise
+                if confirm is not None and classify(e) == AMBIGUOUS:
+                    try:
+                        data = confirm()
+                    except Exception:
+                        raise e
+                    if data is not None:
+                        return data
+                self.instrumentation.count("retries", endpoint)
+                attempt += 1
+                time.sleep(delay)
+
+    def _public_get(self, endpoint: str, params: dict = None, parse=None):
+        # parse, if given, turns the response into what is cached and returned
+        hit, data = self.cache.get(endpoint, params)
+        if hit:
+            return data
+        if not self.cache.cacheable(endpoint):
+            return self._parse_public(self._check_response(self._get_with_retry(endpoint, params)), parse)
+
+        with self.cache.key_lock(endpoint, params):
+            # another thread may have filled the entry while this one waited
+            hit, data = self.cache.get(endpoint, params)
+            if hit:
+                return data
+            data = self._parse_public(self._check_response(self._get_with_retry(endpoint, params)), parse)
+            self.cache.set(endpoint, params, data)
+        return data
+
+    def _get_with_retry(self, endpoint: str, params: dict = None):
+        # raw response, paginated endpoints keep next_cursor / has_more next to data
+        return self._with_retry(endpoint, lambda: self.transport.get(endpoint, params=params))
+
+    def last_request_timing(self):
+        return self.transport.last_timing
 
     # =====================================================
     # MARKETS
     # =====================================================
     def fetch_markets(self, params={}) -> List[Market]:
-        r = requests.get(self.base_url + "/info", timeout=10).json()
-        out = []
-
-        for m in r["data"]:
-            symbol = f"{m['symbol']}/{self.currency}:{self.currency}"
-            out.append({
-                "id": symbol,
-                "symbol": symbol,
-                "base": m['symbol'],
-                "quote": self.currency,
-                "settle": self.currency,
-                "spot": False,
-                "swap": True,
-                "contract": True,
-                "linear": True,
-                "precision": {
-                    "price": self._decimal_places(m["tick_size"]),
-                    "amount": self._decimal_places(m["lot_size"]),
-                },
-                "limits": {
-                    "cost": {
-                        "min": float(m["min_order_size"]),
-                        "max": float(m["max_order_size"]),
-                    },
-                    "amount": {
-                        "min": float(m["min_tick"]),
-                        "max": float(m["max_tick"]),
-                    },
-                },
-                "info": m,
-            })
-        return out
+        r = self._public_get("/info")
+        return [self._parse_market(m) for m in r]
 
     # =====================================================
     # TICKER
     # =====================================================
     def fetch_ticker(self, symbol: str, params={}) -> Ticker:
-        r = requests.get(
-            self.base_url + "/info/prices",
-            timeout=10,
-        ).json()["data"]
-
-        for price in r:
-            if price["symbol"] == self._crypto_name(symbol):
-                return {
-                    "symbol": symbol,
-                    "timestamp": price["timestamp"],
-                    "datetime": self.iso8601(price["timestamp"]),
-                    "last": float(price["mid"]),
-                    "bid": float(price["mark"]),
-                    "ask": float(price["mark"]),
-                    "high":-1,
-                    "low": -1,
-                    "baseVolume": float(price["volume_24h"]),
-                    "info": price,
-                }
-        return None
+        return self.fetch_tickers([symbol]).get(symbol)
+
+    def fetch_tickers(self, symbols: List[str] = None, params={}) -> Dict[str, Ticker]:
+        # one /info/prices round trip, indexed by symbol once per snapshot
+        return self._parse_tickers(self._fetch_prices(), symbols)
+
+    # =====================================================
+    # ORDER BOOK
+    # =====================================================
+    def fetch_order_book(self, symbol: str, limit: Int = None, params={}) -> Dict:
+        # params: aggLevel, compact (l2book.L2Book of float64 arrays instead of lists)
+        data = self._public_get("/book", {"symbol": self._crypto_name(symbol), "agg_level": self.safe_integer(params, "aggLevel", 1)})
+        return self._parse_order_book(data, symbol, limit, self.safe_bool(params, "compact", False))
 
     # =====================================================
     # BALANCE
     # =====================================================
     def fetch_balance(self, params={}) -> Balances:
         account_data = self.fetch_accounts()
-        result = {"info": account_data}
-        result["USDC"] = {
-            "free": float(account_data["available_to_spend"]),
-            "used": float(account_data["total_margin_used"]),
-            "total": float(account_data["balance"]),
-        }
-        return self.safe_balance(result)
-
-    def fetch_order(self, order_id, symbol=None, params=None):
-        if order_id is not None:
-            try:
-                orders = self.fetch_orders()
-                for order in orders:
-                    if order["id"] == order_id:
-                        return self._parse_order(order)
-            except Exception as e:
-                if "Order not found" in str(e):
-                    raise OrderNotFound(order_id)
-                raise OrderNotFound(str(e))
-        orders = self.fetch_orders(symbol)
-        for o in orders:
-            if o["id"] == order_id:
-                return self._parse_order(o)
-        raise OrderNotFound(order_id)
-
-    def _parse_order(self, order):
-        return {
-            "id": order.id,
-            "symbol": order.symbol,
-            "status": order.status,
-            "type": order.type,
-            "side": order.side,
-            "price": float(order.price or 0),
-            "amount": float(order.quantity or 0),
-            "filled": float(order.filled or 0),
-            "remaining": float(order.remaining or 0),
-            "info": order.to_dict(),
-        }
+        return self._parse_balance(account_data)
+
+    def fetch_order(self, order_id, symbol=None, params={}):
+        # answered from the local order store (exchange id or client order id);
+        # the network is only used on a miss or with params={"refresh": True}
+        params = params or {}
+        if not self.safe_bool(params, "refresh", False):
+            order = self.order_store.get(order_id)
+            if order is not None:
+                return order
+
+        self.fetch_orders()
+        order = self.order_store.get(order_id)
+        if order is not None:
+            return order
 
-    def fetch_orders(self, symbol: str = None, since: Int = None, limit: Int = None, params={}) -> List[Order]:
-        url = f"{self.base_url}/orders?account={self.l1_wallet_address}"
-        orders = requests.get(url, params=params, timeout=10).json()["data"]
-
-        parsed = []
-
-        for o in orders:
-            sym = self._ccxt_symbol(o["symbol"])
-            if symbol is not None and sym != symbol:
-                continue
-
-            parsed.append({
-                "id": o["order_id"],
-                "symbol": sym,
-                "side": EOrderSide.BUY.value if o["side"] == "bid" else EOrderSide.SELL.value,
-                "type": str(o["order_type"]),
-                "price": float(o["price"]),
-                "amount": float(o["initial_amount"]),
-                "filled": float(o["filled_amount"]),
-                "status": EOrderStatus.OPEN.value,
-                "info": o,
-            })
+        try:
+            rows = self._public_get("/orders/history_by_id", {"order_id": order_id})
+        except ExchangeError as e:
+            raise OrderNotFound(f"{order_id}: {e}")
+        if not rows:
+            raise OrderNotFound(order_id)
+        return self.order_store.upsert(self._parse_order_history(rows))
 
-        if symbol:
+    def fetch_orders(self, symbol: str = None, since: Int = None, limit: Int = None, params={}) -> List[Order]:
+        orders = self._public_get("/orders", {**params, "account": self.l1_wallet_address})
+        parsed = self._parse_open_orders(orders)
+        self.order_store.sync_open(parsed)
+        if symbol is not None:
             parsed = [o for o in parsed if o["symbol"] == symbol]
-
         return parsed
 
+    def fetch_open_orders(self, symbol: str = None, since: Int = None, limit: Int = None, params={}) -> List[Order]:
+        if self.safe_bool(params, "refresh", False) or not self.order_store.is_fresh(self._order_store_max_age()):
+            self.fetch_orders()
+        orders = self.order_store.open_orders(symbol)
+        return self.filter_by_since_limit(orders, since, limit, "timestamp", True)
+
+    def fetch_closed_orders(self, symbol: str = None, since: Int = None, limit: Int = None, params={}) -> List[Order]:
+        # answered from the order store once /orders/history was read back to since;
+        # read again (and upserted into the store) on a miss or with params={"refresh": True}
+        orders = self._closed_orders(symbol, since, limit)
+        if not self._closed_orders_miss(orders, symbol, since, limit, params):
+            return orders
+        bound = self._closed_history_bound(since, limit)
+        history, seen = [], set()
+        for order in self.iter_orders_history(symbol, since):
+            # one row per order event, the first (newest) holds the order's state
+            if order["id"] in seen:
+                continue
+            seen.add(order["id"])
+            if order["status"] == EOrderStatus.OPEN.value:
+                continue
+            history.append(order)
+            if bound and len(history) >= bound:
+                break
+        self._store_closed_history(history, symbol, since, bound)
+        return self._closed_orders(symbol, since, limit)
+
     # =====================================================
     # ORDERS
     # =====================================================
-    def normalize_order(self, market, price, amount, side):
-        price = Decimal(str(price))
-        amount = Decimal(str(amount))
-
-        # PRICE
-        price_precision = market["precision"]["price"]
-        price_tick = Decimal("10") ** -price_precision
-        price_rounding = ROUND_CEILING if side == "sell" else ROUND_FLOOR
-        price = self.round_to_step(price, price_tick, price_rounding)
-
-        # AMOUNT
-        amount_precision = market["precision"]["amount"]
-        lot_size = Decimal("10") ** -amount_precision
-        amount = self.round_to_step(amount, lot_size, ROUND_FLOOR)
-
-        return price, amount
-
-    def round_to_step(self, value, step, rounding):
-        return (value / step).to_integral_value(rounding=rounding) * step
-
     def create_order(
         self,
         symbol: str,
@@ -385,78 +224,83 @@ class Pacifica(ccxt.Exchange):
         price: Optional[float] = None,
         params: Dict = {},
     ) -> Order:
+        if type.lower() == "market" and price is None:
+            # priced from the book the order would sweep, no separate ticker fetch
+            price = self._market_price(self.fetch_order_book(symbol), side, amount)
+        payload, price, amount = self._create_order_payload(symbol, type, side, amount, price, params)
 
-        if type.lower() == "market":
-            time_in_force = "ioc"
-            if side.lower() == "buy":
-                price = price * 1.001
-            else:
-                price = price * 0.999
-        else:
-            time_in_force = "gtc"
-
-        market = self.markets[symbol]
-        price, amount = self.normalize_order(market, price, amount, side)
-
-        payload = {}
-        payload.update(params)
-
-        payload = {
-            "symbol": self._crypto_name(symbol),
-            "side": "bid" if side == EOrderSide.BUY.value else "ask",
-            "amount": str(amount),
-            "client_order_id": str(uuid.uuid4()),
-            "tif": time_in_force,
-            "reduce_only": False,
-        }
-
-        if "tp" in params:
-            payload["take_profit"] = {
-                "stop_price": str(params["tp"].get("price")),
-                "limit_price": str(params["tp"].get("price")),
-                "client_order_id": str(uuid.uuid4())
-            }
-
-        if "sl" in params:
-            payload["stop_loss"] = {
-                "stop_price": str(params["sl"].get("price")),
-                "limit_price": str(params["sl"].get("price")),
-                "client_order_id": str(uuid.uuid4())
-            }
-
-        if price:
-            payload["price"] = str(price)
-
-
+        client_order_id = payload["client_order_id"]
         try:
-            o = self._private_post("/orders/create", payload, "create_order")
+            o = self._private_post(
+                "/orders/create", payload, "create_order",
+                confirm=lambda: self._confirm_created(client_order_id),
+            )
+        except NetworkError:
+            # retries exhausted and the order may or may not exist:
+            # fetch_order(client_order_id) tells once the exchange is reachable
+            raise
         except Exception as e:
             raise InvalidOrder(str(e))
 
-        fee = float(self.fees["swap"]["taker"]) * float(amount) * float(price)
-
-        return {
-            "id": str(o["order_id"]),
-            "symbol": symbol,
-            "type": type,
-            "side": side,
-            "price": float(price),
-            "amount": float(amount),
-            'fees':
-                {
-                    'cost': fee,
-                    'currency': 'USDC',
-                    'rate': 0.004
-                },
-            'fee':
-                {
-                    'cost': fee,
-                    'currency': 'USDC',
-                    'rate': 0.004
-                },
-            "status": o.get("status", "open"),
-            "info": o,
-        }
+        order = self._parse_created_order(o, symbol, type, side, amount, price, client_order_id)
+        return self.order_store.upsert(order)
+
+    def _confirm_created(self, client_order_id: str):
+        # the create request may have landed: look for its client order id
+        # among open orders, then in the recent order history
+        order = self.order_store.get(client_order_id)
+        if order is None:
+            self.fetch_orders()
+            order = self.order_store.get(client_order_id)
+        if order is not None:
+            return {"order_id": order["id"]}
+        rows = self._public_get("/orders/history", {"account": self.l1_wallet_address, "limit": 100})
+        return self._find_client_order(rows, client_order_id)
+
+    def execute_market_order(self, symbol: str, side: str, amount: float, params={}) -> Dict:
+        """Work a market order as IOC children inside a slippage budget (see execution.py).
+
+        params: ``maxSlippage`` (fraction of the arrival touch), ``maxChildAmount``,
+        ``maxChildren`` and ``book`` (an order book to start from instead of fetching one).
+        Returns the fill report: ``filled``, ``average``, ``slippage``, ``orders`` ...
+        """
+        execution = self._market_execution(symbol, side, amount, params)
+        book = params.get("book") or self.fetch_order_book(symbol)
+        execution.start(book, self.milliseconds())
+        while True:
+            child = execution.next_child(book)
+            if child is None:
+                break
+            child_amount, child_price, expected = child
+            order = self.create_order(symbol, "limit", side, child_amount, child_price, {"timeInForce": "ioc"})
+            fill = self._child_fill(order)
+            if fill is None:
+                execution.record_unknown(order)
+                break
+            execution.record(fill, expected)
+            if execution.remaining <= 0:
+                break
+            book = self.fetch_order_book(symbol)
+        return execution.report()
+
+    def _child_fill(self, order: Dict) -> Optional[Dict]:
+        # final state of an IOC child from the order store (account stream) or the
+        # order history, re-read briefly while missing; None if it stays unknown
+        for attempt in range(int(self.options["executionFillRetries"]) + 1):
+            if attempt:
+                time.sleep(self.options["executionFillDelay"])
+            known = self.order_store.get(order["id"])
+            if self._child_final(known):
+                return known
+            try:
+                rows = self._public_get("/orders/history_by_id", {"order_id": order["id"]})
+            except ExchangeError:
+                rows = None
+            if rows:
+                child = self.order_store.upsert(self._parse_order_history(rows))
+                if self._child_final(child):
+                    return child
+        return None
 
     def cancel_order(self, id: str, symbol=None, params={}):
         try:
@@ -465,88 +309,169 @@ class Pacifica(ccxt.Exchange):
                     "/cancel",
                     {"order_id": int(id), "symbol": symbol},
                     "cancel_order",
+                    landed=self._order_not_found,
                 )
                 if response is not None:
+                    self.order_store.set_status(id, EOrderStatus.CANCELED.value)
                     return {"id": id, "status": "canceled", "info": response}
-            raise UnsupportedError(self.id + ' cancelOrder() needs id and symbol')
+            raise NotSupported(self.id + ' cancelOrder() needs id and symbol')
+        except NetworkError:
+            raise
         except Exception:
             raise OrderNotFound(id)
 
-    def fetch_funding_rate(self, symbol: str, params={}) -> Optional[FundingRate]:
-        url = f"{self.base_url}/funding_rate/history"
-        params = {'symbol': self._crypto_name(symbol), 'limit': 1}
+    # -----------------------------------------------------
+    # BATCH ORDERS (one /orders/batch round trip per maxBatchSize actions)
+    # -----------------------------------------------------
+    def create_orders(self, orders: List[Dict], params={}) -> List[Order]:
+        legs = [self._create_order_action(order) for order in orders]
+        results = self._post_batch([action for action, _ in legs])
+        return [
+            self.order_store.upsert(self._parse_batch_create(result, leg))
+            for result, (_, leg) in zip(results, legs)
+        ]
+
+    def cancel_orders(self, ids: List[str], symbol: str = None, params={}) -> List[Order]:
+        if symbol is None:
+            raise ArgumentsRequired(self.id + ' cancelOrders() requires a symbol argument')
+        results = self._post_batch([self._cancel_order_action(id, symbol) for id in ids])
+        out = [self._parse_batch_cancel(result, id, symbol) for result, id in zip(results, ids)]
+        for order in out:
+            if order["status"] == EOrderStatus.CANCELED.value:
+                self.order_store.set_status(order["id"], EOrderStatus.CANCELED.value)
+        return out
+
+    def edit_orders(self, orders: List[Dict], params={}) -> List[Order]:
+        # cancel-replace: every cancel is immediately followed by its replacement in the same
+        # request; the pair is not atomic, a replacement whose cancel failed is canceled again
+        actions = []
+        legs = []
+        for order in orders:
+            action, leg = self._create_order_action(order)
+            actions.append(self._cancel_order_action(order["id"], order["symbol"]))
+            actions.append(action)
+            legs.append(leg)
 
-        response = requests.get(url, params=params, timeout=10).json()
+        results = self._post_batch(actions, group=2)
 
-        response = response["data"][0]
+        out = []
+        for i, (order, leg) in enumerate(zip(orders, legs)):
+            cancel_result, create_result = results[2 * i], results[2 * i + 1]
+            parsed = self._parse_batch_create(create_result, leg)
+            parsed["replaced"] = self._parse_batch_cancel(cancel_result, order["id"], order["symbol"])
+            if parsed["replaced"]["status"] == EOrderStatus.CANCELED.value:
+                self.order_store.set_status(order["id"], EOrderStatus.CANCELED.value)
+            out.append(self.order_store.upsert(parsed))
+
+        for symbol, unreplaced in self._unreplaced_by_symbol(out).items():
+            undone = self.cancel_orders([order["id"] for order in unreplaced], symbol)
+            for order, cancel in zip(unreplaced, undone):
+                self._undo_replacement(order, cancel)
+        return out
 
-        funding_rate = float(response["funding_rate"])
-        funding_time = int(response.get("created_at", time.time()))
+    def _post_batch(self, actions: List[Dict], group: int = 1) -> List[Dict]:
+        # each action carries its own agent signature, the batch envelope is unsigned
+        results = []
+        try:
+            for chunk in self._chunk_actions(actions, group):
+                try:
+                    results.extend(self._batch_results(chunk, self._post_batch_chunk(chunk)))
+                except Exception as e:
+                    # report this chunk's legs as failed, keep the chunks that went through
+                    results.extend(self._failed_chunk(chunk, e))
+        finally:
+            self.cache.invalidate_after("/orders/batch")
+        return results
+
+    def _post_batch_chunk(self, chunk: List[Dict]):
+        # actions are signed up front and may have executed after a timeout,
+        # so only rejections the server did not act on (429) are resent
+        return self._with_retry(
+            "/orders/batch",
+            lambda: self.transport.post("/orders/batch", {"actions": chunk}, timeout=15),
+            idempotent=False,
+        )
 
-        response["fundingRate"] = funding_rate
-        response["fundingRateAnnualized"] = funding_rate * 24 * 365
-        response["symbol"] = symbol
+    def fetch_funding_rate(self, symbol: str, params={}) -> Optional[FundingRate]:
+        return (self.fetch_funding_rates([symbol], params)).get(symbol)
+
+    def fetch_funding_rates(self, symbols: List[str] = None, params={}) -> Dict[str, FundingRate]:
+        # every market's rate from one /info/prices snapshot, kept until the next
+        # hourly settlement; markets missing from it fall back to /funding_rate/history
+        hit, rates = self.cache.get("fundingRates")
+        if not hit or self.safe_bool(params, "refresh", False):
+            rates = self._parse_funding_rates(self._fetch_prices())
+            self.cache.set("fundingRates", None, rates, ttl=self._funding_rates_ttl())
+        if symbols is None:
+            return dict(rates)
+
+        rates = {symbol: rates[symbol] for symbol in symbols if symbol in rates}
+        missing = [symbol for symbol in symbols if symbol not in rates]
+        if len(missing) == 1:
+            rates[missing[0]] = self._fetch_last_funding_rate(missing[0])
+        elif missing:
+            with ThreadPoolExecutor(max_workers=min(self.options["fundingConcurrency"], len(missing))) as pool:
+                rates.update(zip(missing, map_in_context(pool, self._fetch_last_funding_rate, missing)))
+        return rates
+
+    def _fetch_last_funding_rate(self, symbol: str) -> FundingRate:
+        params = {'symbol': self._crypto_name(symbol), 'limit': 1}
 
-        return {
-            "symbol": symbol,
-            "fundingRate": funding_rate,
-            "timestamp": funding_time,
-            "datetime": self.iso8601(funding_time),
-            "fundingDatetime": self.iso8601(funding_time),
-            "interval": "1h",
-            "info": response,
-        }
+        response = self._public_get("/funding_rate/history", params)[0]
+        return self._parse_funding_rate(response, symbol)
+
+    def fetch_funding_rate_history(self, symbol: str = None, since: Int = None, limit: Int = None, params={}) -> List[Dict]:
+        # follows next_cursor back in time until since (or limit rows) is covered
+        if symbol is None:
+            raise ArgumentsRequired(self.id + ' fetchFundingRateHistory() requires a symbol argument')
+        rows, cursor = [], None
+        while True:
+            page = self._get_with_retry("/funding_rate/history", self._funding_page_params(symbol, cursor))
+            rows += self._check_response(page)
+            if self._funding_page_done(page, rows, since, limit):
+                break
+            cursor = page["next_cursor"]
+        return self._parse_funding_history(rows, symbol, since, limit)
 
     # -----------------------------------------------------
     # POSITIONS
     # -----------------------------------------------------
     def fetch_position(self, symbol: str, params={}) -> Optional[Position]:
-        positions = self.fetch_positions()
-        for p in positions:
-            if p["symbol"] == symbol:
-                return p
-        return None
-
+        positions = self._filter_positions(self._fetch_raw_positions(), [symbol])
+        if not positions:
+            return None
+        return self._parse_positions(positions, self._fetch_prices(), self._fetch_account_settings())[0]
 
     def fetch_positions(self, symbols=None, params={}) -> List[Position]:
-        url = f"{self.base_url}/positions"
-        params = {'account': self.l1_wallet_address}
-        positions = requests.get(url, params=params, timeout=10).json()["data"]
-        out = []
-
-        for p in positions:
-            symbol = self._ccxt_symbol(p["symbol"])
-            current_price = self.fetch_ticker(symbol)["last"]
-            notional = float(p["amount"]) * float(current_price)
-            unrealized_pnl = (float(current_price) - float(p["entry_price"])) * float(p["amount"])
-            out.append({
-                "symbol": symbol,
-                "side": "buy" if p["side"] == "bid" else "sell",
-                "contracts": float(p["amount"]),
-                "amount": float(p["amount"]),
-                "entryPrice": float(p["entry_price"]),
-                "markPrice": float(current_price),
-                "unrealisedPnl": unrealized_pnl,
-                "leverage": self.fetch_leverage(symbol),
-                "marginMode": "cross",
-                "info": self.extend({"unrealisedPnl": unrealized_pnl, "curRealisedPnl": 0, "size": p["amount"], "positionValue":notional}, p)
-            })
-
-        if symbols:
-            out = [p for p in out if p["symbol"] in symbols]
+        positions = self._filter_positions(self._fetch_raw_positions(), symbols)
+        if not positions:
+            return []
+        return self._parse_positions(positions, self._fetch_prices(), self._fetch_account_settings())
 
-        return out
+    def fetch_portfolio(self, symbols=None, params={}):
+        """Positions as a columnar ``Portfolio`` (``.positions`` holds the ccxt dicts)."""
+        self.load_markets()
+        positions = self._filter_positions(self._fetch_raw_positions(), symbols)
+        return self._parse_portfolio(positions, self._fetch_prices(), self._fetch_account_settings(), self.fetch_accounts())
 
     def fetch_leverage(self, symbol: str, params={}):
-        url = f"{self.base_url}/account/settings"
-        params = {'account': self.l1_wallet_address}
-        response = requests.get(url, params=params, timeout=10).json()
+        return self._parse_leverage(self._fetch_account_settings(), symbol)
+
+    def set_leverage(self, leverage: int, symbol: str = None, params={}):
+        return self._private_post(
+            "/account/leverage",
+            {"symbol": self._crypto_name(symbol), "leverage": int(leverage)},
+            "update_leverage",
+        )
+
+    def _fetch_raw_positions(self):
+        return self._public_get("/positions", {'account': self.l1_wallet_address})
+
+    def _fetch_prices(self):
+        return self._public_get("/info/prices", parse=self._index_prices)
 
-        account_settings = response["data"]
-        for setting in account_settings:
-            if setting["symbol"] == self._crypto_name(symbol):
-                return float(setting[("leverage")])
-        return 10 # default
+    def _fetch_account_settings(self):
+        return self._public_get("/account/settings", {'account': self.l1_wallet_address})
 
     # =====================================================
     # TRADES
@@ -555,77 +480,129 @@ class Pacifica(ccxt.Exchange):
         return self.fetch_my_trades(symbol, since, limit)
 
     def fetch_my_trades(self, symbol=None, since=None, limit=100, params={}):
-        try:
-            payload = {}
-            if symbol:
-                payload["symbol"] = self._market_name(symbol)
-
-            trades = self._private_post(
-                "/trades",
-                payload,
-                "get_trades",
-            )
+        # recent fills only, iter_my_trades() walks the full history
+        payload = {}
+        if symbol:
+            payload["symbol"] = self._market_name(symbol)
 
-            out = []
-            for t in trades:
-                ts = int(t["timestamp"] * 1000)
-                out.append({
-                    "id": str(t["trade_id"]),
-                    "symbol": self._ccxt_symbol(t["symbol"]),
-                    "side": t["side"],
-                    "price": float(t["price"]),
-                    "amount": float(t["size"]),
-                    "timestamp": ts,
-                    "datetime": self.iso8601(ts),
-                    "cost": float(t["price"]) * float(t["size"]),
-                    "fee": t.get("fee"),
-                    "info": t,
-                })
-            return out
-        except Exception as e:
-            print(e)
-            traceback.print_exc()
-            return None
+        trades = self._private_post(
+            "/trades",
+            payload,
+            "get_trades",
+        )
+
+        lean = self.safe_value(params, "lean")
+        if lean:
+            return self._lean_my_trades(trades, lean, symbol, since, limit)
+
+        trades = [self._parse_my_trade(t) for t in trades]
+        if self.history is None:
+            return self.filter_by_since_limit(trades, since, limit)
+        # /trades only returns recent fills, the store keeps everything seen so far
+        self.history.write_trades(self.l1_wallet_address, self._history_trade_rows(trades))
+        return self._history_trades(trades, symbol, since, limit)
 
+    # -----------------------------------------------------
+    # ACCOUNT HISTORY (streamed page by page, newest first)
+    # -----------------------------------------------------
+    # params: until (ms), cursor (HistoryCursor or its dumps() string) to
+    # resume a traversal; a HistoryCursor passed in is advanced while
+    # iterating, a dumps() string only sets where the traversal starts
+    def iter_my_trades(self, symbol=None, since=None, params={}):
+        yield from self._iter_history("trades", symbol, since, params)
+
+    def iter_orders_history(self, symbol=None, since=None, params={}):
+        yield from self._iter_history("orders", symbol, since, params)
+
+    def iter_funding_history(self, symbol=None, since=None, params={}):
+        yield from self._iter_history("funding", symbol, since, params)
+
+    def fetch_funding_history(self, symbol: Str = None, since: Int = None, limit: Int = None, params={}):
+        # pages run newest first: without since the latest limit payments
+        # are enough, with it the range is read back to since and the first
+        # limit after since are kept
+        payments = []
+        for payment in self.iter_funding_history(symbol, since, params):
+            payments.append(payment)
+            if limit and since is None and len(payments) >= limit:
+                break
+        return self.filter_by_since_limit(payments[::-1], since, limit, "timestamp", since is None)
+
+    def _iter_history(self, source: str, symbol, since, params):
+        endpoint, parser, _ = self._HISTORY_SOURCES[source]
+        parse = getattr(self, parser)
+        until = self.safe_integer(params, "until")
+        cursor = self._history_cursor(params)
+        while not cursor.done:
+            response = self._get_with_retry(endpoint, self._history_page_params(source, cursor, symbol, since, until))
+            rows = self._check_response(response)
+            for row in rows[cursor.offset:]:
+                item = parse(row)
+                action = self._history_item_action(item, symbol, since, until)
+                if action == "stop":
+                    cursor.done = True
+                    return
+                if action == "yield":
+                    yield item
+                # counted once the caller asks for the next row: a crash while
+                # handling this one resumes with it
+                cursor.offset += 1
+            cursor.advance(response)
 
     def fetch_accounts(self, params={}):
-        url = f"{self.base_url}/account"
         params = {'account': self.l1_wallet_address}
 
-        r = requests.get(url, params=params, timeout=10).json()["data"]
+        r = self._public_get("/account", params)
         return r
 
     # =====================================================
     # OHLCV
     # =====================================================
-    def fetch_ohlcv(self, symbol, timeframe="1m", since=None, limit=100):
-        params = {
-            "symbol": self._market_name(symbol),
-            "interval": timeframe,
-        }
-        if since:
-            params["start_time"] = since
-
-        r = requests.get(
-            self.base_url + "/kline",
-            params=params,
-            timeout=10,
-        ).json()
-
-        candles = []
-        for c in r["data"]:
-            candles.append([
-                int(c["t"]),
-                float(c["o"]),
-                float(c["h"]),
-                float(c["l"]),
-                float(c["c"]),
-                float(c["v"]),
-            ])
-        return candles
+    def fetch_ohlcv(self, symbol, timeframe="1m", since=None, limit=100, params={}):
+        # since..until is split into ohlcvChunkSize candle windows fetched concurrently,
+        # params: until (ms), asArray (numpy float64 array of shape (n, 6)), lean (records.Candles), fillGaps,
+        # useHistory (default True when historyDir is configured)
+        since, until, duration = self._ohlcv_range(timeframe, since, limit, params)
+        fill_gaps = self.safe_bool(params, "fillGaps", True)
+        as_array = self.safe_bool(params, "asArray", False)
+        lean = self.safe_bool(params, "lean", False)
+
+        if self.history is None or not self.safe_bool(params, "useHistory", True):
+            candles = self._download_ohlcv(symbol, timeframe, since, until, duration, fill_gaps)
+            return self._ohlcv_result(candles, limit, as_array, lean)
+
+        # only the ranges missing on disk are downloaded, usually just the tail
+        name = self._crypto_name(symbol)
+        downloaded = []
+        for start, end in self.history.missing_ohlcv(name, timeframe, since, until):
+            candles = self._download_ohlcv(symbol, timeframe, start, end, duration, fill_gaps)
+            self.history.write_ohlcv(name, timeframe, candles, start, end, duration, self.milliseconds())
+            downloaded += candles
+        return self._history_ohlcv_result(symbol, timeframe, since, until, downloaded, limit, as_array, lean)
+
+    def _download_ohlcv(self, symbol, timeframe, since, until, duration, fill_gaps) -> List[List]:
+        windows = self._ohlcv_windows(since, until, duration)
+        responses = self._fetch_kline_windows(symbol, timeframe, windows)
+
+        fetched = list(responses)
+        while windows and fill_gaps:
+            windows = self._ohlcv_truncated(windows, responses, duration)
+            responses = self._fetch_kline_windows(symbol, timeframe, windows)
+            fetched += responses
+
+        return self._stitch_ohlcv(fetched, since, until)
+
+    def _fetch_kline_windows(self, symbol, timeframe, windows) -> List[List[Dict]]:
+        def fetch(window):
+            return self._public_get("/kline", self._kline_params(symbol, timeframe, window))
+
+        if len(windows) <= 1:
+            return [fetch(window) for window in windows]
+        with ThreadPoolExecutor(max_workers=min(self.options["ohlcvConcurrency"], len(windows))) as pool:
+            return map_in_context(pool, fetch, windows)
 
     def fetch_margin_mode(self, symbol: str, params={}):
         return "cross"
 
     def set_margin_mode(self, marginMode: str, symbol: Str = None, params={}):
-        return None
\ No newline at end of file
+        return None
@@ -39,10 +39,10 @@ def main():
     #     exchange.cancel_order(order["id"])
     funding = exchange.fetch_funding_rate(symbol)
     print(
-        f"funding rate for {funding['symbol']}: {funding['info']['fundingRate']}@{funding['interval']} , lastTime: {funding['fundingDatetime']}, yearly: {funding['info']['fundingRateAnnualized'] * 100}%")
+        f"funding rate for {funding['symbol']}: {funding['info']['fundingRate']}@{funding['interval']} , lastTime: {funding['previousFundingDatetime']}, yearly: {funding['info']['fundingRateAnnualized'] * 100}%")
     funding = exchange.fetch_funding_rate("BTC/USD:USD")
     print(
-        f"funding rate for {funding['info']['symbol']}: {funding['info']['fundingRate']}@{funding['interval']} , lastTime: {funding['fundingDatetime']}, yearly: {funding['info']['fundingRateAnnualized'] * 100}%")
+        f"funding rate for {funding['info']['symbol']}: {funding['info']['fundingRate']}@{funding['interval']} , lastTime: {funding['previousFundingDatetime']}, yearly: {funding['info']['fundingRateAnnualized'] * 100}%")
     position = exchange.fetch_position(symbol)
     if position is not None:
         print(
@@ -0,0 +1,109 @@
+# =========================================================
+# MULTI-ACCOUNT MANAGER
+# =========================================================
+# One Pacifica instance per agent wallet, all of them sharing a single
+# pooled HTTP session, one response cache (markets, prices) and one set of
+# loaded markets. Private calls fan out over a thread pool and come back
+# keyed by l1walletAddress.
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
+
+from pacifica_ccxt_adapter.Pacifica import Pacifica
+from pacifica_ccxt_adapter.cache import TTLCache
+
+
+class AccountManager:
+    """Holds many accounts behind one connection pool and public-data cache.
+
+    ``accounts`` are per-account configs (at least ``l1walletAddress`` and
+    ``privateKey``), merged over the shared ``config``. With
+    ``return_exceptions=True`` a failing account maps to its exception
+    instead of aborting the whole fan-out.
+    """
+
+    def __init__(self, accounts: Iterable[Dict[str, Any]] = (), config: Optional[Dict[str, Any]] = None, max_workers: int = 16):
+        self.config = dict(config or {})
+        self.config.setdefault("poolSize", max_workers)
+        self.max_workers = max_workers
+        self.cache = self.config.get("cache") or TTLCache(
+            ttls=self.config.get("cacheTTL"),
+            max_size=int(self.config.get("cacheSize", 1024)),
+        )
+        self.session = self.config.get("session")
+        self.exchanges: Dict[str, Pacifica] = {}
+        for account in accounts:
+            self.add_account(account)
+
+    def add_account(self, account: Dict[str, Any]) -> Pacifica:
+        config = {**self.config, **account, "cache": self.cache}
+        if self.session is not None:
+            config["session"] = self.session
+        exchange = Pacifica(config)
+        # the first instance creates the pooled session, every later one mounts nothing new;
+        # the manager owns it, closing (or collecting) one account must not close it
+        self.session = exchange.session
+        exchange.own_session = False
+        if self.exchanges:
+            markets = next(iter(self.exchanges.values())).markets
+            if markets:
+                exchange.set_markets(markets)
+        self.exchanges[exchange.l1_wallet_address] = exchange
+        return exchange
+
+    def remove_account(self, address: str) -> Pacifica:
+        """Drop an account; the returned instance no longer uses the shared session."""
+        exchange = self.exchanges.pop(address)
+        exchange.session = exchange.transport.use_session()
+        exchange.own_session = True
+        return exchange
+
+    def __getitem__(self, address: str) -> Pacifica:
+        return self.exchanges[address]
+
+    def __len__(self):
+        return len(self.exchanges)
+
+    def load_markets(self, reload: bool = False) -> Dict:
+        """Load markets once and hand the same dict to every account."""
+        if not self.exchanges:
+            return {}
+        exchanges = list(self.exchanges.values())
+        markets = exchanges[0].load_markets(reload)
+        for exchange in exchanges[1:]:
+            exchange.set_markets(markets)
+        return markets
+
+    # -----------------------------------------------------
+    # fan-out
+    # -----------------------------------------------------
+    def call(self, method: str, *args, accounts: Optional[List[str]] = None, return_exceptions: bool = False, **kwargs) -> Dict[str, Any]:
+        """Run ``exchange.<method>(*args, **kwargs)`` for every (or the given) account concurrently."""
+        targets = [(address, self.exchanges[address]) for address in (accounts or self.exchanges)]
+        if not targets:
+            return {}
+
+        def run(target):
+            address, exchange = target
+            try:
+                return address, getattr(exchange, method)(*args, **kwargs)
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                return address, e
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(targets))) as pool:
+            return dict(pool.map(run, targets))
+
+    def fetch_balance(self, **kwargs) -> Dict[str, Any]:
+        return self.call("fetch_balance", **kwargs)
+
+    def fetch_positions(self, symbols=None, **kwargs) -> Dict[str, Any]:
+        return self.call("fetch_positions", symbols, **kwargs)
+
+    def fetch_orders(self, symbol: str = None, **kwargs) -> Dict[str, Any]:
+        return self.call("fetch_orders", symbol, **kwargs)
+
+    def close(self):
+        if self.session is not None:
+            self.session.close()
@@ -0,0 +1,890 @@
+# =========================================================
+# PACIFICA CCXT ADAPTER (ASYNC, AGENT WALLET, NO SDK)
+# =========================================================
+
+import asyncio
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from ccxt.async_support.base.exchange import Exchange
+from ccxt.base.errors import ArgumentsRequired, ExchangeError, InvalidOrder, NetworkError, OrderNotFound, NotSupported
+from ccxt.base.types import Balances, FundingRate, Int, Market, Order, Position, Str, Ticker, Trade
+
+from pacifica_ccxt_adapter.async_support.transport import AsyncHttpTransport
+from pacifica_ccxt_adapter.async_support.ws import WsClient
+from pacifica_ccxt_adapter.base import PacificaBase
+from pacifica_ccxt_adapter.const import EOrderSide, EOrderStatus
+from pacifica_ccxt_adapter.orderbook import LocalOrderBook
+from pacifica_ccxt_adapter.retry import AMBIGUOUS, classify
+
+
+# =========================================================
+# EXCHANGE
+# =========================================================
+class Pacifica(PacificaBase, Exchange):
+
+    def __init__(self, config: Dict[str, Any] = {}):
+        super().__init__(config)
+        self._setup(config)
+
+        # -------------------------
+        # Transport (one shared aiohttp session for every call)
+        # -------------------------
+        self.transport = AsyncHttpTransport(
+            self.base_url,
+            session=config.get("session"),
+            pool_size=int(config.get("poolSize", 10)),
+            timeout=self.timeout / 1000,
+            timeouts=config.get("timeouts"),
+            limiter=self.rate_limiter,
+        )
+        self.transport.observer = self.instrumentation.record_request
+        self.instrumentation.attach(self, type(self))
+
+        # -------------------------
+        # Websocket (market data streams)
+        # -------------------------
+        self.ws_url = config.get("wsUrl", "wss://ws.pacifica.fi/ws")
+        self.ws: Optional[WsClient] = None
+        self.local_books: Dict[str, LocalOrderBook] = {}
+
+        self.has.update({
+            "ws": True,
+            "watchOrderBook": True,
+            "watchTicker": True,
+            "watchTrades": True,
+            "watchOrders": True,
+            "watchMyTrades": True,
+            "watchPositions": True,
+        })
+
+    async def close(self, clean_instance_data=False):
+        if self.ws is not None:
+            await self.ws.close()
+            self.ws = None
+        await self.transport.close()
+        await super().close(clean_instance_data)
+
+    # =====================================================
+    # INTERNAL REQUEST
+    # =====================================================
+    async def _private_post(self, endpoint: str, payload: dict, type_name: str, confirm=None, landed=None):
+        # every attempt is signed when the rate limiter admits it, so a resend
+        # carries a fresh timestamp; landed(error) tells whether a resend failing
+        # with error means an earlier attempt already took effect ({} is returned)
+        body = lambda: self._sign_request(payload, type_name)
+        attempts = 0
+
+        async def send():
+            nonlocal attempts
+            attempts += 1
+            try:
+                return self._check_response(await self.transport.post(endpoint, body, timeout=15))
+            except ExchangeError as e:
+                if attempts > 1 and landed is not None and landed(e):
+                    return {}
+                raise
+
+        data = await self._with_retry(endpoint, send, confirm=confirm)
+        self.cache.invalidate_after(endpoint)
+        return data
+
+    async def _with_retry(self, endpoint: str, call, idempotent: bool = True, confirm=None):
+        """Await ``call()`` until it succeeds or the retry policy gives up.
+
+        ``idempotent=False`` resends only after errors the server did not act on
+        (429). After an ambiguous failure ``confirm()`` is asked whether the
+        attempt landed anyway: its data is returned instead of resending, None resends.
+        """
+        attempt = 0
+        while True:
+            try:
+                return await call()
+            except Exception as e:
+                delay = self.retry_policy.delay_for(e, attempt, idempotent=idempotent)
+                if delay is None:
+                    raise
+                if confirm is not None and classify(e) == AMBIGUOUS:
+                    try:
+                        data = await confirm()
+                    except Exception:
+                        raise e
+                    if data is not None:
+                        return data
+                self.instrumentation.count("retries", endpoint)
+                attempt += 1
+                await asyncio.sleep(delay)
+
+    async def _public_get(self, endpoint: str, params: dict = None, parse=None):
+        # parse, if given, turns the response into what is cached and returned
+        hit, data = self.cache.get(endpoint, params)
+        if hit:
+            return data
+        if not self.cache.cacheable(endpoint):
+            return self._parse_public(self._check_response(await self._get_with_retry(endpoint, params)), parse)
+
+        # concurrent misses on the same key await one request
+        return await asyncio.shield(self.cache.pending(endpoint, params, lambda: self._fetch_into_cache(endpoint, params, parse)))
+
+    async def _fetch_into_cache(self, endpoint: str, params: dict = None, parse=None):
+        data = self._parse_public(self._check_response(await self._get_with_retry(endpoint, params)), parse)
+        self.cache.set(endpoint, params, data)
+        return data
+
+    async def _get_with_retry(self, endpoint: str, params: dict = None):
+        # raw response, paginated endpoints keep next_cursor / has_more next to data
+        return await self._with_retry(endpoint, lambda: self.transport.get(endpoint, params=params))
+
+    def last_request_timing(self):
+        return self.transport.last_timing
+
+    # =====================================================
+    # MARKETS
+    # =====================================================
+    async def fetch_markets(self, params={}) -> List[Market]:
+        r = await self._public_get("/info")
+        return [self._parse_market(m) for m in r]
+
+    # =====================================================
+    # TICKER
+    # =====================================================
+    async def fetch_ticker(self, symbol: str, params={}) -> Ticker:
+        return (await self.fetch_tickers([symbol])).get(symbol)
+
+    async def fetch_tickers(self, symbols: List[str] = None, params={}) -> Dict[str, Ticker]:
+        # one /info/prices round trip, indexed by symbol once per snapshot
+        return self._parse_tickers(await self._fetch_prices(), symbols)
+
+    # =====================================================
+    # ORDER BOOK
+    # =====================================================
+    async def fetch_order_book(self, symbol: str, limit: Int = None, params={}) -> Dict:
+        # params: aggLevel, compact (l2book.L2Book of float64 arrays instead of lists)
+        data = await self._public_get("/book", {"symbol": self._crypto_name(symbol), "agg_level": self.safe_integer(params, "aggLevel", 1)})
+        return self._parse_order_book(data, symbol, limit, self.safe_bool(params, "compact", False))
+
+    # =====================================================
+    # BALANCE
+    # =====================================================
+    async def fetch_balance(self, params={}) -> Balances:
+        account_data = await self.fetch_accounts()
+        return self._parse_balance(account_data)
+
+    async def fetch_order(self, order_id, symbol=None, params={}):
+        # answered from the local order store (exchange id or client order id);
+        # the network is only used on a miss or with params={"refresh": True}
+        params = params or {}
+        if not self.safe_bool(params, "refresh", False):
+            order = self.order_store.get(order_id)
+            if order is not None:
+                return order
+
+        await self.fetch_orders()
+        order = self.order_store.get(order_id)
+        if order is not None:
+            return order
+
+        try:
+            rows = await self._public_get("/orders/history_by_id", {"order_id": order_id})
+        except ExchangeError as e:
+            raise OrderNotFound(f"{order_id}: {e}")
+        if not rows:
+            raise OrderNotFound(order_id)
+        return self.order_store.upsert(self._parse_order_history(rows))
+
+    async def fetch_orders(self, symbol: str = None, since: Int = None, limit: Int = None, params={}) -> List[Order]:
+        orders = await self._public_get("/orders", {**params, "account": self.l1_wallet_address})
+        parsed = self._parse_open_orders(orders)
+        self.order_store.sync_open(parsed)
+        if symbol is not None:
+            parsed = [o for o in parsed if o["symbol"] == symbol]
+        return parsed
+
+    async def fetch_open_orders(self, symbol: str = None, since: Int = None, limit: Int = None, params={}) -> List[Order]:
+        if self.safe_bool(params, "refresh", False) or not self.order_store.is_fresh(self._order_store_max_age()):
+            await self.fetch_orders()
+        orders = self.order_store.open_orders(symbol)
+        return self.filter_by_since_limit(orders, since, limit, "timestamp", True)
+
+    async def fetch_closed_orders(self, symbol: str = None, since: Int = None, limit: Int = None, params={}) -> List[Order]:
+        # answered from the order store once /orders/history was read back to since;
+        # read again (and upserted into the store) on a miss or with params={"refresh": True}
+        orders = self._closed_orders(symbol, since, limit)
+        if not self._closed_orders_miss(orders, symbol, since, limit, params):
+            return orders
+        bound = self._closed_history_bound(since, limit)
+        history, seen = [], set()
+        async for order in self.iter_orders_history(symbol, since):
+            # one row per order event, the first (newest) holds the order's state
+            if order["id"] in seen:
+                continue
+            seen.add(order["id"])
+            if order["status"] == EOrderStatus.OPEN.value:
+                continue
+            history.append(order)
+            if bound and len(history) >= bound:
+                break
+        self._store_closed_history(history, symbol, since, bound)
+        return self._closed_orders(symbol, since, limit)
+
+    # =====================================================
+    # ORDERS
+    # =====================================================
+    async def create_order(
+        self,
+        symbol: str,
+        type: str,
+        side: str,
+        amount: float,
+        price: Optional[float] = None,
+        params: Dict = {},
+    ) -> Order:
+        if type.lower() == "market" and price is None:
+            # priced from the book the order would sweep, no separate ticker fetch
+            price = self._market_price(await self._execution_book(symbol), side, amount)
+        payload, price, amount = self._create_order_payload(symbol, type, side, amount, price, params)
+
+        client_order_id = payload["client_order_id"]
+        try:
+            o = await self._private_post(
+                "/orders/create", payload, "create_order",
+                confirm=lambda: self._confirm_created(client_order_id),
+            )
+        except NetworkError:
+            # retries exhausted and the order may or may not exist:
+            # fetch_order(client_order_id) tells once the exchange is reachable
+            raise
+        except Exception as e:
+            raise InvalidOrder(str(e))
+
+        order = self._parse_created_order(o, symbol, type, side, amount, price, client_order_id)
+        return self.order_store.upsert(order)
+
+    async def _confirm_created(self, client_order_id: str):
+        # the create request may have landed: look for its client order id
+        # among open orders, then in the recent order history
+        order = self.order_store.get(client_order_id)
+        if order is None:
+            await self.fetch_orders()
+            order = self.order_store.get(client_order_id)
+        if order is not None:
+            return {"order_id": order["id"]}
+        rows = await self._public_get("/orders/history", {"account": self.l1_wallet_address, "limit": 100})
+        return self._find_client_order(rows, client_order_id)
+
+    async def execute_market_order(self, symbol: str, side: str, amount: float, params={}) -> Dict:
+        """Work a market order as IOC children inside a slippage budget (see execution.py).
+
+        Same params and report as the sync class. Children are priced from the
+        live ``watch_order_book`` book while it is valid, from ``fetch_order_book``
+        otherwise.
+        """
+        execution = self._market_execution(symbol, side, amount, params)
+        book = params.get("book") or await self._execution_book(symbol)
+        execution.start(book, self.milliseconds())
+        while True:
+            child = execution.next_child(book)
+            if child is None:
+                break
+            child_amount, child_price, expected = child
+            order = await self.create_order(symbol, "limit", side, child_amount, child_price, {"timeInForce": "ioc"})
+            fill = await self._child_fill(order)
+            if fill is None:
+                execution.record_unknown(order)
+                break
+            execution.record(fill, expected)
+            if execution.remaining <= 0:
+                break
+            book = await self._execution_book(symbol)
+        return execution.report()
+
+    async def _execution_book(self, symbol: str) -> Dict:
+        book = self.local_books.get(symbol)
+        if book is not None and book.valid:
+            return self._local_book_to_ccxt(book)
+        return await self.fetch_order_book(symbol)
+
+    async def _child_fill(self, order: Dict) -> Optional[Dict]:
+        # final state of an IOC child from the order store (account stream) or the
+        # order history, re-read briefly while missing; None if it stays unknown
+        for attempt in range(int(self.options["executionFillRetries"]) + 1):
+            if attempt:
+                await asyncio.sleep(self.options["executionFillDelay"])
+            known = self.order_store.get(order["id"])
+            if self._child_final(known):
+                return known
+            try:
+                rows = await self._public_get("/orders/history_by_id", {"order_id": order["id"]})
+            except ExchangeError:
+                rows = None
+            if rows:
+                child = self.order_store.upsert(self._parse_order_history(rows))
+                if self._child_final(child):
+                    return child
+        return None
+
+    async def cancel_order(self, id: str, symbol=None, params={}):
+        try:
+            if symbol is not None:
+                response = await self._private_post(
+                    "/cancel",
+                    {"order_id": int(id), "symbol": symbol},
+                    "cancel_order",
+                    landed=self._order_not_found,
+                )
+                if response is not None:
+                    self.order_store.set_status(id, EOrderStatus.CANCELED.value)
+                    return {"id": id, "status": "canceled", "info": response}
+            raise NotSupported(self.id + ' cancelOrder() needs id and symbol')
+        except NetworkError:
+            raise
+        except Exception:
+            raise OrderNotFound(id)
+
+    # -----------------------------------------------------
+    # BATCH ORDERS (one /orders/batch round trip per maxBatchSize actions)
+    # -----------------------------------------------------
+    async def create_orders(self, orders: List[Dict], params={}) -> List[Order]:
+        legs = [self._create_order_action(order) for order in orders]
+        results = await self._post_batch([action for action, _ in legs])
+        return [
+            self.order_store.upsert(self._parse_batch_create(result, leg))
+            for result, (_, leg) in zip(results, legs)
+        ]
+
+    async def cancel_orders(self, ids: List[str], symbol: str = None, params={}) -> List[Order]:
+        if symbol is None:
+            raise ArgumentsRequired(self.id + ' cancelOrders() requires a symbol argument')
+        results = await self._post_batch([self._cancel_order_action(id, symbol) for id in ids])
+        out = [self._parse_batch_cancel(result, id, symbol) for result, id in zip(results, ids)]
+        for order in out:
+            if order["status"] == EOrderStatus.CANCELED.value:
+                self.order_store.set_status(order["id"], EOrderStatus.CANCELED.value)
+        return out
+
+    async def edit_orders(self, orders: List[Dict], params={}) -> List[Order]:
+        # cancel-replace: every cancel is immediately followed by its replacement in the same
+        # request; the pair is not atomic, a replacement whose cancel failed is canceled again
+        actions = []
+        legs = []
+        for order in orders:
+            action, leg = self._create_order_action(order)
+            actions.append(self._cancel_order_action(order["id"], order["symbol"]))
+            actions.append(action)
+            legs.append(leg)
+
+        results = await self._post_batch(actions, group=2)
+
+        out = []
+        for i, (order, leg) in enumerate(zip(orders, legs)):
+            cancel_result, create_result = results[2 * i], results[2 * i + 1]
+            parsed = self._parse_batch_create(create_result, leg)
+            parsed["replaced"] = self._parse_batch_cancel(cancel_result, order["id"], order["symbol"])
+            if parsed["replaced"]["status"] == EOrderStatus.CANCELED.value:
+                self.order_store.set_status(order["id"], EOrderStatus.CANCELED.value)
+            out.append(self.order_store.upsert(parsed))
+
+        for symbol, unreplaced in self._unreplaced_by_symbol(out).items():
+            undone = await self.cancel_orders([order["id"] for order in unreplaced], symbol)
+            for order, cancel in zip(unreplaced, undone):
+                self._undo_replacement(order, cancel)
+        return out
+
+    async def _post_batch(self, actions: List[Dict], group: int = 1) -> List[Dict]:
+        # each action carries its own agent signature, the batch envelope is unsigned
+        chunks = self._chunk_actions(actions, group)
+        try:
+            responses = await asyncio.gather(
+                *[self._post_batch_chunk(chunk) for chunk in chunks],
+                return_exceptions=True,
+            )
+        finally:
+            self.cache.invalidate_after("/orders/batch")
+        results = []
+        for chunk, response in zip(chunks, responses):
+            # a failed chunk reports its legs as failed, the other chunks still come back
+            try:
+                if isinstance(response, BaseException):
+                    raise response
+                results.extend(self._batch_results(chunk, response))
+            except Exception as e:
+                results.extend(self._failed_chunk(chunk, e))
+        return results
+
+    async def _post_batch_chunk(self, chunk: List[Dict]):
+        # actions are signed up front and may have executed after a timeout,
+        # so only rejections the server did not act on (429) are resent
+        return await self._with_retry(
+            "/orders/batch",
+            lambda: self.transport.post("/orders/batch", {"actions": chunk}, timeout=15),
+            idempotent=False,
+        )
+
+    async def fetch_funding_rate(self, symbol: str, params={}) -> Optional[FundingRate]:
+        return (await self.fetch_funding_rates([symbol], params)).get(symbol)
+
+    async def fetch_funding_rates(self, symbols: List[str] = None, params={}) -> Dict[str, FundingRate]:
+        # every market's rate from one /info/prices snapshot, kept until the next
+        # hourly settlement; markets missing from it fall back to /funding_rate/history
+        hit, rates = self.cache.get("fundingRates")
+        if not hit or self.safe_bool(params, "refresh", False):
+            rates = self._parse_funding_rates(await self._fetch_prices())
+            self.cache.set("fundingRates", None, rates, ttl=self._funding_rates_ttl())
+        if symbols is None:
+            return dict(rates)
+
+        rates = {symbol: rates[symbol] for symbol in symbols if symbol in rates}
+        missing = [symbol for symbol in symbols if symbol not in rates]
+        if missing:
+            semaphore = asyncio.Semaphore(self.options["fundingConcurrency"])
+
+            async def fetch(symbol):
+                async with semaphore:
+                    return await self._fetch_last_funding_rate(symbol)
+
+            fetched = await asyncio.gather(*[fetch(symbol) for symbol in missing])
+            rates.update(zip(missing, fetched))
+        return rates
+
+    async def _fetch_last_funding_rate(self, symbol: str) -> FundingRate:
+        params = {'symbol': self._crypto_name(symbol), 'limit': 1}
+
+        response = (await self._public_get("/funding_rate/history", params))[0]
+        return self._parse_funding_rate(response, symbol)
+
+    async def fetch_funding_rate_history(self, symbol: str = None, since: Int = None, limit: Int = None, params={}) -> List[Dict]:
+        # follows next_cursor back in time until since (or limit rows) is covered
+        if symbol is None:
+            raise ArgumentsRequired(self.id + ' fetchFundingRateHistory() requires a symbol argument')
+        rows, cursor = [], None
+        while True:
+            page = await self._get_with_retry("/funding_rate/history", self._funding_page_params(symbol, cursor))
+            rows += self._check_response(page)
+            if self._funding_page_done(page, rows, since, limit):
+                break
+            cursor = page["next_cursor"]
+        return self._parse_funding_history(rows, symbol, since, limit)
+
+    # -----------------------------------------------------
+    # POSITIONS
+    # -----------------------------------------------------
+    async def fetch_position(self, symbol: str, params={}) -> Optional[Position]:
+        positions = await self.fetch_positions([symbol])
+        return positions[0] if positions else None
+
+    async def fetch_positions(self, symbols=None, params={}) -> List[Position]:
+        # positions, prices and settings are independent snapshots, fetch them concurrently
+        positions, prices, account_settings = await asyncio.gather(
+            self._fetch_raw_positions(),
+            self._fetch_prices(),
+            self._fetch_account_settings(),
+        )
+        positions = self._filter_positions(positions, symbols)
+        return self._parse_positions(positions, prices, account_settings)
+
+    async def fetch_portfolio(self, symbols=None, params={}):
+        """Positions as a columnar ``Portfolio`` (``.positions`` holds the ccxt dicts)."""
+        await self.load_markets()
+        positions, prices, account_settings, account = await asyncio.gather(
+            self._fetch_raw_positions(),
+            self._fetch_prices(),
+            self._fetch_account_settings(),
+            self.fetch_accounts(),
+        )
+        positions = self._filter_positions(positions, symbols)
+        return self._parse_portfolio(positions, prices, account_settings, account)
+
+    async def fetch_leverage(self, symbol: str, params={}):
+        return self._parse_leverage(await self._fetch_account_settings(), symbol)
+
+    async def set_leverage(self, leverage: int, symbol: str = None, params={}):
+        return await self._private_post(
+            "/account/leverage",
+            {"symbol": self._crypto_name(symbol), "leverage": int(leverage)},
+            "update_leverage",
+        )
+
+    async def _fetch_raw_positions(self):
+        return await self._public_get("/positions", {'account': self.l1_wallet_address})
+
+    async def _fetch_prices(self):
+        return await self._public_get("/info/prices", parse=self._index_prices)
+
+    async def _fetch_account_settings(self):
+        return await self._public_get("/account/settings", {'account': self.l1_wallet_address})
+
+    # =====================================================
+    # TRADES
+    # =====================================================
+    async def fetch_trades(self, symbol: str, since=None, limit=100, params={}) -> List[Trade]:
+        return await self.fetch_my_trades(symbol, since, limit)
+
+    async def fetch_my_trades(self, symbol=None, since=None, limit=100, params={}):
+        # recent fills only, iter_my_trades() walks the full history
+        payload = {}
+        if symbol:
+            payload["symbol"] = self._market_name(symbol)
+
+        trades = await self._private_post(
+            "/trades",
+            payload,
+            "get_trades",
+        )
+
+        lean = self.safe_value(params, "lean")
+        if lean:
+            return self._lean_my_trades(trades, lean, symbol, since, limit)
+
+        trades = [self._parse_my_trade(t) for t in trades]
+        if self.history is None:
+            return self.filter_by_since_limit(trades, since, limit)
+        # /trades only returns recent fills, the store keeps everything seen so far
+        self.history.write_trades(self.l1_wallet_address, self._history_trade_rows(trades))
+        return self._history_trades(trades, symbol, since, limit)
+
+    # -----------------------------------------------------
+    # ACCOUNT HISTORY (streamed page by page, newest first)
+    # -----------------------------------------------------
+    # params: until (ms), cursor (HistoryCursor or its dumps() string) to
+    # resume a traversal; a HistoryCursor passed in is advanced while
+    # iterating, a dumps() string only sets where the traversal starts
+    async def iter_my_trades(self, symbol=None, since=None, params={}):
+        async for trade in self._iter_history("trades", symbol, since, params):
+            yield trade
+
+    async def iter_orders_history(self, symbol=None, since=None, params={}):
+        async for order in self._iter_history("orders", symbol, since, params):
+            yield order
+
+    async def iter_funding_history(self, symbol=None, since=None, params={}):
+        async for payment in self._iter_history("funding", symbol, since, params):
+            yield payment
+
+    async def fetch_funding_history(self, symbol: Str = None, since: Int = None, limit: Int = None, params={}):
+        # pages run newest first: without since the latest limit payments
+        # are enough, with it the range is read back to since and the first
+        # limit after since are kept
+        payments = []
+        async for payment in self.iter_funding_history(symbol, since, params):
+            payments.append(payment)
+            if limit and since is None and len(payments) >= limit:
+                break
+        return self.filter_by_since_limit(payments[::-1], since, limit, "timestamp", since is None)
+
+    async def _iter_history(self, source: str, symbol, since, params):
+        endpoint, parser, _ = self._HISTORY_SOURCES[source]
+        parse = getattr(self, parser)
+        until = self.safe_integer(params, "until")
+        cursor = self._history_cursor(params)
+        while not cursor.done:
+            response = await self._get_with_retry(endpoint, self._history_page_params(source, cursor, symbol, since, until))
+            rows = self._check_response(response)
+            for row in rows[cursor.offset:]:
+                item = parse(row)
+                action = self._history_item_action(item, symbol, since, until)
+                if action == "stop":
+                    cursor.done = True
+                    return
+                if action == "yield":
+                    yield item
+                # counted once the caller asks for the next row: a crash while
+                # handling this one resumes with it
+                cursor.offset += 1
+            cursor.advance(response)
+
+    async def fetch_accounts(self, params={}):
+        params = {'account': self.l1_wallet_address}
+
+        return await self._public_get("/account", params)
+
+    # =====================================================
+    # OHLCV
+    # =====================================================
+    async def fetch_ohlcv(self, symbol, timeframe="1m", since=None, limit=100, params={}):
+        # since..until is split into ohlcvChunkSize candle windows fetched concurrently,
+        # params: until (ms), asArray (numpy float64 array of shape (n, 6)), lean (records.Candles), fillGaps,
+        # useHistory (default True when historyDir is configured)
+        since, until, duration = self._ohlcv_range(timeframe, since, limit, params)
+        fill_gaps = self.safe_bool(params, "fillGaps", True)
+        as_array = self.safe_bool(params, "asArray", False)
+        lean = self.safe_bool(params, "lean", False)
+
+        if self.history is None or not self.safe_bool(params, "useHistory", True):
+            candles = await self._download_ohlcv(symbol, timeframe, since, until, duration, fill_gaps)
+            return self._ohlcv_result(candles, limit, as_array, lean)
+
+        # only the ranges missing on disk are downloaded, usually just the tail
+        name = self._crypto_name(symbol)
+        downloaded = []
+        for start, end in self.history.missing_ohlcv(name, timeframe, since, until):
+            candles = await self._download_ohlcv(symbol, timeframe, start, end, duration, fill_gaps)
+            self.history.write_ohlcv(name, timeframe, candles, start, end, duration, self.milliseconds())
+            downloaded += candles
+        return self._history_ohlcv_result(symbol, timeframe, since, until, downloaded, limit, as_array, lean)
+
+    async def _download_ohlcv(self, symbol, timeframe, since, until, duration, fill_gaps) -> List[List]:
+        windows = self._ohlcv_windows(since, until, duration)
+        responses = await self._fetch_kline_windows(symbol, timeframe, windows)
+
+        fetched = list(responses)
+        while windows and fill_gaps:
+            windows = self._ohlcv_truncated(windows, responses, duration)
+            responses = await self._fetch_kline_windows(symbol, timeframe, windows)
+            fetched += responses
+
+        return self._stitch_ohlcv(fetched, since, until)
+
+    async def _fetch_kline_windows(self, symbol, timeframe, windows) -> List[List[Dict]]:
+        semaphore = asyncio.Semaphore(self.options["ohlcvConcurrency"])
+
+        async def fetch(window):
+            async with semaphore:
+                return await self._public_get("/kline", self._kline_params(symbol, timeframe, window))
+
+        return list(await asyncio.gather(*[fetch(window) for window in windows]))
+
+    async def fetch_margin_mode(self, symbol: str, params={}):
+        return "cross"
+
+    async def set_margin_mode(self, marginMode: str, symbol: Str = None, params={}):
+        return None
+
+    # =====================================================
+    # WEBSOCKET MARKET DATA
+    # =====================================================
+    def _ws_client(self) -> WsClient:
+        if self.ws is None:
+            self.ws = WsClient(self.ws_url, self._handle_ws_message, on_connect=self._on_ws_connect)
+        return self.ws
+
+    def _on_ws_connect(self):
+        # books are rebuilt from the snapshot sent after (re)subscribing
+        for book in self.local_books.values():
+            book.invalidate()
+        # order updates sent while disconnected were missed: the next
+        # fetch_open_orders reconciles the store over REST
+        self.order_store.invalidate()
+
+    async def watch_order_book(self, symbol: str, limit: Int = None, params={}):
+        client = self._ws_client()
+        future = client.future("orderbook:" + symbol)
+        name = self._crypto_name(symbol)
+        await client.subscribe("book:" + name, {"source": "book", "symbol": name, "agg_level": self.safe_integer(params, "aggLevel", 1)})
+        book = await future
+        if self.safe_bool(params, "compact", False):
+            return self._l2book().L2Book.from_dict(self._local_book_to_ccxt(book, limit))
+        return self._local_book_to_ccxt(book, limit)
+
+    async def watch_ticker(self, symbol: str, params={}) -> Ticker:
+        client = self._ws_client()
+        future = client.future("ticker:" + symbol)
+        await client.subscribe("prices", {"source": "prices"})
+        return await future
+
+    async def watch_trades(self, symbol: str, since: Int = None, limit: Int = None, params={}) -> List[Trade]:
+        client = self._ws_client()
+        future = client.future("trades:" + symbol)
+        name = self._crypto_name(symbol)
+        await client.subscribe("trades:" + name, {"source": "trades", "symbol": name})
+        trades = await future
+        return self.filter_by_since_limit(trades, since, limit, "timestamp", True)
+
+    def _handle_ws_message(self, message):
+        channel = message.get("channel")
+        if channel == "book":
+            self._handle_ws_book(message["data"])
+        elif channel == "prices":
+            self._handle_ws_prices(message["data"])
+        elif channel == "trades":
+            self._handle_ws_trades(message["data"])
+        elif channel == "account_order_updates":
+            self._handle_ws_orders(message["data"])
+        elif channel == "account_trades":
+            self._handle_ws_my_trades(message["data"])
+        elif channel == "account_positions":
+            self._handle_ws_positions(message["data"])
+
+    def _handle_ws_book(self, data):
+        symbol = self._ccxt_symbol(data["s"])
+        book = self.local_books.get(symbol)
+        if book is None:
+            book = self.local_books[symbol] = LocalOrderBook(symbol)
+
+        sequence = data.get("li")
+        if book.valid and sequence is not None and book.sequence is not None and sequence < book.sequence:
+            # the stream went backwards (replayed or reordered frames): resync from a fresh snapshot
+            book.invalidate()
+            asyncio.ensure_future(self.ws.resubscribe("book:" + data["s"]))
+            return
+
+        bids, asks = data["l"]
+        book.apply_snapshot(
+            [(level["p"], level["a"]) for level in bids],
+            [(level["p"], level["a"]) for level in asks],
+            sequence=sequence,
+            timestamp=data.get("t"),
+        )
+        self.ws.resolve("orderbook:" + symbol, book)
+
+    def _handle_ws_prices(self, data):
+        for price in data:
+            symbol = self._ccxt_symbol(price["symbol"])
+            ticker = self._parse_ticker(price, symbol)
+            self.tickers[symbol] = ticker
+            self.ws.resolve("ticker:" + symbol, ticker)
+
+    def _handle_ws_trades(self, data):
+        by_symbol: Dict[str, List[Dict]] = {}
+        for t in data:
+            trade = self._parse_ws_trade(t)
+            by_symbol.setdefault(trade["symbol"], []).append(trade)
+
+        trades_limit = self.safe_integer(self.options, "tradesLimit", 1000)
+        for symbol, trades in by_symbol.items():
+            cached = self.trades.get(symbol)
+            if cached is None:
+                cached = self.trades[symbol] = deque(maxlen=trades_limit)
+            cached.extend(trades)
+            self.ws.resolve("trades:" + symbol, trades)
+
+    def _parse_ws_trade(self, t) -> Dict:
+        ts = int(t["t"])
+        price = float(t["p"])
+        amount = float(t["a"])
+        return {
+            "id": str(t.get("h")),
+            "symbol": self._ccxt_symbol(t["s"]),
+            "side": "buy" if t["d"] in ("open_long", "close_short") else "sell",
+            "price": price,
+            "amount": amount,
+            "cost": price * amount,
+            "timestamp": ts,
+            "datetime": self.iso8601(ts),
+            "info": t,
+        }
+
+    # =====================================================
+    # WEBSOCKET ACCOUNT STREAMS
+    # =====================================================
+    async def watch_orders(self, symbol: str = None, since: Int = None, limit: Int = None, params={}) -> List[Order]:
+        orders = await self._watch_account("account_order_updates", "orders", symbol)
+        return self.filter_by_since_limit(orders, since, limit, "timestamp", True)
+
+    async def watch_my_trades(self, symbol: str = None, since: Int = None, limit: Int = None, params={}) -> List[Trade]:
+        trades = await self._watch_account("account_trades", "myTrades", symbol)
+        return self.filter_by_since_limit(trades, since, limit, "timestamp", True)
+
+    async def watch_positions(self, symbols: List[str] = None, since: Int = None, limit: Int = None, params={}) -> List[Position]:
+        positions = await self._watch_account("account_positions", "positions", None)
+        if symbols:
+            positions = [p for p in positions if p["symbol"] in symbols]
+        return positions
+
+    async def _watch_account(self, source: str, message_hash: str, symbol: str = None):
+        # account streams are keyed on the l1 wallet address; they are re-sent
+        # by WsClient after every reconnect like any other subscription
+        client = self._ws_client()
+        future = client.future(message_hash if symbol is None else message_hash + ":" + symbol)
+        await client.subscribe(source, {"source": source, "account": self.l1_wallet_address})
+        return await future
+
+    def _order_store_max_age(self) -> float:
+        # with the account stream running the store is kept current by push updates
+        # (only while connected and after one REST sync since the last connect)
+        if self.ws is not None and self.ws.connected.is_set() and "account_order_updates" in self.ws.subscriptions:
+            return float("inf")
+        return super()._order_store_max_age()
+
+    def _resolve_by_symbol(self, message_hash: str, items: List[Dict]):
+        self.ws.resolve(message_hash, items)
+        by_symbol: Dict[str, List[Dict]] = {}
+        for item in items:
+            by_symbol.setdefault(item["symbol"], []).append(item)
+        for symbol, symbol_items in by_symbol.items():
+            self.ws.resolve(message_hash + ":" + symbol, symbol_items)
+
+    def _handle_ws_orders(self, data):
+        orders = [self.order_store.upsert(self._parse_ws_order(o)) for o in data]
+        self._resolve_by_symbol("orders", orders)
+
+    def _handle_ws_my_trades(self, data):
+        trades = [self._parse_ws_my_trade(t) for t in data]
+        if self.myTrades is None:
+            self.myTrades = deque(maxlen=self.safe_integer(self.options, "tradesLimit", 1000))
+        self.myTrades.extend(trades)
+        self._resolve_by_symbol("myTrades", trades)
+
+    def _handle_ws_positions(self, data):
+        positions = [self._parse_ws_position(p) for p in data]
+        self.positions = {p["symbol"]: p for p in positions}
+        self.ws.resolve("positions", positions)
+
+    def _parse_ws_order(self, o) -> Dict:
+        amount = self.safe_float(o, "a")
+        filled = self.safe_float(o, "f", 0.0)
+        ts = self.safe_integer_2(o, "ut", "ct")
+        return {
+            "id": o["i"],
+            "clientOrderId": self.safe_string(o, "I"),
+            "symbol": self._ccxt_symbol(o["s"]),
+            "side": EOrderSide.BUY.value if o["d"] == "bid" else EOrderSide.SELL.value,
+            "type": self.safe_string(o, "ot"),
+            "price": self.safe_float_2(o, "ip", "p"),
+            "average": self.safe_float(o, "p"),
+            "amount": amount,
+            "filled": filled,
+            "remaining": amount - filled if amount is not None else None,
+            "status": self._parse_order_status(self.safe_string(o, "os")),
+            "reduceOnly": self.safe_bool(o, "r"),
+            "timestamp": ts,
+            "datetime": self.iso8601(ts),
+            "info": o,
+        }
+
+    def _parse_ws_my_trade(self, t) -> Dict:
+        ts = int(t["t"])
+        price = float(t["p"])
+        amount = float(t["a"])
+        return {
+            "id": str(t.get("h")),
+            "order": self.safe_value(t, "i"),
+            "clientOrderId": self.safe_string(t, "I"),
+            "symbol": self._ccxt_symbol(t["s"]),
+            "side": "buy" if t["ts"] in ("open_long", "close_short") else "sell",
+            "takerOrMaker": "maker" if t.get("te") == "fulfill_maker" else "taker",
+            "price": price,
+            "amount": amount,
+            "cost": price * amount,
+            "fee": {"cost": self.safe_float(t, "f"), "currency": self.currency},
+            "timestamp": ts,
+            "datetime": self.iso8601(ts),
+            "info": t,
+        }
+
+    def _parse_ws_position(self, p) -> Dict:
+        # same shape as a REST /positions row so _parse_position applies unchanged
+        row = {
+            "symbol": p["s"],
+            "side": p["d"],
+            "amount": p["a"],
+            "entry_price": p["p"],
+            "margin": p.get("m"),
+            "funding": p.get("f"),
+            "isolated": p.get("i"),
+            "liquidation_price": p.get("l"),
+            "updated_at": p.get("t"),
+        }
+        symbol = self._ccxt_symbol(p["s"])
+        ticker = self.tickers.get(symbol)
+        current_price = ticker["last"] if ticker else float(p["p"])
+        return self._parse_position(row, current_price, None)
+
+    def _local_book_to_ccxt(self, book: LocalOrderBook, limit: Int = None) -> Dict:
+        return {
+            "symbol": book.symbol,
+            "bids": book.bids(limit),
+            "asks": book.asks(limit),
+            "timestamp": book.timestamp,
+            "datetime": self.iso8601(book.timestamp),
+            "nonce": book.sequence,
+        }
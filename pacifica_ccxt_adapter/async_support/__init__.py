@@ -0,0 +1 @@
+from pacifica_ccxt_adapter.async_support.Pacifica import Pacifica  # noqa: F401
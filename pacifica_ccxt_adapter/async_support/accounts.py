@@ -0,0 +1,115 @@
+# =========================================================
+# MULTI-ACCOUNT MANAGER (ASYNC)
+# =========================================================
+
+import asyncio
+from typing import Any, Dict, Iterable, List, Optional
+
+from pacifica_ccxt_adapter.async_support.Pacifica import Pacifica
+from pacifica_ccxt_adapter.cache import TTLCache
+
+
+class AccountManager:
+    """asyncio counterpart of ``accounts.AccountManager``.
+
+    The aiohttp session is created inside the running loop by the first
+    account's transport and handed to every other one, so all accounts share
+    one connector. Per-account calls run concurrently with ``asyncio.gather``,
+    at most ``max_concurrency`` at a time.
+    """
+
+    def __init__(self, accounts: Iterable[Dict[str, Any]] = (), config: Optional[Dict[str, Any]] = None, max_concurrency: int = 16):
+        self.config = dict(config or {})
+        self.config.setdefault("poolSize", max_concurrency)
+        self.cache = self.config.get("cache") or TTLCache(
+            ttls=self.config.get("cacheTTL"),
+            max_size=int(self.config.get("cacheSize", 1024)),
+        )
+        self.session = self.config.get("session")
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.exchanges: Dict[str, Pacifica] = {}
+        for account in accounts:
+            self.add_account(account)
+
+    def add_account(self, account: Dict[str, Any]) -> Pacifica:
+        config = {**self.config, **account, "cache": self.cache}
+        if self.session is not None:
+            config["session"] = self.session
+        exchange = Pacifica(config)
+        if self.exchanges:
+            markets = next(iter(self.exchanges.values())).markets
+            if markets:
+                exchange.set_markets(markets)
+        self.exchanges[exchange.l1_wallet_address] = exchange
+        return exchange
+
+    async def remove_account(self, address: str):
+        # transports never own the shared session, closing one leaves it open
+        exchange = self.exchanges.pop(address)
+        await exchange.close()
+        return exchange
+
+    def __getitem__(self, address: str) -> Pacifica:
+        return self.exchanges[address]
+
+    def __len__(self):
+        return len(self.exchanges)
+
+    def _share_session(self):
+        if self.session is None:
+            first = next(iter(self.exchanges.values()))
+            self.session = first.transport._open()
+            first.transport.own_session = False
+        for exchange in self.exchanges.values():
+            if exchange.transport.session is None:
+                exchange.transport.session = self.session
+                exchange.transport.own_session = False
+
+    async def load_markets(self, reload: bool = False) -> Dict:
+        """Load markets once and hand the same dict to every account."""
+        if not self.exchanges:
+            return {}
+        self._share_session()
+        exchanges = list(self.exchanges.values())
+        markets = await exchanges[0].load_markets(reload)
+        for exchange in exchanges[1:]:
+            exchange.set_markets(markets)
+        return markets
+
+    # -----------------------------------------------------
+    # fan-out
+    # -----------------------------------------------------
+    async def call(self, method: str, *args, accounts: Optional[List[str]] = None, return_exceptions: bool = False, **kwargs) -> Dict[str, Any]:
+        """Await ``exchange.<method>(*args, **kwargs)`` for every (or the given) account concurrently."""
+        addresses = list(accounts or self.exchanges)
+        if not addresses:
+            return {}
+        self._share_session()
+
+        async def run(address):
+            async with self._semaphore:
+                return await getattr(self.exchanges[address], method)(*args, **kwargs)
+
+        results = await asyncio.gather(*[run(address) for address in addresses], return_exceptions=return_exceptions)
+        return dict(zip(addresses, results))
+
+    async def fetch_balance(self, **kwargs) -> Dict[str, Any]:
+        return await self.call("fetch_balance", **kwargs)
+
+    async def fetch_positions(self, symbols=None, **kwargs) -> Dict[str, Any]:
+        return await self.call("fetch_positions", symbols, **kwargs)
+
+    async def fetch_orders(self, symbol: str = None, **kwargs) -> Dict[str, Any]:
+        return await self.call("fetch_orders", symbol, **kwargs)
+
+    async def close(self):
+        await asyncio.gather(*[exchange.close() for exchange in self.exchanges.values()])
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
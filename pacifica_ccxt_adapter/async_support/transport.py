@@ -0,0 +1,161 @@
+# =========================================================
+# ASYNC HTTP TRANSPORT (SHARED aiohttp.ClientSession)
+# =========================================================
+
+import asyncio
+import json
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Optional, Union
+
+import aiohttp
+import ccxt
+
+from pacifica_ccxt_adapter.ratelimit import RateLimiter
+from pacifica_ccxt_adapter.transport import _JSON_HEADERS, RequestTiming, _status_error
+
+
+class AsyncHttpTransport:
+    """asyncio counterpart of ``HttpTransport``.
+
+    All requests share one ``aiohttp.ClientSession`` (created lazily inside the
+    running loop unless one is passed in), so concurrent calls reuse pooled
+    keep-alive connections. Connect timings come from aiohttp tracing.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        session: Optional[aiohttp.ClientSession] = None,
+        pool_size: int = 10,
+        timeout: float = 10,
+        timeouts: Optional[Dict[str, float]] = None,
+        max_timings: int = 1000,
+        limiter: Optional[RateLimiter] = None,
+    ):
+        self.base_url = base_url
+        self.limiter = limiter
+        # called with (RequestTiming, error or None) after every request
+        self.observer: Optional[Callable[[RequestTiming, Optional[BaseException]], None]] = None
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.timeouts = dict(timeouts or {})
+        self.timings = deque(maxlen=max_timings)
+        self.last_timing: Optional[RequestTiming] = None
+
+        self.session = session
+        self.own_session = session is None
+
+    def _open(self) -> aiohttp.ClientSession:
+        if self.session is None:
+            trace = aiohttp.TraceConfig()
+            trace.on_connection_create_start.append(self._on_connect_start)
+            trace.on_connection_create_end.append(self._on_connect_end)
+            connector = aiohttp.TCPConnector(limit=self.pool_size, enable_cleanup_closed=True)
+            self.session = aiohttp.ClientSession(connector=connector, trace_configs=[trace])
+        return self.session
+
+    @staticmethod
+    async def _on_connect_start(session, ctx, params):
+        if ctx.trace_request_ctx is not None:
+            ctx.trace_request_ctx["connect_start"] = time.perf_counter()
+
+    @staticmethod
+    async def _on_connect_end(session, ctx, params):
+        if ctx.trace_request_ctx is not None:
+            ctx.trace_request_ctx["connect"] = time.perf_counter() - ctx.trace_request_ctx["connect_start"]
+
+    def timeout_for(self, endpoint: str, default: Optional[float] = None) -> float:
+        if endpoint in self.timeouts:
+            return self.timeouts[endpoint]
+        return default if default is not None else self.timeout
+
+    async def request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        body: Union[Dict[str, Any], Callable[[], Dict[str, Any]], None] = None,
+        timeout: Optional[float] = None,
+    ):
+        # a callable body is built only once the rate limiter let the request
+        # through, so signatures are not aged by the queue wait
+        queued = await self.limiter.acquire_async(endpoint) if self.limiter is not None else 0.0
+        sign = serialize = 0.0
+        if callable(body):
+            t = time.perf_counter()
+            body = body()
+            sign = time.perf_counter() - t
+        data = None
+        if body is not None:
+            t = time.perf_counter()
+            data = json.dumps(body, allow_nan=False).encode("utf-8")
+            serialize = time.perf_counter() - t
+
+        session = self._open()
+        trace_ctx = {"connect": 0.0}
+        start = time.perf_counter()
+        try:
+            async with session.request(
+                method,
+                self.base_url + endpoint,
+                params=params,
+                data=data,
+                headers=_JSON_HEADERS if data is not None else None,
+                timeout=aiohttp.ClientTimeout(total=self.timeout_for(endpoint, timeout)),
+                trace_request_ctx=trace_ctx,
+            ) as r:
+                headers_at = time.perf_counter()
+                content = await r.read()
+                status = r.status
+        except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+            error_type = ccxt.RequestTimeout if isinstance(e, asyncio.TimeoutError) else ccxt.NetworkError
+            error = error_type(f"{method} {endpoint}: {e}")
+            elapsed = time.perf_counter() - start
+            self._observe(RequestTiming(method, endpoint, 0, 0.0, elapsed, 0.0, elapsed, queued, sign, serialize), error)
+            raise error
+        end = time.perf_counter()
+
+        connect = trace_ctx["connect"]
+        timing = RequestTiming(
+            method=method,
+            endpoint=endpoint,
+            status=status,
+            connect=connect,
+            wait=headers_at - start - connect,
+            transfer=end - headers_at,
+            total=end - start,
+            queued=queued,
+            sign=sign,
+            serialize=serialize,
+        )
+        self.timings.append(timing)
+        self.last_timing = timing
+
+        error = _status_error(status, content)
+        if error is not None:
+            if isinstance(error, ccxt.RateLimitExceeded) and self.limiter is not None:
+                self.limiter.penalize()
+            self._observe(timing, error)
+            raise error
+
+        t = time.perf_counter()
+        result = json.loads(content)
+        timing.parse = time.perf_counter() - t
+        self._observe(timing, None)
+        return result
+
+    def _observe(self, timing: RequestTiming, error: Optional[BaseException]):
+        if self.observer is not None:
+            self.observer(timing, error)
+
+    async def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None):
+        return await self.request("GET", endpoint, params=params, timeout=timeout)
+
+    async def post(self, endpoint: str, body: Union[Dict[str, Any], Callable[[], Dict[str, Any]]], timeout: Optional[float] = None):
+        return await self.request("POST", endpoint, body=body, timeout=timeout)
+
+    async def close(self):
+        if self.session is not None and self.own_session:
+            await self.session.close()
+        self.session = None
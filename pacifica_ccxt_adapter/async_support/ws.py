@@ -0,0 +1,177 @@
+# =========================================================
+# WEBSOCKET CLIENT (RECONNECTING, RESUBSCRIBING)
+# =========================================================
+
+import asyncio
+import json
+import logging
+from typing import Any, Callable, Dict, Optional
+
+import aiohttp
+from ccxt.base.errors import NetworkError
+
+logger = logging.getLogger(__name__)
+
+
+class WsClient:
+    """One Pacifica websocket connection shared by every ``watch_*`` call.
+
+    Subscriptions are remembered by key and replayed after every reconnect.
+    Callers wait on futures keyed by a message hash (ccxt.pro style) which the
+    exchange resolves from ``on_message``.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        on_message: Callable[[Dict[str, Any]], None],
+        on_connect: Optional[Callable[[], None]] = None,
+        ping_interval: float = 30,
+        reconnect_delay: float = 1,
+        max_reconnect_delay: float = 30,
+    ):
+        self.url = url
+        self.on_message = on_message
+        self.on_connect = on_connect
+        self.ping_interval = ping_interval
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.subscriptions: Dict[str, Dict[str, Any]] = {}
+        self.connected = asyncio.Event()
+        self.reconnects = 0
+
+        self._futures: Dict[str, asyncio.Future] = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    # -----------------------------------------------------
+    # futures
+    # -----------------------------------------------------
+    def future(self, message_hash: str) -> asyncio.Future:
+        future = self._futures.get(message_hash)
+        if future is None or future.done():
+            future = asyncio.get_running_loop().create_future()
+            self._futures[message_hash] = future
+        return future
+
+    def resolve(self, message_hash: str, value: Any):
+        future = self._futures.pop(message_hash, None)
+        if future is not None and not future.done():
+            future.set_result(value)
+
+    def reject(self, message_hash: str, error: Exception):
+        future = self._futures.pop(message_hash, None)
+        if future is not None and not future.done():
+            future.set_exception(error)
+
+    # -----------------------------------------------------
+    # subscriptions
+    # -----------------------------------------------------
+    async def subscribe(self, key: str, params: Dict[str, Any]):
+        self._ensure_started()
+        if key in self.subscriptions:
+            return
+        self.subscriptions[key] = params
+        if self.connected.is_set():
+            await self._send({"method": "subscribe", "params": params})
+
+    async def unsubscribe(self, key: str):
+        params = self.subscriptions.pop(key, None)
+        if params is not None and self.connected.is_set():
+            await self._send({"method": "unsubscribe", "params": params})
+
+    async def resubscribe(self, key: str):
+        params = self.subscriptions.get(key)
+        if params is not None and self.connected.is_set():
+            await self._send({"method": "unsubscribe", "params": params})
+            await self._send({"method": "subscribe", "params": params})
+
+    async def send(self, message: Dict[str, Any]):
+        self._ensure_started()
+        await self.connected.wait()
+        await self._send(message)
+
+    async def _send(self, message: Dict[str, Any]):
+        await self._ws.send_str(json.dumps(message))
+
+    # -----------------------------------------------------
+    # connection loop
+    # -----------------------------------------------------
+    def _ensure_started(self):
+        if self._closed:
+            raise NetworkError("websocket client is closed")
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        delay = self.reconnect_delay
+        if self._session is None:
+            self._session = aiohttp.ClientSession()
+
+        while not self._closed:
+            try:
+                async with self._session.ws_connect(self.url) as ws:
+                    self._ws = ws
+                    if self.on_connect is not None:
+                        self.on_connect()
+                    # snapshot the subscriptions in the same step as flagging the connection,
+                    # later subscribe() calls send for themselves
+                    self.connected.set()
+                    for params in list(self.subscriptions.values()):
+                        await self._send({"method": "subscribe", "params": params})
+                    delay = self.reconnect_delay
+
+                    pinger = asyncio.get_running_loop().create_task(self._ping(ws))
+                    try:
+                        async for msg in ws:
+                            if msg.type == aiohttp.WSMsgType.TEXT:
+                                self._dispatch(msg.data)
+                            elif msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                                break
+                    finally:
+                        pinger.cancel()
+            except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+                logger.warning("pacifica websocket error: %s", e)
+
+            self.connected.clear()
+            self._ws = None
+            if self._closed:
+                break
+            self.reconnects += 1
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def _ping(self, ws):
+        while True:
+            await asyncio.sleep(self.ping_interval)
+            await ws.send_str(json.dumps({"method": "ping"}))
+
+    def _dispatch(self, raw: str):
+        try:
+            message = json.loads(raw)
+        except ValueError:
+            logger.warning("pacifica websocket sent invalid json: %s", raw[:200])
+            return
+        if message.get("channel") == "pong":
+            return
+        try:
+            self.on_message(message)
+        except Exception:
+            logger.exception("pacifica websocket handler failed for %s", message.get("channel"))
+
+    async def close(self):
+        self._closed = True
+        if self._ws is not None:
+            await self._ws.close()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+        if self._session is not None:
+            await self._session.close()
+        for message_hash in list(self._futures):
+            self.reject(message_hash, NetworkError("websocket client closed"))
@@ -0,0 +1,1066 @@
+# =========================================================
+# SHARED PACIFICA LOGIC (SYNC + ASYNC)
+# =========================================================
+# Everything that does not perform I/O lives here: configuration,
+# request signing, symbol helpers and response parsing. The sync
+# (pacifica_ccxt_adapter.Pacifica) and async
+# (pacifica_ccxt_adapter.async_support.Pacifica) exchange classes only
+# add the transport calls on top.
+
+import math
+import time
+import uuid
+from decimal import Decimal
+from typing import Any, Dict, List, Tuple
+
+from ccxt.base.errors import AuthenticationError, ExchangeError, InvalidOrder, NotSupported
+
+from pacifica_ccxt_adapter.cache import TTLCache
+from pacifica_ccxt_adapter.const import EOrderSide, EOrderStatus
+from pacifica_ccxt_adapter.execution import MarketExecution, sweep
+from pacifica_ccxt_adapter.instrumentation import Instrumentation
+from pacifica_ccxt_adapter.normalizer import MarketNormalizer, Step
+from pacifica_ccxt_adapter.orderstore import OrderStore
+from pacifica_ccxt_adapter.pagination import HistoryCursor
+from pacifica_ccxt_adapter.ratelimit import shared_limiter
+from pacifica_ccxt_adapter.retry import AMBIGUOUS, RetryPolicy, classify
+from pacifica_ccxt_adapter.signing import json_backend, prepare_signed_message, sign_message
+
+
+class PacificaBase:
+    id = "pacifica"
+    name = "Pacifica"
+    rateLimit = 1000
+
+    def _setup(self, config: Dict[str, Any]):
+        self.id = "pacifica"
+
+        self.base_url = config.get(
+            "baseUrl", "https://api.pacifica.fi/api/v1"
+        )
+
+        # -------------------------
+        # Credentials
+        # -------------------------
+        self.l1_wallet_address = self.safe_string(config, "l1walletAddress")
+        agent_private_key = self.safe_string(config, "privateKey")
+
+        if not self.l1_wallet_address or not agent_private_key:
+            raise AuthenticationError(
+                "Pacifica requires l1walletAddress + agentPrivateKey"
+            )
+
+        from solders.keypair import Keypair  # deferred: not needed to import the module
+
+        self.agent_keypair = Keypair.from_base58_string(agent_private_key)
+        self.agent_public_key = str(self.agent_keypair.pubkey())
+        self._signing_dumps = json_backend(config.get("signingBackend", "json"))
+
+        self.currency = "USDC"
+
+        # -------------------------
+        # Response cache (per endpoint TTL, see cache.DEFAULT_TTLS), may be
+        # shared between instances: keys include the account query param
+        # -------------------------
+        self.cache = config.get("cache") or TTLCache(
+            ttls=config.get("cacheTTL"),
+            max_size=int(config.get("cacheSize", 256)),
+        )
+        self.order_store = OrderStore()
+        # symbol -> MarketNormalizer, rebuilt whenever markets are (re)loaded
+        self.normalizers: Dict[str, MarketNormalizer] = {}
+
+        # -------------------------
+        # Rate limiter, shared by all instances with the same budget key
+        # (default: the REST endpoint, i.e. one budget per IP)
+        # -------------------------
+        self.rate_limiter = None
+        if self.enableRateLimit:
+            limits = config.get("rateLimits") or {}
+            self.rate_limiter = shared_limiter(
+                limits.get("key", self.base_url),
+                capacity=limits.get("capacity", 20),
+                refill_rate=limits.get("refillRate", 10),
+                weights=limits.get("weights"),
+                lanes=limits.get("lanes"),
+            )
+
+        # -------------------------
+        # Instrumentation (off until an exporter is added)
+        # -------------------------
+        self.instrumentation = Instrumentation(config.get("exporters"))
+
+        # -------------------------
+        # On-disk OHLCV / own trade history (optional, needs numpy)
+        # -------------------------
+        self.history = None
+        if config.get("historyDir"):
+            try:
+                from pacifica_ccxt_adapter.history import HistoryStore
+            except ImportError:
+                raise NotSupported(self.id + " historyDir requires numpy (pip install pacifica-ccxt-adapter[numpy])")
+
+            self.history = HistoryStore(config["historyDir"])
+
+        # -------------------------
+        # Capabilities
+        # -------------------------
+        self.has.update({
+            "spot": False,
+            "margin": False,
+            "swap": True,
+            "future": False,
+            "option": False,
+
+            "fetchMarkets": True,
+            "fetchTicker": True,
+            "fetchTickers": True,
+            "fetchOrderBook": True,
+            "fetchOHLCV": True,
+
+            "fetchBalance": True,
+            "fetchTrades": True,
+            "fetchMyTrades": True,
+
+            "createOrder": True,
+            "cancelOrder": True,
+            "cancelAllOrders": True,
+            "createOrders": True,
+            "cancelOrders": True,
+            "editOrders": True,
+            "fetchOrder": True,
+            "fetchOrders": True,
+            "fetchOpenOrders": True,
+            "fetchClosedOrders": True,
+
+            "fetchPositions": True,
+            "fetchPosition": True,
+
+            "fetchFundingRate": True,
+            "fetchFundingRates": True,
+            "fetchFundingRateHistory": True,
+            "fetchFundingHistory": True,
+
+            "setLeverage": True,
+        })
+
+        self.options = self.deep_extend({
+            "defaultType": "swap",
+            "maxBatchSize": 10,  # actions per /orders/batch request
+            "orderStoreMaxAge": 5,  # seconds an open orders snapshot answers fetch_open_orders
+            "ohlcvChunkSize": 1000,  # candles per /kline request
+            "ohlcvConcurrency": 4,  # /kline requests in flight per fetch_ohlcv call
+            "fundingConcurrency": 4,  # /funding_rate/history requests in flight per fetch_funding_rates call
+            "fundingHistoryPageSize": 200,  # rows per /funding_rate/history request
+            "historyPageSize": 100,  # rows per page of the iter_* account history methods
+            "executionMaxSlippage": 0.005,  # execute_market_order budget, fraction of the arrival touch
+            "executionMaxChildren": 10,  # IOC children per execute_market_order call at most
+            "executionFillRetries": 3,  # re-reads of a child order whose final state is not known yet
+            "executionFillDelay": 0.2,  # seconds between those re-reads
+            "maxRetries": 3,  # resends after a 429, timeout or 5xx
+            "retryDelay": 0.25,  # seconds, doubled per attempt (full jitter)
+            "retryMaxDelay": 5,
+        }, self.options)
+
+        self.retry_policy = RetryPolicy(
+            max_retries=self.options["maxRetries"],
+            base_delay=self.options["retryDelay"],
+            max_delay=self.options["retryMaxDelay"],
+        )
+
+        self.fees.update({
+            'swap': {
+                'taker': self.parse_number('0.0002'),
+                'maker': self.parse_number('0.0002'),
+            },
+            'spot': {
+                'taker': self.parse_number('0.0002'),
+                'maker': self.parse_number('0.0002'),
+            },
+        })
+
+        self.timeframes = {
+            "1m": "1m", "3m": "3m", "5m": "5m", "15m": "15m", "30m": "30m",
+            "1h": "1h", "2h": "2h", "4h": "4h", "8h": "8h", "12h": "12h", "1d": "1d",
+        }
+
+        self.name = "Pacifica"
+        self.rateLimit = 1000
+
+    # =====================================================
+    # SIGNING
+    # =====================================================
+    def _sign_request(self, payload: dict, type_name: str) -> dict:
+        ts = int(time.time() * 1000)
+        expiry_window = 30000
+
+        message = prepare_signed_message(type_name, ts, expiry_window, payload, self._signing_dumps)
+        signature = sign_message(message, self.agent_keypair)
+
+        return {
+            "account": self.l1_wallet_address,
+            "agent_wallet": self.agent_public_key,
+            "signature": signature,
+            "timestamp": ts,
+            "expiry_window": expiry_window,
+            **payload
+        }
+
+    def _find_client_order(self, rows, client_order_id: str):
+        for row in rows or []:
+            if row.get("client_order_id") == client_order_id:
+                return {"order_id": row["order_id"]}
+        return None
+
+    def _order_not_found(self, error: Exception) -> bool:
+        # a resent cancel whose first attempt went through finds no order to cancel
+        # (an order filled in between looks the same and is reported canceled too)
+        return "not found" in str(error).lower()
+
+    def _check_response(self, data):
+        if not data.get("success", True):
+            raise ExchangeError(data.get("error"))
+
+        return data.get("data", data)
+
+    @staticmethod
+    def _parse_public(data, parse=None):
+        return parse(data) if parse is not None else data
+
+    # =====================================================
+    # HELPERS
+    # =====================================================
+    def _ccxt_symbol(self, market: str):
+        if "-" in market:
+            base, quote = market.split("-")
+        else:
+            base = market
+            quote = self.currency
+        return f"{base}/{quote}:{quote}"
+
+    def _market_name(self, symbol: str):
+        return symbol.replace("/", "-").split(":")[0]
+
+    def _crypto_name(self, symbol: str):
+        if "/" in symbol:
+            return symbol.split("/")[0]
+        return symbol
+
+    def _decimal_places(self, x):
+        return Step(x).exponent
+
+    # =====================================================
+    # PARSERS
+    # =====================================================
+    def _parse_market(self, m) -> Dict:
+        symbol = f"{m['symbol']}/{self.currency}:{self.currency}"
+        return {
+            "id": symbol,
+            "symbol": symbol,
+            "base": m['symbol'],
+            "quote": self.currency,
+            "settle": self.currency,
+            "spot": False,
+            "swap": True,
+            "contract": True,
+            "linear": True,
+            "precision": {
+                "price": self._decimal_places(m["tick_size"]),
+                "amount": self._decimal_places(m["lot_size"]),
+            },
+            "limits": {
+                "cost": {
+                    "min": float(m["min_order_size"]),
+                    "max": float(m["max_order_size"]),
+                },
+                "amount": {
+                    "min": float(m["min_tick"]),
+                    "max": float(m["max_tick"]),
+                },
+            },
+            "info": m,
+        }
+
+    def _parse_ticker(self, price, symbol: str) -> Dict:
+        return {
+            "symbol": symbol,
+            "timestamp": price["timestamp"],
+            "datetime": self.iso8601(price["timestamp"]),
+            "last": float(price["mid"]),
+            "bid": float(price["mark"]),
+            "ask": float(price["mark"]),
+            "high": -1,
+            "low": -1,
+            "baseVolume": float(price["volume_24h"]),
+            "info": price,
+        }
+
+    def _index_prices(self, prices) -> Dict[str, Dict]:
+        # /info/prices rows by exchange symbol, cached in place of the raw list
+        # so a scan of N fetch_ticker calls does not index the snapshot N times
+        return {price["symbol"]: price for price in prices}
+
+    def _parse_tickers(self, price_by_symbol, symbols: List[str] = None) -> Dict[str, Dict]:
+        if symbols is None:
+            return {
+                self._ccxt_symbol(price["symbol"]): self._parse_ticker(price, self._ccxt_symbol(price["symbol"]))
+                for price in price_by_symbol.values()
+            }
+
+        tickers = {}
+        for symbol in symbols:
+            price = price_by_symbol.get(self._crypto_name(symbol))
+            if price is not None:
+                tickers[symbol] = self._parse_ticker(price, symbol)
+        return tickers
+
+    def _parse_balance(self, account_data) -> Dict:
+        result = {"info": account_data}
+        result["USDC"] = {
+            "free": float(account_data["available_to_spend"]),
+            "used": float(account_data["total_margin_used"]),
+            "total": float(account_data["balance"]),
+        }
+        return self.safe_balance(result)
+
+    def _parse_open_order(self, o) -> Dict:
+        return {
+            "id": o["order_id"],
+            "clientOrderId": o.get("client_order_id"),
+            "symbol": self._ccxt_symbol(o["symbol"]),
+            "side": EOrderSide.BUY.value if o["side"] == "bid" else EOrderSide.SELL.value,
+            "type": str(o["order_type"]),
+            "price": float(o["price"]),
+            "amount": float(o["initial_amount"]),
+            "filled": float(o["filled_amount"]),
+            "remaining": float(o["initial_amount"]) - float(o["filled_amount"]),
+            "status": EOrderStatus.OPEN.value,
+            "timestamp": o.get("created_at"),
+            "info": o,
+        }
+
+    def _parse_order_history(self, rows) -> Dict:
+        # /orders/history_by_id returns every event of one order, the latest one holds its state
+        o = max(rows, key=lambda row: (row.get("created_at") or 0, row.get("history_id") or 0))
+        amount = float(o["initial_amount"])
+        filled = float(o.get("filled_amount") or 0)
+        return {
+            "id": o["order_id"],
+            "clientOrderId": o.get("client_order_id"),
+            "symbol": self._ccxt_symbol(o["symbol"]),
+            "side": EOrderSide.BUY.value if o["side"] == "bid" else EOrderSide.SELL.value,
+            "type": str(o.get("order_type")),
+            "price": float(o["price"]),
+            "amount": amount,
+            "filled": filled,
+            "remaining": amount - filled - float(o.get("cancelled_amount") or 0),
+            "average": float(o["average_filled_price"]) if o.get("average_filled_price") else None,
+            "status": self._parse_order_status(o.get("order_status")),
+            "timestamp": o.get("created_at"),
+            "info": o,
+        }
+
+    def _parse_order_status(self, status: str):
+        statuses = {
+            "open": EOrderStatus.OPEN.value,
+            "partially_filled": EOrderStatus.OPEN.value,
+            "filled": "closed",
+            "cancelled": EOrderStatus.CANCELED.value,
+            "canceled": EOrderStatus.CANCELED.value,
+            "rejected": EOrderStatus.REJECTED.value,
+        }
+        return statuses.get(status, status)
+
+    def _order_store_max_age(self) -> float:
+        return self.options["orderStoreMaxAge"]
+
+    def _closed_orders(self, symbol: str = None, since=None, limit=None) -> List[Dict]:
+        # oldest first; limit keeps the first orders after since, the latest ones without it
+        orders = sorted(self.order_store.closed_orders(symbol), key=lambda o: o.get("timestamp") or 0)
+        return self.filter_by_since_limit(orders, since, limit, "timestamp", since is None)
+
+    def _closed_orders_miss(self, orders: List[Dict], symbol: str = None, since=None, limit=None, params={}) -> bool:
+        # the store answers once the order history was read back to since (the
+        # latest orders without it) and it holds limit orders or the whole history
+        if self.safe_bool(params, "refresh", False) or not self.order_store.closed_synced(symbol, since):
+            return True
+        return limit is not None and len(orders) < limit and not self.order_store.closed_synced(symbol, since, complete=True)
+
+    def _closed_history_bound(self, since=None, limit=None):
+        # /orders/history runs newest first: with since the walk ends there,
+        # without it after limit (default historyPageSize) closed orders
+        return None if since is not None else (limit or self.options["historyPageSize"])
+
+    def _store_closed_history(self, orders: List[Dict], symbol: str = None, since=None, bound=None):
+        # a walk cut short at bound leaves everything older than its last order unread
+        oldest = orders[-1]["timestamp"] if bound and len(orders) >= bound else since
+        self.order_store.sync_closed(orders, symbol, oldest)
+
+    def _parse_open_orders(self, orders, symbol: str = None) -> List[Dict]:
+        parsed = []
+
+        for o in orders:
+            if symbol is not None and self._ccxt_symbol(o["symbol"]) != symbol:
+                continue
+            parsed.append(self._parse_open_order(o))
+
+        return parsed
+
+    def _funding_info(self, row, funding_rate: float, symbol: str) -> Dict:
+        # raw row plus the keys fetch_funding_rate always had in info (copied:
+        # /info/prices rows live in the response cache)
+        return {**row, "fundingRate": funding_rate, "fundingRateAnnualized": funding_rate * 24 * 365, "symbol": symbol}
+
+    def _parse_funding_rate(self, response, symbol: str) -> Dict:
+        # fallback for markets missing from /info/prices: the last /funding_rate/history row
+        funding_rate = float(response["funding_rate"])
+        settled = int(response.get("created_at", time.time()))
+        funding_timestamp = self._next_funding_timestamp(settled)
+        return {
+            "symbol": symbol,
+            "markPrice": None,
+            "indexPrice": None,
+            "fundingRate": funding_rate,
+            "nextFundingRate": None,
+            "timestamp": settled,
+            "datetime": self.iso8601(settled),
+            "fundingTimestamp": funding_timestamp,
+            "fundingDatetime": self.iso8601(funding_timestamp),
+            "previousFundingTimestamp": settled,
+            "previousFundingDatetime": self.iso8601(settled),
+            "interval": "1h",
+            "info": self._funding_info(response, funding_rate, symbol),
+        }
+
+    def _next_funding_timestamp(self, timestamp: int) -> int:
+        # funding is settled every full hour
+        return timestamp - timestamp % 3600000 + 3600000
+
+    def _parse_funding_snapshot(self, price, symbol: str) -> Dict:
+        # /info/prices carries the last settled rate and the estimate for the next hour
+        timestamp = int(price["timestamp"])
+        funding_timestamp = self._next_funding_timestamp(timestamp)
+        funding_rate = float(price["funding"])
+        next_funding = price.get("next_funding")
+        return {
+            "symbol": symbol,
+            "markPrice": float(price["mark"]),
+            "indexPrice": float(price["oracle"]) if price.get("oracle") is not None else None,
+            "fundingRate": funding_rate,
+            "nextFundingRate": float(next_funding) if next_funding is not None else None,
+            "timestamp": timestamp,
+            "datetime": self.iso8601(timestamp),
+            "fundingTimestamp": funding_timestamp,
+            "fundingDatetime": self.iso8601(funding_timestamp),
+            "previousFundingTimestamp": funding_timestamp - 3600000,
+            "previousFundingDatetime": self.iso8601(funding_timestamp - 3600000),
+            "interval": "1h",
+            "info": self._funding_info(price, funding_rate, symbol),
+        }
+
+    def _parse_funding_rates(self, price_by_symbol) -> Dict[str, Dict]:
+        rates = {}
+        for price in price_by_symbol.values():
+            if price.get("funding") is not None:
+                symbol = self._ccxt_symbol(price["symbol"])
+                rates[symbol] = self._parse_funding_snapshot(price, symbol)
+        return rates
+
+    def _funding_rates_ttl(self) -> float:
+        # a snapshot stays valid until the next settlement
+        now = self.milliseconds()
+        return (self._next_funding_timestamp(now) - now) / 1000
+
+    def _parse_funding_history(self, rows, symbol: str, since=None, limit=None) -> List[Dict]:
+        out = []
+        for row in rows:
+            timestamp = int(row["created_at"])
+            if since is not None and timestamp < since:
+                continue
+            out.append({
+                "symbol": symbol,
+                "fundingRate": float(row["funding_rate"]),
+                "timestamp": timestamp,
+                "datetime": self.iso8601(timestamp),
+                "info": row,
+            })
+        out.sort(key=lambda r: r["timestamp"])
+        if limit:
+            out = out[:limit] if since is not None else out[-limit:]
+        return out
+
+    def _funding_page_params(self, symbol: str, cursor=None) -> Dict:
+        params = {"symbol": self._crypto_name(symbol), "limit": self.options["fundingHistoryPageSize"]}
+        if cursor is not None:
+            params["cursor"] = cursor
+        return params
+
+    def _funding_page_done(self, page, rows, since, limit) -> bool:
+        # pages run newest to oldest
+        if not page.get("has_more") or not page.get("next_cursor"):
+            return True
+        if since is not None:
+            return bool(rows) and min(int(r["created_at"]) for r in rows) < since
+        return limit is None or len(rows) >= limit
+
+    def _parse_position(self, p, current_price, leverage) -> Dict:
+        symbol = self._ccxt_symbol(p["symbol"])
+        amount = float(p["amount"])
+        entry_price = float(p["entry_price"])
+        direction = 1 if p["side"] == "bid" else -1
+        # no price for the market in the snapshot: mark and PnL stay unknown
+        mark_price = float(current_price) if current_price is not None else None
+        notional = amount * mark_price if mark_price is not None else None
+        unrealized_pnl = direction * (mark_price - entry_price) * amount if mark_price is not None else None
+        return {
+            "symbol": symbol,
+            "side": "buy" if direction == 1 else "sell",
+            "contracts": amount,
+            "amount": amount,
+            "entryPrice": entry_price,
+            "markPrice": mark_price,
+            "unrealisedPnl": unrealized_pnl,
+            "leverage": leverage,
+            "marginMode": "isolated" if p.get("isolated") else "cross",
+            "info": self.extend({"unrealisedPnl": unrealized_pnl, "curRealisedPnl": 0, "size": p["amount"], "positionValue": notional}, p)
+        }
+
+    def _parse_leverage(self, account_settings, symbol: str):
+        for setting in account_settings:
+            if setting["symbol"] == self._crypto_name(symbol):
+                return float(setting[("leverage")])
+        return 10  # default
+
+    def _parse_positions(self, positions, price_by_symbol, account_settings) -> List[Dict]:
+        # one pass over all positions using symbol keyed lookups into a single
+        # prices and a single account settings snapshot
+        leverage_by_symbol = {s["symbol"]: float(s["leverage"]) for s in account_settings}
+
+        out = []
+        for p in positions:
+            price = price_by_symbol.get(p["symbol"])
+            current_price = float(price["mid"]) if price else None
+            leverage = leverage_by_symbol.get(p["symbol"], 10)  # default
+            out.append(self._parse_position(p, current_price, leverage))
+        return out
+
+    def _maintenance_rate(self, symbol: str) -> float:
+        # maintenance margin is half the initial margin at the market's max leverage
+        market = (self.markets or {}).get(self._ccxt_symbol(symbol)) or {}
+        max_leverage = float((market.get("info") or {}).get("max_leverage") or 50)
+        return 0.5 / max_leverage
+
+    def _parse_portfolio(self, positions, price_by_symbol, account_settings, account):
+        try:
+            from pacifica_ccxt_adapter.portfolio import DEFAULT_LEVERAGE, Portfolio
+        except ImportError:
+            raise NotSupported(self.id + " fetchPortfolio() requires numpy")
+
+        parsed = self._parse_positions(positions, price_by_symbol, account_settings)
+        return Portfolio(
+            symbols=[p["symbol"] for p in parsed],
+            size=[p["amount"] for p in parsed],
+            side=[1.0 if p["side"] == "buy" else -1.0 for p in parsed],
+            entry=[p["entryPrice"] for p in parsed],
+            # a position without a price is valued at its entry (no PnL)
+            mark=[p["entryPrice"] if p["markPrice"] is None else p["markPrice"] for p in parsed],
+            leverage=[p["leverage"] or DEFAULT_LEVERAGE for p in parsed],
+            maintenance_rate=[self._maintenance_rate(p["symbol"]) for p in positions],
+            isolated=[bool(p.get("isolated")) for p in positions],
+            isolated_margin=[float(p.get("margin") or 0) for p in positions],
+            equity=float(account["account_equity"]),
+            positions=parsed,
+        )
+
+    def _filter_positions(self, positions, symbols=None):
+        if not symbols:
+            return positions
+        return [p for p in positions if self._ccxt_symbol(p["symbol"]) in symbols]
+
+    def _parse_my_trade(self, t) -> Dict:
+        ts = int(t["timestamp"] * 1000)
+        return {
+            "id": str(t["trade_id"]),
+            "symbol": self._ccxt_symbol(t["symbol"]),
+            "side": t["side"],
+            "price": float(t["price"]),
+            "amount": float(t["size"]),
+            "timestamp": ts,
+            "datetime": self.iso8601(ts),
+            "cost": float(t["price"]) * float(t["size"]),
+            "fee": t.get("fee"),
+            "info": t,
+        }
+
+    def _parse_trade_history(self, t) -> Dict:
+        # /trades/history rows: one fill per row, created_at in ms
+        ts = int(t["created_at"])
+        price = float(t["price"])
+        amount = float(t["amount"])
+        fee = t.get("fee")
+        return {
+            "id": str(t["history_id"]),
+            "order": str(t["order_id"]) if t.get("order_id") is not None else None,
+            "clientOrderId": t.get("client_order_id"),
+            "symbol": self._ccxt_symbol(t["symbol"]),
+            "side": t["side"],
+            "price": price,
+            "amount": amount,
+            "timestamp": ts,
+            "datetime": self.iso8601(ts),
+            "cost": price * amount,
+            "fee": float(fee) if fee is not None else None,
+            "info": t,
+        }
+
+    def _parse_funding_payment(self, row) -> Dict:
+        ts = int(row["created_at"])
+        return {
+            "id": str(row["history_id"]),
+            "symbol": self._ccxt_symbol(row["symbol"]),
+            "code": self.currency,
+            "amount": float(row["payout"]),
+            "rate": float(row["rate"]) if row.get("rate") is not None else None,
+            "timestamp": ts,
+            "datetime": self.iso8601(ts),
+            "info": row,
+        }
+
+    def _parse_order_book(self, data, symbol: str, limit=None, compact: bool = False):
+        # /book: {"s", "t", "l": [bids best first, asks best first]} of {"p", "a", "n"} levels
+        if compact:
+            return self._l2book().L2Book.from_levels(data, symbol, limit)
+        bids, asks = data["l"]
+        timestamp = data.get("t")
+        return {
+            "symbol": symbol,
+            "bids": [[float(level["p"]), float(level["a"])] for level in bids[:limit]],
+            "asks": [[float(level["p"]), float(level["a"])] for level in asks[:limit]],
+            "timestamp": timestamp,
+            "datetime": self.iso8601(timestamp),
+            "nonce": data.get("li"),
+        }
+
+    def _parse_ohlcv_row(self, c) -> List:
+        return [
+            int(c["t"]),
+            float(c["o"]),
+            float(c["h"]),
+            float(c["l"]),
+            float(c["c"]),
+            float(c["v"]),
+        ]
+
+    # =====================================================
+    # ACCOUNT HISTORY ITERATION
+    # =====================================================
+    # name -> (endpoint, row parser name, server side time filter)
+    _HISTORY_SOURCES = {
+        "trades": ("/trades/history", "_parse_trade_history", True),
+        "orders": ("/orders/history", "_parse_history_order", False),
+        "funding": ("/funding/history", "_parse_funding_payment", False),
+    }
+
+    def _parse_history_order(self, row) -> Dict:
+        return self._parse_order_history([row])
+
+    def _history_cursor(self, params) -> HistoryCursor:
+        # a dumps() string is parsed into a cursor of our own, only a
+        # HistoryCursor object shows the caller how far the traversal got
+        cursor = self.safe_value(params, "cursor")
+        if isinstance(cursor, str):
+            return HistoryCursor.loads(cursor)
+        return cursor if cursor is not None else HistoryCursor()
+
+    def _history_page_params(self, source: str, cursor: HistoryCursor, symbol=None, since=None, until=None) -> Dict:
+        params = {"account": self.l1_wallet_address, "limit": self.options["historyPageSize"]}
+        if self._HISTORY_SOURCES[source][2]:
+            if symbol:
+                params["symbol"] = self._crypto_name(symbol)
+            if since is not None:
+                params["start_time"] = since
+            if until is not None:
+                params["end_time"] = until
+        if cursor.page is not None:
+            params["cursor"] = cursor.page
+        return params
+
+    def _history_item_action(self, item: Dict, symbol=None, since=None, until=None) -> str:
+        # pages run newest to oldest: the first row before since ends the traversal
+        ts = item.get("timestamp")
+        if since is not None and ts is not None and ts < since:
+            return "stop"
+        if (until is not None and ts is not None and ts >= until) or (symbol and item.get("symbol") != symbol):
+            return "skip"
+        return "yield"
+
+    # =====================================================
+    # OHLCV PAGINATION
+    # =====================================================
+    def _ohlcv_range(self, timeframe: str, since, limit, params) -> Tuple[int, int, int]:
+        duration = self.parse_timeframe(timeframe) * 1000
+        until = self.safe_integer(params, "until")
+        if since is None:
+            until = until if until is not None else self.milliseconds()
+            since = until - (limit or 100) * duration
+        elif until is None:
+            until = since + limit * duration if limit else self.milliseconds()
+        return int(since), int(until), duration
+
+    def _ohlcv_windows(self, since: int, until: int, duration: int) -> List[Tuple[int, int]]:
+        step = self.options["ohlcvChunkSize"] * duration
+        return [(start, min(start + step, until)) for start in range(since, until, step)]
+
+    def _kline_params(self, symbol: str, timeframe: str, window: Tuple[int, int]) -> Dict:
+        return {
+            "symbol": self._crypto_name(symbol),
+            "interval": self.timeframes.get(timeframe, timeframe),
+            "start_time": window[0],
+            "end_time": window[1],
+        }
+
+    def _stitch_ohlcv(self, responses: List[List[Dict]], since: int, until: int) -> List[List]:
+        # chunks overlap on their borders and may arrive in any order
+        by_time = {}
+        for rows in responses:
+            for row in rows:
+                candle = self._parse_ohlcv_row(row)
+                if since <= candle[0] < until:
+                    by_time[candle[0]] = candle
+        return [by_time[t] for t in sorted(by_time)]
+
+    def _ohlcv_truncated(self, windows: List[Tuple[int, int]], responses: List[List[Dict]], duration: int) -> List[Tuple[int, int]]:
+        # a window whose candles stop short of its end was either capped by the
+        # server or has a genuine trailing gap; ask once more for the remainder,
+        # an empty answer to that follow-up means the gap is real
+        remainders = []
+        for (start, end), rows in zip(windows, responses):
+            if not rows:
+                continue
+            last = max(int(row["t"]) for row in rows)
+            if last + duration < end:
+                remainders.append((last + duration, end))
+        return remainders
+
+    def _ohlcv_result(self, candles: List[List], limit, as_array: bool, lean: bool = False):
+        if limit:
+            candles = candles[:limit]
+        if not as_array and not lean:
+            return candles
+        try:
+            import numpy as np
+        except ImportError:
+            raise NotSupported(self.id + " fetchOHLCV() asArray / lean requires numpy")
+        out = np.empty((len(candles), 6), dtype=np.float64)
+        if candles:
+            out[:] = candles
+        return self._records().Candles.from_array(out) if lean else out
+
+    # =====================================================
+    # HISTORY STORE
+    # =====================================================
+    def _history_ohlcv_result(self, symbol: str, timeframe: str, since: int, until: int, downloaded: List[List], limit, as_array: bool, lean: bool = False):
+        # closed candles come from disk, the still open one (never persisted)
+        # from this call's download
+        name = self._crypto_name(symbol)
+        stored = self.history.read_ohlcv(name, timeframe, since, until)
+        stored_until = max([end for _, end in self.history.ohlcv_coverage(name, timeframe)], default=since)
+        live = [c for c in downloaded if max(since, stored_until) <= c[0] < until]
+        if live:
+            import numpy as np
+
+            stored = np.concatenate([stored, np.asarray(live, dtype=np.float64)])
+        if limit:
+            stored = stored[:limit]
+        if lean:
+            return self._records().Candles.from_array(stored)
+        if as_array:
+            return stored
+        return [[int(t), o, h, l, c, v] for t, o, h, l, c, v in stored.tolist()]
+
+    # =====================================================
+    # LEAN RECORDS
+    # =====================================================
+    def _records(self):
+        try:
+            from pacifica_ccxt_adapter import records
+        except ImportError:
+            raise NotSupported(self.id + " lean results require numpy")
+        return records
+
+    def _l2book(self):
+        try:
+            from pacifica_ccxt_adapter import l2book
+        except ImportError:
+            raise NotSupported(self.id + " compact order books require numpy")
+        return l2book
+
+    def _since_limit_index(self, timestamps: List[int], since=None, limit=None) -> List[int]:
+        # positions of the rows filter_by_since_limit keeps for the dict result
+        rows = [{"timestamp": timestamp, "index": i} for i, timestamp in enumerate(timestamps)]
+        return [row["index"] for row in self.filter_by_since_limit(rows, since, limit)]
+
+    def _lean_my_trades(self, rows, lean, symbol=None, since=None, limit=None):
+        # lean="records": list of TradeRecord, anything else truthy: TradeColumns
+        records = self._records()
+        if self.history is None:
+            if lean == "records":
+                trades = [records.TradeRecord.from_row(t, self._ccxt_symbol(t["symbol"])) for t in rows]
+                return [trades[i] for i in self._since_limit_index([t.timestamp for t in trades], since, limit)]
+            columns = records.TradeColumns.from_rows(rows, self._ccxt_symbol)
+            return columns.take(self._since_limit_index(columns.timestamp.tolist(), since, limit))
+
+        columns = records.TradeColumns.from_rows(rows, self._ccxt_symbol)
+        self.history.write_trades(self.l1_wallet_address, columns.to_history())
+        stored = self.history.read_trades(self.l1_wallet_address, symbol, since)
+        if limit:
+            stored = stored[:limit] if since is not None else stored[-limit:]
+        columns = records.TradeColumns.from_history(stored)
+        return columns.records() if lean == "records" else columns
+
+    # =====================================================
+    # HISTORY STORE (TRADES)
+    # =====================================================
+    def _history_trade_rows(self, trades: List[Dict]):
+        from pacifica_ccxt_adapter.history import TRADE_DTYPE
+        import numpy as np
+
+        rows = np.empty(len(trades), dtype=TRADE_DTYPE)
+        for i, t in enumerate(trades):
+            fee = t.get("fee")
+            rows[i] = (
+                t["timestamp"], t["id"], t["symbol"], t["price"], t["amount"],
+                float(fee) if fee is not None else float("nan"), t["side"],
+            )
+        return rows
+
+    def _history_trades(self, fetched: List[Dict], symbol=None, since=None, limit=None) -> List[Dict]:
+        # trades of the latest response keep their raw payload, older ones are rebuilt from disk
+        by_id = {t["id"]: t for t in fetched}
+        rows = self.history.read_trades(self.l1_wallet_address, symbol, since)
+        if limit:
+            rows = rows[:limit] if since is not None else rows[-limit:]
+        out = []
+        for ts, id, sym, price, amount, fee, side in rows.tolist():
+            trade = by_id.get(id)
+            if trade is None:
+                trade = {
+                    "id": id,
+                    "symbol": sym,
+                    "side": side,
+                    "price": price,
+                    "amount": amount,
+                    "timestamp": ts,
+                    "datetime": self.iso8601(ts),
+                    "cost": price * amount,
+                    "fee": None if math.isnan(fee) else fee,
+                    "info": None,
+                }
+            out.append(trade)
+        return out
+
+    # =====================================================
+    # ORDERS
+    # =====================================================
+    def set_markets(self, markets, currencies=None):
+        result = super().set_markets(markets, currencies)
+        self.normalizers = {
+            symbol: MarketNormalizer(symbol, market["info"]["tick_size"], market["info"]["lot_size"])
+            for symbol, market in self.markets.items()
+            if "tick_size" in (market.get("info") or {})
+        }
+        return result
+
+    def _normalizer(self, market) -> MarketNormalizer:
+        normalizer = self.normalizers.get(market["symbol"])
+        if normalizer is None:
+            # markets set without the raw /info row: fall back to the precision digits
+            normalizer = MarketNormalizer(
+                market["symbol"],
+                f"1e-{market['precision']['price']}",
+                f"1e-{market['precision']['amount']}",
+            )
+            self.normalizers[market["symbol"]] = normalizer
+        return normalizer
+
+    def normalize_order(self, market, price, amount, side):
+        price, amount = self._normalizer(market).normalize(price, amount, side)
+        return Decimal(price), Decimal(amount)
+
+    def round_to_step(self, value, step, rounding):
+        return (value / step).to_integral_value(rounding=rounding) * step
+
+    def _create_order_payload(self, symbol: str, type: str, side: str, amount, price, params: Dict):
+        if type.lower() == "market":
+            time_in_force = "ioc"
+            if side.lower() == "buy":
+                price = float(price) * 1.001
+            else:
+                price = float(price) * 0.999
+        else:
+            time_in_force = str(params.get("timeInForce", "gtc")).lower()
+
+        price, amount = self._normalizer(self.markets[symbol]).normalize(price, amount, side)
+
+        payload = {
+            "symbol": self._crypto_name(symbol),
+            "side": "bid" if side == EOrderSide.BUY.value else "ask",
+            "amount": amount,
+            "client_order_id": str(uuid.uuid4()),
+            "tif": time_in_force,
+            "reduce_only": False,
+        }
+
+        if "tp" in params:
+            payload["take_profit"] = {
+                "stop_price": str(params["tp"].get("price")),
+                "limit_price": str(params["tp"].get("price")),
+                "client_order_id": str(uuid.uuid4())
+            }
+
+        if "sl" in params:
+            payload["stop_loss"] = {
+                "stop_price": str(params["sl"].get("price")),
+                "limit_price": str(params["sl"].get("price")),
+                "client_order_id": str(uuid.uuid4())
+            }
+
+        if float(price):
+            payload["price"] = price
+
+        return payload, price, amount
+
+    def _parse_created_order(self, o, symbol: str, type: str, side: str, amount, price, client_order_id: str = None) -> Dict:
+        fee = float(self.fees["swap"]["taker"]) * float(amount) * float(price)
+
+        return {
+            "id": str(o["order_id"]),
+            "clientOrderId": client_order_id,
+            "symbol": symbol,
+            "type": type,
+            "side": side,
+            "price": float(price),
+            "amount": float(amount),
+            'fees':
+                {
+                    'cost': fee,
+                    'currency': 'USDC',
+                    'rate': 0.004
+                },
+            'fee':
+                {
+                    'cost': fee,
+                    'currency': 'USDC',
+                    'rate': 0.004
+                },
+            "status": o.get("status", "open"),
+            "info": o,
+        }
+
+    # =====================================================
+    # MARKET EXECUTION
+    # =====================================================
+    def _market_execution(self, symbol: str, side: str, amount, params: Dict) -> MarketExecution:
+        return MarketExecution(
+            self._normalizer(self.markets[symbol]),
+            side,
+            float(amount),
+            float(self.safe_number(params, "maxSlippage", self.options["executionMaxSlippage"])),
+            self.safe_number(params, "maxChildAmount"),
+            int(self.safe_integer(params, "maxChildren", self.options["executionMaxChildren"])),
+        )
+
+    def _child_final(self, order) -> bool:
+        # an IOC child only counts once the exchange reports it done
+        return order is not None and order.get("status") != EOrderStatus.OPEN.value and order.get("filled") is not None
+
+    def _market_price(self, book: Dict, side: str, amount) -> float:
+        # sweep price of the whole amount, create_order pads it like a given price
+        levels = book["asks"] if side == "buy" else book["bids"]
+        if not levels:
+            raise InvalidOrder(f"{self.id} {book['symbol']} order book has no {'asks' if side == 'buy' else 'bids'}")
+        _, _, worst = sweep(levels, float(amount))
+        return worst
+
+    # =====================================================
+    # BATCH ORDERS
+    # =====================================================
+    def _create_order_action(self, order: Dict) -> Tuple[Dict, Tuple]:
+        symbol = order["symbol"]
+        type = order["type"]
+        side = order["side"]
+        payload, price, amount = self._create_order_payload(
+            symbol, type, side, order["amount"], order.get("price"), order.get("params") or {}
+        )
+        action = {"type": "Create", "data": self._sign_request(payload, "create_order")}
+        return action, (symbol, type, side, amount, price, payload["client_order_id"])
+
+    def _cancel_order_action(self, id, symbol: str) -> Dict:
+        payload = {"order_id": int(id), "symbol": self._crypto_name(symbol)}
+        return {"type": "Cancel", "data": self._sign_request(payload, "cancel_order")}
+
+    def _chunk_actions(self, actions: List[Dict], group: int = 1) -> List[List[Dict]]:
+        # never split a group (e.g. a cancel + replace pair) across two requests
+        size = max(group, self.options["maxBatchSize"] // group * group)
+        return [actions[i:i + size] for i in range(0, len(actions), size)]
+
+    def _failed_chunk(self, chunk: List[Dict], error: Exception, unknown: bool = None) -> List[Dict]:
+        # one failed result per action of a request that raised; after an
+        # ambiguous error (timeout, 5xx) the actions may have executed
+        if unknown is None:
+            unknown = classify(error) == AMBIGUOUS
+        return [{"success": False, "unknown": unknown, "error": str(error)} for _ in chunk]
+
+    def _batch_results(self, chunk: List[Dict], response) -> List[Dict]:
+        results = self._check_response(response)["results"]
+        if len(results) != len(chunk):
+            # results cannot be matched to actions: none of them is known to have failed
+            error = ExchangeError(f"{self.id} /orders/batch returned {len(results)} results for {len(chunk)} actions")
+            return self._failed_chunk(chunk, error, unknown=True)
+        return results
+
+    def _batch_failure_status(self, result: Dict) -> str:
+        return EOrderStatus.UNKNOWN.value if result.get("unknown") else EOrderStatus.REJECTED.value
+
+    def _parse_batch_create(self, result: Dict, leg: Tuple) -> Dict:
+        symbol, type, side, amount, price, client_order_id = leg
+        if result.get("success"):
+            return self._parse_created_order(result, symbol, type, side, amount, price, client_order_id)
+        return {
+            "id": None,
+            "clientOrderId": client_order_id,
+            "symbol": symbol,
+            "type": type,
+            "side": side,
+            "price": float(price),
+            "amount": float(amount),
+            "status": self._batch_failure_status(result),
+            "error": result.get("error"),
+            "info": result,
+        }
+
+    def _unreplaced_by_symbol(self, orders: List[Dict]) -> Dict[str, List[Dict]]:
+        # replacements placed while their original order was not canceled (filled,
+        # rejected, unknown): left live they would double the exposure
+        by_symbol: Dict[str, List[Dict]] = {}
+        for order in orders:
+            if order["id"] is not None and order["replaced"]["status"] != EOrderStatus.CANCELED.value:
+                by_symbol.setdefault(order["symbol"], []).append(order)
+        return by_symbol
+
+    def _undo_replacement(self, order: Dict, cancel: Dict):
+        if cancel["status"] == EOrderStatus.CANCELED.value:
+            order["status"] = EOrderStatus.CANCELED.value
+        else:
+            # still live, the caller has to deal with it
+            order["error"] = cancel.get("error")
+
+    def _parse_batch_cancel(self, result: Dict, id, symbol: str) -> Dict:
+        return {
+            "id": id,
+            "symbol": symbol,
+            "status": EOrderStatus.CANCELED.value if result.get("success") else self._batch_failure_status(result),
+            "error": result.get("error"),
+            "info": result,
+        }
+
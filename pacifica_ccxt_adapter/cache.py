@@ -0,0 +1,131 @@
+# =========================================================
+# TTL RESPONSE CACHE
+# =========================================================
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+# seconds a response stays valid, endpoints not listed here are never cached
+DEFAULT_TTLS = {
+    "/info": 300,
+    "/account/settings": 5,
+    "/info/prices": 0.5,
+    # parsed fetch_funding_rates() snapshot, stored until the next funding settlement
+    "fundingRates": 3600,
+}
+
+# cached endpoints that become stale after one of our own mutating calls
+DEFAULT_INVALIDATIONS = {
+    "/orders/create": ("/orders", "/positions", "/account"),
+    "/cancel": ("/orders", "/positions", "/account"),
+    "/orders/batch": ("/orders", "/positions", "/account"),
+    "/account/leverage": ("/account/settings", "/positions", "/account"),
+}
+
+
+class TTLCache:
+    """Bounded per-endpoint TTL cache for public GET responses.
+
+    Entries are keyed on endpoint + query params and evicted least recently
+    used once ``max_size`` is reached. Hits and misses are counted per endpoint.
+    """
+
+    def __init__(
+        self,
+        ttls: Optional[Dict[str, float]] = None,
+        max_size: int = 256,
+        invalidations: Optional[Dict[str, Iterable[str]]] = None,
+        clock=time.monotonic,
+    ):
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.max_size = max_size
+        self.invalidations = {**DEFAULT_INVALIDATIONS, **(invalidations or {})}
+        self.clock = clock
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+        self._entries: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks: Dict[Tuple, threading.Lock] = {}
+        self._pending: Dict[Tuple, "asyncio.Future"] = {}
+
+    @staticmethod
+    def _key(endpoint: str, params: Optional[Dict[str, Any]]) -> Tuple:
+        return endpoint, tuple(sorted(params.items())) if params else ()
+
+    def cacheable(self, endpoint: str) -> bool:
+        return self.ttls.get(endpoint, 0) > 0
+
+    def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Tuple[bool, Any]:
+        if not self.cacheable(endpoint):
+            return False, None
+
+        key = self._key(endpoint, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > self.clock():
+                self._entries.move_to_end(key)
+                self.hits[endpoint] = self.hits.get(endpoint, 0) + 1
+                return True, entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses[endpoint] = self.misses.get(endpoint, 0) + 1
+        return False, None
+
+    def set(self, endpoint: str, params: Optional[Dict[str, Any]], value: Any, ttl: Optional[float] = None):
+        ttl = self.ttls.get(endpoint, 0) if ttl is None else ttl
+        if ttl <= 0:
+            return
+
+        key = self._key(endpoint, params)
+        with self._lock:
+            self._entries[key] = (self.clock() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    # -----------------------------------------------------
+    # request coalescing: concurrent misses on one key (e.g. many accounts
+    # sharing this cache) wait for a single request instead of each sending one
+    # -----------------------------------------------------
+    def key_lock(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> threading.Lock:
+        key = self._key(endpoint, params)
+        with self._lock:
+            lock = self._key_locks.get(key)
+            if lock is None:
+                lock = self._key_locks[key] = threading.Lock()
+        return lock
+
+    def pending(self, endpoint: str, params: Optional[Dict[str, Any]], start: Callable[[], Awaitable]) -> "asyncio.Future":
+        """The in-flight fetch of this key, started with ``start()`` when there is none."""
+        key = self._key(endpoint, params)
+        future = self._pending.get(key)
+        if future is None:
+            future = asyncio.ensure_future(start())
+            self._pending[key] = future
+            future.add_done_callback(lambda _: self._pending.pop(key, None))
+        return future
+
+    def invalidate(self, *endpoints: str):
+        with self._lock:
+            for key in [k for k in self._entries if k[0] in endpoints]:
+                del self._entries[key]
+
+    def invalidate_after(self, mutating_endpoint: str):
+        stale = self.invalidations.get(mutating_endpoint)
+        if stale:
+            self.invalidate(*stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": dict(self.hits),
+                "misses": dict(self.misses),
+            }
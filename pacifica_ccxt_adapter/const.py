@@ -25,6 +25,7 @@ class EOrderStatus(str, Enum):
     OPEN = "open"
     CANCELED = "canceled"
     REDUCE_ONLY_CANCELED = "reduceOnlyCanceled"
+    UNKNOWN = "unknown"
 
     @classmethod
     def valueOf(cls, value):
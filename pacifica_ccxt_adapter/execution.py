@@ -0,0 +1,144 @@
+# =========================================================
+# ORDER BOOK AWARE MARKET EXECUTION
+# =========================================================
+# A market order is worked as a series of IOC limit children priced from
+# the order book instead of one IOC at last price +/- 0.1%. Every child
+# takes only the depth resting inside a slippage budget fixed at arrival
+# (touch * (1 +/- maxSlippage)), so the whole order never trades through
+# that price; whatever the book cannot fill inside it is left unfilled.
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from pacifica_ccxt_adapter.const import EOrderStatus
+from pacifica_ccxt_adapter.normalizer import MarketNormalizer
+
+
+def sweep(levels: Sequence[Sequence[float]], amount: float, limit_price: Optional[float] = None, buy: bool = True) -> Tuple[float, float, Optional[float]]:
+    """Walk ``levels`` (``[price, amount]``, best first) for ``amount``.
+
+    Returns ``(filled, average, worst)``: the amount available, its volume
+    weighted price and the price of the last level touched. Levels beyond
+    ``limit_price`` are not taken.
+    """
+    filled = cost = 0.0
+    worst = None
+    for level in levels:
+        if filled >= amount:
+            break
+        price, size = float(level[0]), float(level[1])
+        if limit_price is not None and (price > limit_price if buy else price < limit_price):
+            break
+        take = min(size, amount - filled)
+        filled += take
+        cost += take * price
+        worst = price
+    return filled, (cost / filled if filled else 0.0), worst
+
+
+class MarketExecution:
+    """State of one book-driven market order: budget, children and fills."""
+
+    def __init__(
+        self,
+        normalizer: MarketNormalizer,
+        side: str,
+        amount: float,
+        max_slippage: float,
+        max_child_amount: Optional[float] = None,
+        max_children: int = 10,
+    ):
+        self.normalizer = normalizer
+        self.symbol = normalizer.symbol
+        self.side = side
+        self.buy = side == "buy"
+        self.amount = normalizer.round_amount(amount)
+        self.max_slippage = max_slippage
+        self.max_child_amount = max_child_amount
+        self.max_children = max_children
+        self.reference: Optional[float] = None  # touch price at arrival
+        self.limit_price: Optional[float] = None  # worst price any child may trade at
+        self.timestamp: Optional[int] = None
+        self.orders: List[Dict] = []
+        self.filled = 0.0
+        self.cost = 0.0
+        self.unknown = False  # a child whose fill could not be read back
+
+    def _levels(self, book: Dict) -> List:
+        return book["asks"] if self.buy else book["bids"]
+
+    @property
+    def remaining(self) -> float:
+        return max(0.0, self.normalizer.round_amount(self.amount - self.filled))
+
+    def start(self, book: Dict, timestamp: Optional[int] = None):
+        """Fix the reference price and the slippage limit from the arrival book."""
+        levels = self._levels(book)
+        if not levels:
+            return
+        self.reference = float(levels[0][0])
+        bound = self.reference * (1 + self.max_slippage if self.buy else 1 - self.max_slippage)
+        # round towards the touch, a child never crosses the budget
+        self.limit_price = self.normalizer.round_price(bound, self.side)
+        self.timestamp = timestamp
+
+    def next_child(self, book: Dict) -> Optional[Tuple[float, float, float]]:
+        """``(amount, price, expected average)`` of the next IOC child, None when done.
+
+        The child takes the depth inside the budget up to ``max_child_amount``
+        and is priced at the last level it needs (the sweep price).
+        """
+        if self.limit_price is None or self.unknown or len(self.orders) >= self.max_children:
+            return None
+        wanted = self.remaining
+        if self.max_child_amount:
+            wanted = min(wanted, self.max_child_amount)
+        available, average, worst = sweep(self._levels(book), wanted, self.limit_price, self.buy)
+        amount = self.normalizer.round_amount(available)
+        if amount <= 0 or worst is None:
+            return None
+        return amount, worst, average
+
+    def record(self, order: Dict, expected_average: float):
+        """Account the fill of one child (``filled`` / ``average`` of its final state)."""
+        filled = float(order.get("filled") or 0)
+        average = order.get("average") or (expected_average if filled else 0.0)
+        self.filled += filled
+        self.cost += filled * average
+        self.orders.append(order)
+        return filled
+
+    def record_unknown(self, order: Dict):
+        """A child whose outcome is unknown: kept out of ``filled`` / ``cost``, the execution stops."""
+        self.orders.append({**order, "status": EOrderStatus.UNKNOWN.value, "filled": None})
+        self.unknown = True
+
+    def report(self) -> Dict:
+        average = self.cost / self.filled if self.filled else None
+        slippage = None
+        if average is not None and self.reference:
+            # positive = paid above (buy) / sold below (sell) the arrival touch
+            slippage = (average - self.reference) / self.reference * (1 if self.buy else -1)
+        remaining = self.remaining
+        if self.unknown:
+            # some amount may have traded on top of ``filled``, check ``orders``
+            status = EOrderStatus.UNKNOWN.value
+        elif remaining <= 0:
+            status = EOrderStatus.CLOSED.value
+        else:
+            status = EOrderStatus.CANCELED.value
+        return {
+            "symbol": self.symbol,
+            "side": self.side,
+            "type": "market",
+            "amount": self.amount,
+            "filled": self.filled,
+            "remaining": remaining,
+            "average": average,
+            "cost": self.cost,
+            "referencePrice": self.reference,
+            "limitPrice": self.limit_price,
+            "slippage": slippage,
+            "status": status,
+            "timestamp": self.timestamp,
+            "orders": self.orders,
+        }
@@ -0,0 +1,196 @@
+# =========================================================
+# ON-DISK OHLCV / TRADE HISTORY
+# =========================================================
+# One .npy file per (symbol, timeframe) for candles and one per account for
+# own trades, plus a small .json sidecar recording which time ranges have been
+# downloaded. Readers memory-map the .npy files; writers merge into a temp
+# file and os.replace() it, so a reader in another process always sees
+# either the old or the new file, never a half written one. The .npy and its
+# sidecar are replaced one after the other, not together (see _replace).
+
+import json
+import os
+import re
+import tempfile
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # windows: writers are not serialised across processes
+    fcntl = None
+
+TRADE_DTYPE = np.dtype([
+    ("timestamp", "<i8"),
+    ("id", "<U40"),
+    ("symbol", "<U24"),
+    ("price", "<f8"),
+    ("amount", "<f8"),
+    ("fee", "<f8"),
+    ("side", "<U16"),
+])
+
+
+class HistoryStore:
+    """Columnar history files under ``root`` shared by any number of processes.
+
+    Candles are stored as float64 ``(n, 6)`` arrays (timestamp, open, high,
+    low, close, volume) sorted by timestamp. Only candles that have closed
+    are persisted, so the in-progress candle is always fetched live.
+    """
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(os.path.expanduser(root))
+        os.makedirs(os.path.join(self.root, "ohlcv"), exist_ok=True)
+        os.makedirs(os.path.join(self.root, "trades"), exist_ok=True)
+
+    # -----------------------------------------------------
+    # files
+    # -----------------------------------------------------
+    @staticmethod
+    def _slug(name: str) -> str:
+        return re.sub(r"[^A-Za-z0-9_.-]", "_", name)
+
+    def _ohlcv_path(self, symbol: str, timeframe: str) -> str:
+        return os.path.join(self.root, "ohlcv", f"{self._slug(symbol)}_{self._slug(timeframe)}.npy")
+
+    def _trades_path(self, account: str) -> str:
+        return os.path.join(self.root, "trades", f"{self._slug(account)}.npy")
+
+    @staticmethod
+    def _load(path: str, mmap: bool = True) -> Optional[np.ndarray]:
+        try:
+            return np.load(path, mmap_mode="r" if mmap else None)
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _load_meta(path: str) -> Dict:
+        try:
+            with open(path + ".json") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    @staticmethod
+    def _replace(path: str, array: np.ndarray, meta: Dict):
+        # data first, sidecar second: in between (or after a crash) a reader sees
+        # new rows with the old coverage and at worst downloads a range again.
+        # The other order could record a range as downloaded before its rows exist.
+        directory = os.path.dirname(path)
+        for target, write in (
+            (path, lambda f: np.save(f, array)),
+            (path + ".json", lambda f: f.write(json.dumps(meta).encode())),
+        ):
+            fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    write(f)
+                os.replace(tmp, target)
+            except BaseException:
+                if os.path.exists(tmp):
+                    os.unlink(tmp)
+                raise
+
+    @contextmanager
+    def _write_lock(self, path: str):
+        # readers never lock; this only keeps two writers from losing each other's rows
+        if fcntl is None:
+            yield
+            return
+        with open(path + ".lock", "w") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    # -----------------------------------------------------
+    # ohlcv
+    # -----------------------------------------------------
+    def ohlcv_coverage(self, symbol: str, timeframe: str) -> List[Tuple[int, int]]:
+        """Sorted, disjoint ``(from, to)`` ranges that have been downloaded."""
+        meta = self._load_meta(self._ohlcv_path(symbol, timeframe))
+        return [(int(a), int(b)) for a, b in meta.get("ranges", [])]
+
+    def missing_ohlcv(self, symbol: str, timeframe: str, since: int, until: int) -> List[Tuple[int, int]]:
+        """Sub-ranges of ``since..until`` that have not been downloaded yet."""
+        missing = []
+        for start, end in self.ohlcv_coverage(symbol, timeframe):
+            if end <= since or start >= until:
+                continue
+            if start > since:
+                missing.append((since, start))
+            since = max(since, end)
+        if since < until:
+            missing.append((since, until))
+        return missing
+
+    def read_ohlcv(self, symbol: str, timeframe: str, since: int, until: int) -> np.ndarray:
+        """Read-only memory-mapped view of the stored candles in ``since..until``."""
+        data = self._load(self._ohlcv_path(symbol, timeframe))
+        if data is None or not len(data):
+            return np.empty((0, 6), dtype=np.float64)
+        lo, hi = np.searchsorted(data[:, 0], [since, until], side="left")
+        return data[lo:hi]
+
+    def write_ohlcv(self, symbol: str, timeframe: str, candles: Iterable, since: int, until: int, duration: int, now: int):
+        """Merge the candles downloaded for ``since..until`` into the store.
+
+        ``until`` is clipped to the start of the candle still open at ``now``.
+        """
+        until = min(until, now - now % duration)
+        if until <= since:
+            return
+        new = np.asarray(candles, dtype=np.float64).reshape(-1, 6)
+        new = new[(new[:, 0] >= since) & (new[:, 0] < until)]
+
+        path = self._ohlcv_path(symbol, timeframe)
+        with self._write_lock(path):
+            old = self._load(path, mmap=False)
+            if old is not None and len(old):
+                # the fresh download is authoritative for since..until
+                old = old[(old[:, 0] < since) | (old[:, 0] >= until)]
+                new = np.concatenate([old, new])
+                new = np.ascontiguousarray(new[np.argsort(new[:, 0], kind="stable")])
+
+            ranges = []
+            for start, end in sorted(self.ohlcv_coverage(symbol, timeframe) + [(since, until)]):
+                if ranges and start <= ranges[-1][1]:
+                    ranges[-1][1] = max(ranges[-1][1], end)
+                else:
+                    ranges.append([start, end])
+            self._replace(path, new, {"ranges": ranges})
+
+    # -----------------------------------------------------
+    # trades
+    # -----------------------------------------------------
+    def read_trades(self, account: str, symbol: Optional[str] = None, since: Optional[int] = None) -> np.ndarray:
+        """Stored trades of ``account`` sorted by timestamp (memory-mapped unless filtered by symbol)."""
+        data = self._load(self._trades_path(account))
+        if data is None:
+            return np.empty(0, dtype=TRADE_DTYPE)
+        if since is not None:
+            data = data[np.searchsorted(data["timestamp"], since, side="left"):]
+        if symbol is not None:
+            data = data[data["symbol"] == symbol]
+        return data
+
+    def write_trades(self, account: str, rows: np.ndarray) -> int:
+        """Merge trade rows (``TRADE_DTYPE``) by id, returns the number of new rows."""
+        path = self._trades_path(account)
+        with self._write_lock(path):
+            old = self._load(path, mmap=False)
+            if old is not None and len(old):
+                rows = rows[~np.isin(rows["id"], old["id"])]
+                if not len(rows):
+                    return 0
+                rows = np.concatenate([old, rows])
+            rows = rows[np.argsort(rows["timestamp"], kind="stable")]
+            _, first = np.unique(rows["id"], return_index=True)
+            rows = rows[np.sort(first)]
+            added = len(rows) - (0 if old is None else len(old))
+            self._replace(path, rows, {"rows": len(rows)})
+        return added
@@ -0,0 +1,279 @@
+# =========================================================
+# INSTRUMENTATION (SPANS, COUNTERS, EXPORTERS)
+# =========================================================
+
+import contextvars
+import functools
+import inspect
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional
+
+# public exchange methods get a "call" span when their name starts with one of these
+INSTRUMENTED_PREFIXES = ("fetch_", "create_", "cancel_", "edit_", "set_", "watch_")
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("pacifica_span", default=None)
+
+
+class Span:
+    """One finished unit of work: a public method call or an HTTP request.
+
+    ``attributes`` of request spans hold the phase durations in seconds
+    (``queued``, ``sign``, ``serialize``, ``network``, ``parse``) next to the
+    endpoint and HTTP status.
+    """
+
+    __slots__ = ("name", "kind", "start", "duration", "attributes", "parent", "error")
+
+    def __init__(self, name: str, kind: str, start: float, parent: Optional["Span"] = None):
+        self.name = name
+        self.kind = kind  # "call" or "request"
+        self.start = start  # time.time() seconds
+        self.duration = 0.0
+        self.attributes: Dict[str, Any] = {}
+        self.parent = parent
+        self.error: Optional[str] = None
+
+    def __repr__(self):
+        return f"Span({self.kind} {self.name} {self.duration * 1000:.2f}ms)"
+
+
+def map_in_context(pool, fn: Callable, items) -> List:
+    """``pool.map`` running every call in a copy of the caller's context, so
+    spans recorded in the worker threads keep the caller's span as parent."""
+    futures = [pool.submit(contextvars.copy_context().run, fn, item) for item in items]
+    return [future.result() for future in futures]
+
+
+class Instrumentation:
+    """Span and counter hub of one exchange instance.
+
+    Disabled until the first exporter is added; while disabled the wrapped
+    methods only pay one attribute check and nothing is recorded.
+    Counters are keyed ``(name, endpoint)`` with names ``requests``,
+    ``errors`` and ``retries``.
+    """
+
+    def __init__(self, exporters: Optional[List[Any]] = None):
+        self.enabled = False
+        self.exporters: List[Any] = []
+        self.counters: Counter = Counter()
+        self._lock = threading.Lock()
+        for exporter in exporters or []:
+            self.add_exporter(exporter)
+
+    def add_exporter(self, exporter) -> Any:
+        """``exporter`` is a callable taking a ``Span`` or has an ``export(span)`` method."""
+        if getattr(exporter, "instrumentation", False) is None:
+            exporter.instrumentation = self
+        self.exporters.append(exporter)
+        self.enabled = True
+        return exporter
+
+    def remove_exporter(self, exporter):
+        self.exporters.remove(exporter)
+        self.enabled = bool(self.exporters)
+
+    # -----------------------------------------------------
+    # recording
+    # -----------------------------------------------------
+    def _emit(self, span: Span):
+        for exporter in self.exporters:
+            export = getattr(exporter, "export", exporter)
+            export(span)
+
+    def count(self, name: str, endpoint: str, n: int = 1):
+        if self.enabled:
+            with self._lock:
+                self.counters[(name, endpoint)] += n
+
+    def record_request(self, timing, error: Optional[BaseException] = None):
+        """Transport observer: turns a ``RequestTiming`` into a request span."""
+        if not self.enabled:
+            return
+        self.count("requests", timing.endpoint)
+        if error is not None:
+            self.count("errors", timing.endpoint)
+
+        span = Span(f"{timing.method} {timing.endpoint}", "request", time.time() - timing.total, _current_span.get())
+        span.duration = timing.queued + timing.sign + timing.serialize + timing.total + timing.parse
+        span.attributes.update(
+            endpoint=timing.endpoint,
+            method=timing.method,
+            status=timing.status,
+            queued=timing.queued,
+            sign=timing.sign,
+            serialize=timing.serialize,
+            network=timing.total,
+            connect=timing.connect,
+            parse=timing.parse,
+        )
+        if error is not None:
+            span.error = type(error).__name__
+        self._emit(span)
+
+    def _start(self, name: str):
+        span = Span(name, "call", time.time(), _current_span.get())
+        return span, _current_span.set(span), time.perf_counter()
+
+    def _finish(self, span: Span, token, started: float, error: Optional[BaseException]):
+        span.duration = time.perf_counter() - started
+        _current_span.reset(token)
+        if error is not None:
+            span.error = type(error).__name__
+        self._emit(span)
+
+    # -----------------------------------------------------
+    # method wrapping
+    # -----------------------------------------------------
+    def wrap(self, name: str, method: Callable) -> Callable:
+        instrumentation = self
+
+        if inspect.iscoroutinefunction(method):
+            @functools.wraps(method)
+            async def traced(*args, **kwargs):
+                if not instrumentation.enabled:
+                    return await method(*args, **kwargs)
+                span, token, started = instrumentation._start(name)
+                try:
+                    result = await method(*args, **kwargs)
+                except BaseException as e:
+                    instrumentation._finish(span, token, started, e)
+                    raise
+                instrumentation._finish(span, token, started, None)
+                return result
+        else:
+            @functools.wraps(method)
+            def traced(*args, **kwargs):
+                if not instrumentation.enabled:
+                    return method(*args, **kwargs)
+                span, token, started = instrumentation._start(name)
+                try:
+                    result = method(*args, **kwargs)
+                except BaseException as e:
+                    instrumentation._finish(span, token, started, e)
+                    raise
+                instrumentation._finish(span, token, started, None)
+                return result
+        return traced
+
+    def attach(self, exchange, own_class: type):
+        """Wrap the public methods ``own_class`` defines (not the ccxt base ones) on ``exchange``."""
+        for klass in own_class.__mro__:
+            if klass.__module__.startswith("ccxt"):
+                break
+            for name in vars(klass):
+                if name.startswith(INSTRUMENTED_PREFIXES) and name not in vars(exchange):
+                    setattr(exchange, name, self.wrap(name, getattr(exchange, name)))
+
+
+# =========================================================
+# EXPORTERS
+# =========================================================
+class CallbackExporter:
+    """Calls ``callback(span)`` for every finished span (optionally only of one kind)."""
+
+    def __init__(self, callback: Callable[[Span], None], kind: Optional[str] = None):
+        self.callback = callback
+        self.kind = kind
+
+    def export(self, span: Span):
+        if self.kind is None or span.kind == self.kind:
+            self.callback(span)
+
+
+class PrometheusExporter:
+    """Aggregates spans into Prometheus text exposition format.
+
+    ``render()`` returns the current metrics, e.g. for an HTTP ``/metrics``
+    handler. Durations are exported as ``_sum`` / ``_count`` summaries; the
+    request / error / retry counters come from the instrumentation it was
+    added to.
+    """
+
+    PHASES = ("queued", "sign", "serialize", "network", "parse")
+
+    def __init__(self, instrumentation: Optional[Instrumentation] = None, prefix: str = "pacifica"):
+        self.instrumentation = instrumentation
+        self.prefix = prefix
+        self._calls: Dict[str, List[float]] = {}  # method -> [count, sum, errors]
+        self._phases: Dict[tuple, List[float]] = {}  # (endpoint, phase) -> [count, sum]
+        self._lock = threading.Lock()
+
+    def export(self, span: Span):
+        with self._lock:
+            if span.kind == "call":
+                entry = self._calls.setdefault(span.name, [0, 0.0, 0])
+                entry[0] += 1
+                entry[1] += span.duration
+                entry[2] += span.error is not None
+            else:
+                endpoint = span.attributes["endpoint"]
+                for phase in self.PHASES:
+                    entry = self._phases.setdefault((endpoint, phase), [0, 0.0])
+                    entry[0] += 1
+                    entry[1] += span.attributes[phase]
+
+    def render(self) -> str:
+        p = self.prefix
+        lines = []
+        with self._lock:
+            lines += [f"# TYPE {p}_call_duration_seconds summary"]
+            for method, (count, total, _) in sorted(self._calls.items()):
+                lines.append(f'{p}_call_duration_seconds_count{{method="{method}"}} {count}')
+                lines.append(f'{p}_call_duration_seconds_sum{{method="{method}"}} {total:.9f}')
+            lines += [f"# TYPE {p}_call_errors_total counter"]
+            for method, (_, _, errors) in sorted(self._calls.items()):
+                lines.append(f'{p}_call_errors_total{{method="{method}"}} {errors}')
+            lines += [f"# TYPE {p}_request_phase_seconds summary"]
+            for (endpoint, phase), (count, total) in sorted(self._phases.items()):
+                labels = f'endpoint="{endpoint}",phase="{phase}"'
+                lines.append(f"{p}_request_phase_seconds_count{{{labels}}} {count}")
+                lines.append(f"{p}_request_phase_seconds_sum{{{labels}}} {total:.9f}")
+        counters = []
+        if self.instrumentation is not None:
+            with self.instrumentation._lock:
+                counters = sorted(self.instrumentation.counters.items())
+        for name in ("requests", "errors", "retries"):
+            lines.append(f"# TYPE {p}_{name}_total counter")
+            for (counter, endpoint), value in counters:
+                if counter == name:
+                    lines.append(f'{p}_{name}_total{{endpoint="{endpoint}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+
+class OpenTelemetryExporter:
+    """Re-emits spans through an OpenTelemetry tracer (requires ``opentelemetry-api``)."""
+
+    def __init__(self, tracer=None):
+        from opentelemetry import trace
+
+        self._trace = trace
+        self.tracer = tracer or trace.get_tracer("pacifica_ccxt_adapter")
+        self._contexts: Dict[int, Any] = {}
+
+    def export(self, span: Span):
+        # children finish before their parent, so parent spans are opened on
+        # demand and closed when their own record arrives
+        parent_context = None
+        if span.parent is not None:
+            parent = self._contexts.get(id(span.parent))
+            if parent is None:
+                parent = self._open(span.parent, None)
+            parent_context = self._trace.set_span_in_context(parent)
+
+        otel_span = self._contexts.pop(id(span), None)
+        if otel_span is None:
+            otel_span = self.tracer.start_span(span.name, context=parent_context, start_time=int(span.start * 1e9))
+        for key, value in span.attributes.items():
+            otel_span.set_attribute(f"pacifica.{key}", value)
+        if span.error is not None:
+            otel_span.set_attribute("error.type", span.error)
+            otel_span.set_status(self._trace.Status(self._trace.StatusCode.ERROR))
+        otel_span.end(end_time=int((span.start + span.duration) * 1e9))
+
+    def _open(self, span: Span, context):
+        otel_span = self.tracer.start_span(span.name, context=context, start_time=int(span.start * 1e9))
+        self._contexts[id(span)] = otel_span
+        return otel_span
@@ -0,0 +1,169 @@
+# =========================================================
+# COMPACT L2 ORDER BOOK (NUMPY)
+# =========================================================
+# fetch_order_book(..., params={"compact": True}) returns an L2Book: one
+# contiguous float64 array each for bid / ask prices and amounts (best
+# level first) instead of a list of [price, amount] lists. Depth, VWAP and
+# mid / microprice are computed on the arrays, the ccxt dict is only built
+# by to_dict().
+
+from typing import Dict, Optional
+
+import numpy as np
+from ccxt.base.exchange import Exchange
+
+
+def _sorted_side(prices: np.ndarray, amounts: np.ndarray, descending: bool):
+    # the API sends best first; sort only if a level is out of place
+    steps = np.diff(prices)
+    if steps.size and ((steps > 0).any() if descending else (steps < 0).any()):
+        order = np.argsort(-prices if descending else prices, kind="stable")
+        prices, amounts = prices[order], amounts[order]
+    return prices, amounts
+
+
+class L2Book:
+    """Price levels of one book as parallel float64 arrays, best level first.
+
+    ``bid_prices`` are descending and ``ask_prices`` ascending. Side helpers
+    take ``"bids"`` / ``"asks"``; ``vwap`` takes the taker side (a buy walks the asks).
+    """
+
+    __slots__ = ("symbol", "timestamp", "nonce", "bid_prices", "bid_amounts", "ask_prices", "ask_amounts")
+
+    def __init__(self, symbol: str, bid_prices, bid_amounts, ask_prices, ask_amounts, timestamp: Optional[int] = None, nonce=None):
+        self.symbol = symbol
+        self.timestamp = timestamp
+        self.nonce = nonce
+        self.bid_prices, self.bid_amounts = _sorted_side(
+            np.asarray(bid_prices, dtype=np.float64), np.asarray(bid_amounts, dtype=np.float64), True
+        )
+        self.ask_prices, self.ask_amounts = _sorted_side(
+            np.asarray(ask_prices, dtype=np.float64), np.asarray(ask_amounts, dtype=np.float64), False
+        )
+
+    @classmethod
+    def from_levels(cls, data: Dict, symbol: str, limit: Optional[int] = None) -> "L2Book":
+        """From a raw ``/book`` (or book stream) payload, ``{"l": [bids, asks]}`` of ``{"p", "a"}`` levels."""
+        bids, asks = data["l"]
+        bids, asks = bids[:limit], asks[:limit]
+        # numpy parses the decimal strings directly, no float() per value
+        return cls(
+            symbol,
+            np.array([level["p"] for level in bids], dtype=np.float64),
+            np.array([level["a"] for level in bids], dtype=np.float64),
+            np.array([level["p"] for level in asks], dtype=np.float64),
+            np.array([level["a"] for level in asks], dtype=np.float64),
+            data.get("t"),
+            data.get("li"),
+        )
+
+    @classmethod
+    def from_dict(cls, book: Dict) -> "L2Book":
+        """From a ccxt order book dict (e.g. ``watch_order_book``)."""
+        bids = np.asarray(book["bids"], dtype=np.float64).reshape(-1, 2)
+        asks = np.asarray(book["asks"], dtype=np.float64).reshape(-1, 2)
+        return cls(book["symbol"], bids[:, 0], bids[:, 1], asks[:, 0], asks[:, 1], book.get("timestamp"), book.get("nonce"))
+
+    def _side(self, side: str):
+        if side == "bids":
+            return self.bid_prices, self.bid_amounts
+        if side == "asks":
+            return self.ask_prices, self.ask_amounts
+        raise ValueError(f"side must be 'bids' or 'asks', not {side!r}")
+
+    # -----------------------------------------------------
+    # top of book
+    # -----------------------------------------------------
+    @property
+    def best_bid(self) -> Optional[float]:
+        return float(self.bid_prices[0]) if self.bid_prices.size else None
+
+    @property
+    def best_ask(self) -> Optional[float]:
+        return float(self.ask_prices[0]) if self.ask_prices.size else None
+
+    @property
+    def spread(self) -> Optional[float]:
+        if not (self.bid_prices.size and self.ask_prices.size):
+            return None
+        return float(self.ask_prices[0] - self.bid_prices[0])
+
+    @property
+    def mid(self) -> Optional[float]:
+        if not (self.bid_prices.size and self.ask_prices.size):
+            return None
+        return float((self.bid_prices[0] + self.ask_prices[0]) / 2)
+
+    @property
+    def microprice(self) -> Optional[float]:
+        """Touch prices weighted by the opposite touch size (leans towards the thinner side)."""
+        if not (self.bid_prices.size and self.ask_prices.size):
+            return None
+        bid, ask = self.bid_prices[0], self.ask_prices[0]
+        bid_size, ask_size = self.bid_amounts[0], self.ask_amounts[0]
+        total = bid_size + ask_size
+        if total <= 0:
+            return self.mid
+        return float((bid * ask_size + ask * bid_size) / total)
+
+    # -----------------------------------------------------
+    # depth
+    # -----------------------------------------------------
+    def cumulative(self, side: str) -> np.ndarray:
+        """Amount available up to and including each level."""
+        return np.cumsum(self._side(side)[1])
+
+    def cumulative_notional(self, side: str) -> np.ndarray:
+        prices, amounts = self._side(side)
+        return np.cumsum(prices * amounts)
+
+    def depth(self, side: str, price) -> np.ndarray:
+        """Amount resting at ``price`` or better; ``price`` may be an array."""
+        prices, amounts = self._side(side)
+        cumulative = np.concatenate(([0.0], np.cumsum(amounts)))
+        price = np.asarray(price, dtype=np.float64)
+        if side == "bids":
+            count = np.searchsorted(-prices, -price, side="right")
+        else:
+            count = np.searchsorted(prices, price, side="right")
+        return cumulative[count]
+
+    def vwap(self, side: str, amount) -> np.ndarray:
+        """Average price of taking ``amount`` as a ``"buy"`` / ``"sell"``; ``amount`` may be an array.
+
+        nan where the book is too thin for the amount.
+        """
+        prices, amounts = self._side("asks" if side == "buy" else "bids")
+        amount = np.asarray(amount, dtype=np.float64)
+        if not prices.size:
+            return np.full(amount.shape, np.nan)
+        cumulative = np.concatenate(([0.0], np.cumsum(amounts)))
+        notional = np.concatenate(([0.0], np.cumsum(prices * amounts)))
+        # level the last unit of each amount comes from
+        index = np.clip(np.searchsorted(cumulative, amount, side="left") - 1, 0, prices.size - 1)
+        cost = notional[index] + (amount - cumulative[index]) * prices[index]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out = cost / amount
+        return np.where(amount > cumulative[-1], np.nan, out)
+
+    def __len__(self):
+        return max(self.bid_prices.size, self.ask_prices.size)
+
+    @property
+    def nbytes(self) -> int:
+        return self.bid_prices.nbytes + self.bid_amounts.nbytes + self.ask_prices.nbytes + self.ask_amounts.nbytes
+
+    def to_dict(self) -> Dict:
+        """The ccxt order book dict ``fetch_order_book`` returns without ``compact``."""
+        return {
+            "symbol": self.symbol,
+            "bids": np.column_stack((self.bid_prices, self.bid_amounts)).tolist(),
+            "asks": np.column_stack((self.ask_prices, self.ask_amounts)).tolist(),
+            "timestamp": self.timestamp,
+            "datetime": Exchange.iso8601(self.timestamp),
+            "nonce": self.nonce,
+        }
+
+    def __repr__(self):
+        return f"L2Book({self.symbol} {self.bid_prices.size}x{self.ask_prices.size} {self.best_bid}/{self.best_ask})"
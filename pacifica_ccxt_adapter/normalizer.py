@@ -0,0 +1,137 @@
+# =========================================================
+# PER-MARKET ORDER NORMALIZER (INTEGER TICK ARITHMETIC)
+# =========================================================
+# Compiled once per market from the raw tick_size / lot_size strings. A
+# step is kept as an integer mantissa and a decimal exponent (0.25 ->
+# 25e-2), prices and amounts are rounded to a whole number of steps and
+# formatted back from integers, so no Decimal objects are built per order
+# and steps that are not a power of ten (0.25, 5, 0.005) round correctly.
+
+import math
+from decimal import ROUND_CEILING, ROUND_FLOOR, Decimal
+from typing import Tuple
+
+from ccxt.base.errors import NotSupported
+
+# a step count within this relative distance of an integer is taken to be
+# that integer (a few dozen float ulps), so 1.15 / 0.01 =
+# 114.99999999999999 counts as 115 steps
+_SNAP = 1e-14
+
+
+def _numpy():
+    try:
+        import numpy as np
+    except ImportError:
+        raise NotSupported("vectorized order normalization requires numpy")
+    return np
+
+
+class Step:
+    """One increment (tick or lot) as ``mantissa * 10 ** -exponent``."""
+
+    __slots__ = ("mantissa", "exponent", "scale", "size", "_per_unit")
+
+    def __init__(self, size: str):
+        d = Decimal(str(size)).normalize()
+        if d <= 0:
+            raise ValueError(f"step size must be positive, got {size}")
+        sign, digits, exponent = d.as_tuple()
+        mantissa = int("".join(map(str, digits)))
+        if exponent > 0:
+            mantissa *= 10 ** exponent
+            exponent = 0
+        self.mantissa = mantissa
+        self.exponent = -exponent  # decimal places of the step
+        self.scale = 10 ** self.exponent
+        self.size = mantissa / self.scale
+        self._per_unit = self.scale / mantissa  # steps in 1.0
+
+    def steps(self, value: float, up: bool = False) -> int:
+        """Whole steps in ``value``, rounded down (or up)."""
+        if not isinstance(value, (float, int)):
+            # Decimal / str (and numpy ints): counted exactly in decimal arithmetic
+            n = Decimal(str(value)) * self.scale / self.mantissa
+            return int(n.to_integral_value(ROUND_CEILING if up else ROUND_FLOOR))
+        n = value * self._per_unit
+        r = round(n)
+        d = n - r
+        if abs(d) <= _SNAP * (abs(n) + 1.0):
+            return r
+        return math.ceil(n) if up else math.floor(n)
+
+    def value(self, steps: int) -> float:
+        return steps * self.mantissa / self.scale
+
+    def format(self, steps: int) -> str:
+        """Exact decimal string of ``steps`` steps with the step's decimal places."""
+        units = steps * self.mantissa
+        if not self.exponent:
+            return str(units)
+        sign = "-" if units < 0 else ""
+        whole, frac = divmod(abs(units), self.scale)
+        return f"{sign}{whole}.{frac:0{self.exponent}d}"
+
+    def steps_array(self, values, up: bool = False):
+        np = _numpy()
+        n = np.asarray(values, dtype=np.float64) * self._per_unit
+        r = np.rint(n)
+        on_step = np.abs(n - r) <= _SNAP * (np.abs(n) + 1.0)
+        return np.where(on_step, r, np.ceil(n) if up else np.floor(n)).astype(np.int64)
+
+    def values_array(self, steps):
+        np = _numpy()
+        return np.asarray(steps, dtype=np.int64) * self.mantissa / self.scale
+
+
+class MarketNormalizer:
+    """Rounds order prices to ``tick_size`` and amounts to ``lot_size``.
+
+    Buy prices round down and sell prices up (never more aggressive than
+    requested), amounts always round down.
+    """
+
+    __slots__ = ("symbol", "tick", "lot")
+
+    def __init__(self, symbol: str, tick_size: str, lot_size: str):
+        self.symbol = symbol
+        self.tick = Step(tick_size)
+        self.lot = Step(lot_size)
+
+    # -----------------------------------------------------
+    # scalar
+    # -----------------------------------------------------
+    def price_ticks(self, price: float, side: str) -> int:
+        return self.tick.steps(price, up=side == "sell")
+
+    def amount_lots(self, amount: float) -> int:
+        return self.lot.steps(amount)
+
+    def round_price(self, price: float, side: str) -> float:
+        return self.tick.value(self.price_ticks(price, side))
+
+    def round_amount(self, amount: float) -> float:
+        return self.lot.value(self.amount_lots(amount))
+
+    def normalize(self, price: float, amount: float, side: str) -> Tuple[str, str]:
+        """Price and amount as the exact decimal strings sent to the API."""
+        return (
+            self.tick.format(self.price_ticks(price, side)),
+            self.lot.format(self.amount_lots(amount)),
+        )
+
+    # -----------------------------------------------------
+    # vectorized (numpy)
+    # -----------------------------------------------------
+    def round_prices(self, prices, side: str):
+        return self.tick.values_array(self.tick.steps_array(prices, up=side == "sell"))
+
+    def round_amounts(self, amounts):
+        return self.lot.values_array(self.lot.steps_array(amounts))
+
+    def price_ladder(self, start: float, levels: int, side: str, step_ticks: int = 1):
+        """``levels`` prices from ``start`` moving away from the touch by ``step_ticks`` ticks each."""
+        np = _numpy()
+        first = self.price_ticks(start, side)
+        direction = 1 if side == "sell" else -1
+        return self.tick.values_array(first + direction * step_ticks * np.arange(levels, dtype=np.int64))
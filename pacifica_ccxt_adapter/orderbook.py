@@ -0,0 +1,52 @@
+# =========================================================
+# LOCAL L2 ORDER BOOK
+# =========================================================
+
+from typing import Dict, Iterable, List, Optional
+
+
+class LocalOrderBook:
+    """In-memory L2 book for one symbol with sorted price levels.
+
+    Pacifica's ``book`` channel pushes the full (aggregated) book in every
+    frame, so ``apply_snapshot`` replaces the whole book. ``sequence`` is the
+    frame's ``li``: the exchange class drops a frame older than the book and
+    resubscribes, and ``invalidate`` marks the book unusable (e.g. after a
+    reconnect) until the next snapshot arrives.
+    """
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.sequence: Optional[int] = None
+        self.timestamp: Optional[int] = None
+        self.valid = False
+        self._bid_sizes: Dict[float, float] = {}
+        self._ask_sizes: Dict[float, float] = {}
+        self._bid_prices: List[float] = []  # ascending, best bid is last
+        self._ask_prices: List[float] = []  # ascending, best ask is first
+
+    def apply_snapshot(self, bids: Iterable, asks: Iterable, sequence: Optional[int] = None, timestamp: Optional[int] = None):
+        self._bid_sizes = {float(p): float(a) for p, a in bids if float(a) > 0}
+        self._ask_sizes = {float(p): float(a) for p, a in asks if float(a) > 0}
+        self._bid_prices = sorted(self._bid_sizes)
+        self._ask_prices = sorted(self._ask_sizes)
+        self.sequence = sequence
+        self.timestamp = timestamp
+        self.valid = True
+
+    def invalidate(self):
+        self.valid = False
+
+    def bids(self, limit: Optional[int] = None) -> List[List[float]]:
+        prices = self._bid_prices if limit is None else self._bid_prices[-limit:]
+        return [[p, self._bid_sizes[p]] for p in reversed(prices)]
+
+    def asks(self, limit: Optional[int] = None) -> List[List[float]]:
+        prices = self._ask_prices if limit is None else self._ask_prices[:limit]
+        return [[p, self._ask_sizes[p]] for p in prices]
+
+    def best_bid(self) -> Optional[float]:
+        return self._bid_prices[-1] if self._bid_prices else None
+
+    def best_ask(self) -> Optional[float]:
+        return self._ask_prices[0] if self._ask_prices else None
@@ -0,0 +1,152 @@
+# =========================================================
+# LOCAL ORDER STORE
+# =========================================================
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+from pacifica_ccxt_adapter.const import EOrderStatus
+
+
+class OrderStore:
+    """In-process index of ccxt order dicts by exchange id and client order id.
+
+    Fed from create / cancel responses, open order snapshots and streaming
+    updates. Orders that were open but are missing from a newer snapshot are
+    marked stale (their final state is unknown) and ``get`` treats them as a
+    miss so the caller refetches them. Closed orders are kept up to
+    ``max_closed`` entries; ``closed_synced`` tells whether the order history
+    was read far enough back to answer a closed orders query.
+    """
+
+    def __init__(self, max_closed: int = 1000):
+        self.max_closed = max_closed
+        self.synced_at: Optional[float] = None
+        self._orders: Dict[str, Dict] = {}
+        self._closed_ids: "OrderedDict[str, None]" = OrderedDict()
+        self._client_ids: Dict[str, str] = {}
+        self._stale_ids = set()
+        # symbol (None: every symbol) -> oldest timestamp read from the order history, None: all of it
+        self._history_from: Dict[Optional[str], Optional[int]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _is_open(order: Dict) -> bool:
+        return order.get("status") == EOrderStatus.OPEN.value
+
+    def upsert(self, order: Dict) -> Dict:
+        if order.get("id") is None:
+            return order
+        key = str(order["id"])
+        with self._lock:
+            current = self._orders.get(key)
+            if current is not None:
+                # keep fields the update does not carry (e.g. clientOrderId from create_order)
+                order = {**current, **{k: v for k, v in order.items() if v is not None}}
+            self._orders[key] = order
+            self._stale_ids.discard(key)
+
+            client_order_id = order.get("clientOrderId")
+            if client_order_id:
+                self._client_ids[client_order_id] = key
+
+            if self._is_open(order):
+                self._closed_ids.pop(key, None)
+            else:
+                self._closed_ids[key] = None
+                self._closed_ids.move_to_end(key)
+                while len(self._closed_ids) > self.max_closed:
+                    evicted, _ = self._closed_ids.popitem(last=False)
+                    self._forget(evicted)
+        return order
+
+    def _forget(self, key: str):
+        order = self._orders.pop(key, None)
+        if order is not None and order.get("clientOrderId"):
+            self._client_ids.pop(order["clientOrderId"], None)
+        self._stale_ids.discard(key)
+
+    def get(self, id) -> Optional[Dict]:
+        """Order by exchange id or client order id, ``None`` when unknown or stale."""
+        key = str(id)
+        with self._lock:
+            key = self._client_ids.get(key, key)
+            if key in self._stale_ids:
+                return None
+            return self._orders.get(key)
+
+    def set_status(self, id, status: str) -> Optional[Dict]:
+        order = self.get(id)
+        if order is None:
+            return None
+        return self.upsert({**order, "status": status})
+
+    def sync_open(self, orders: Iterable[Dict], symbol: str = None):
+        """Apply a full open-orders snapshot (optionally for one symbol)."""
+        orders = list(orders)
+        seen = {str(o["id"]) for o in orders}
+        with self._lock:
+            for key, order in self._orders.items():
+                if key in seen or not self._is_open(order):
+                    continue
+                if symbol is None or order.get("symbol") == symbol:
+                    self._stale_ids.add(key)
+        for order in orders:
+            self.upsert(order)
+        if symbol is None:
+            self.synced_at = time.monotonic()
+
+    def sync_closed(self, orders: Iterable[Dict], symbol: str = None, oldest: Optional[int] = None):
+        """Apply orders read from the order history, complete from ``oldest`` (ms, None: the whole history) on."""
+        for order in orders:
+            if not self._is_open(order):
+                self.upsert(order)
+        with self._lock:
+            self._history_from[symbol] = oldest
+
+    def closed_synced(self, symbol: str = None, since: Optional[int] = None, complete: bool = False) -> bool:
+        """Whether the order history was read for ``symbol`` back to ``since``.
+
+        Without ``since`` any read counts (it covered the latest orders), unless
+        ``complete`` asks for the whole history.
+        """
+        with self._lock:
+            for key in {None, symbol}:
+                if key not in self._history_from:
+                    continue
+                oldest = self._history_from[key]
+                if oldest is None or (since is None and not complete) or (since is not None and since >= oldest):
+                    return True
+        return False
+
+    def is_fresh(self, max_age: float) -> bool:
+        return self.synced_at is not None and time.monotonic() - self.synced_at <= max_age
+
+    def open_orders(self, symbol: str = None) -> List[Dict]:
+        with self._lock:
+            return [
+                o for k, o in self._orders.items()
+                if self._is_open(o) and k not in self._stale_ids and (symbol is None or o.get("symbol") == symbol)
+            ]
+
+    def closed_orders(self, symbol: str = None) -> List[Dict]:
+        with self._lock:
+            orders = [self._orders[k] for k in self._closed_ids]
+        return [o for o in orders if symbol is None or o.get("symbol") == symbol]
+
+    def invalidate(self):
+        """Keep the orders but let the next ``is_fresh`` / ``closed_synced`` check fail (resync over REST)."""
+        with self._lock:
+            self.synced_at = None
+            self._history_from.clear()
+
+    def clear(self):
+        with self._lock:
+            self._orders.clear()
+            self._closed_ids.clear()
+            self._client_ids.clear()
+            self._stale_ids.clear()
+            self._history_from.clear()
+            self.synced_at = None
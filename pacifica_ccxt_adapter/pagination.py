@@ -0,0 +1,41 @@
+# =========================================================
+# RESUMABLE CURSORS FOR PAGINATED HISTORY
+# =========================================================
+# The iter_* methods walk cursor paginated endpoints (newest rows first)
+# one page at a time and record their position in a HistoryCursor. A row
+# only counts as consumed once the caller asks for the next one, so a job
+# that persisted the cursor and crashed resumes at the first row it had
+# not finished (at-least-once).
+
+import json
+from typing import Any, Dict, Optional
+
+
+class HistoryCursor:
+    """Position of a history traversal: server page cursor + rows consumed on that page."""
+
+    __slots__ = ("page", "offset", "done")
+
+    def __init__(self, page: Optional[str] = None, offset: int = 0, done: bool = False):
+        self.page = page  # cursor of the page being read, None for the first (newest) page
+        self.offset = offset
+        self.done = done
+
+    def advance(self, response: Dict[str, Any]):
+        """Move on to the page after ``response``, or mark the traversal done."""
+        next_page = response.get("next_cursor")
+        if response.get("has_more") and next_page:
+            self.page, self.offset = str(next_page), 0
+        else:
+            self.done = True
+
+    def dumps(self) -> str:
+        return json.dumps({"page": self.page, "offset": self.offset, "done": self.done})
+
+    @classmethod
+    def loads(cls, text: str) -> "HistoryCursor":
+        state = json.loads(text)
+        return cls(state.get("page"), int(state.get("offset", 0)), bool(state.get("done")))
+
+    def __repr__(self):
+        return f"HistoryCursor(page={self.page!r}, offset={self.offset}, done={self.done})"
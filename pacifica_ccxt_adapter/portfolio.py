@@ -0,0 +1,135 @@
+# =========================================================
+# COLUMNAR PORTFOLIO VIEW
+# =========================================================
+# All positions of one account as parallel float64 arrays built from one
+# positions / prices / settings / account snapshot, so portfolio aggregates
+# are a handful of vectorized numpy expressions instead of a Python loop
+# over position dicts.
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# leverage assumed for symbols without an account setting (as in fetch_positions)
+DEFAULT_LEVERAGE = 10.0
+
+
+class Portfolio:
+    """Columnar snapshot of an account's positions.
+
+    ``side`` is +1 for longs and -1 for shorts, ``size`` is always positive.
+    Cross positions share the account equity; isolated ones only their own
+    ``margin``. ``positions`` holds the matching ccxt position dicts in the
+    same row order.
+    """
+
+    def __init__(
+        self,
+        symbols: List[str],
+        size,
+        side,
+        entry,
+        mark,
+        leverage,
+        maintenance_rate,
+        isolated,
+        isolated_margin,
+        equity: float,
+        positions: Optional[List[Dict]] = None,
+    ):
+        self.symbols = np.asarray(symbols, dtype=object)
+        self.size = np.asarray(size, dtype=np.float64)
+        self.side = np.asarray(side, dtype=np.float64)
+        self.entry = np.asarray(entry, dtype=np.float64)
+        self.mark = np.asarray(mark, dtype=np.float64)
+        self.leverage = np.asarray(leverage, dtype=np.float64)
+        self.maintenance_rate = np.asarray(maintenance_rate, dtype=np.float64)
+        self.isolated = np.asarray(isolated, dtype=bool)
+        self.isolated_margin = np.asarray(isolated_margin, dtype=np.float64)
+        self.equity = float(equity)
+        self.positions = positions or []
+
+    def __len__(self):
+        return len(self.size)
+
+    # -----------------------------------------------------
+    # per position
+    # -----------------------------------------------------
+    @property
+    def notional(self):
+        return self.size * self.mark
+
+    @property
+    def signed_notional(self):
+        return self.side * self.notional
+
+    @property
+    def unrealized_pnl(self):
+        return self.side * self.size * (self.mark - self.entry)
+
+    @property
+    def initial_margin(self):
+        return self.notional / self.leverage
+
+    @property
+    def maintenance_margin(self):
+        return self.notional * self.maintenance_rate
+
+    @property
+    def liquidation_price(self):
+        """Mark price at which the position is liquidated, others unchanged.
+
+        Cross positions can lose the whole account surplus over maintenance
+        margin, isolated ones their own margin plus uPnL over maintenance.
+        """
+        cross_buffer = self.equity - self.maintenance_margin[~self.isolated].sum()
+        buffer = np.where(
+            self.isolated,
+            self.isolated_margin + self.unrealized_pnl - self.maintenance_margin,
+            cross_buffer,
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            price = self.mark - self.side * buffer / self.size
+        return np.maximum(price, 0.0)
+
+    @property
+    def liquidation_distance(self):
+        """Adverse move to liquidation as a fraction of the mark price (0 = at liquidation)."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            distance = self.side * (self.mark - self.liquidation_price) / self.mark
+        return np.maximum(distance, 0.0)
+
+    # -----------------------------------------------------
+    # aggregates
+    # -----------------------------------------------------
+    @property
+    def total_unrealized_pnl(self) -> float:
+        return float(self.unrealized_pnl.sum())
+
+    @property
+    def gross_exposure(self) -> float:
+        return float(self.notional.sum())
+
+    @property
+    def net_exposure(self) -> float:
+        return float(self.signed_notional.sum())
+
+    @property
+    def margin_used(self) -> float:
+        return float(self.initial_margin.sum())
+
+    @property
+    def margin_usage(self) -> float:
+        """Initial margin of all positions over account equity."""
+        return self.margin_used / self.equity if self.equity > 0 else float("inf")
+
+    @property
+    def leverage_used(self) -> float:
+        return self.gross_exposure / self.equity if self.equity > 0 else float("inf")
+
+    def exposure(self) -> Dict[str, float]:
+        """Signed notional per symbol."""
+        symbols, index = np.unique(self.symbols.astype(str), return_inverse=True)
+        totals = np.zeros(len(symbols))
+        np.add.at(totals, index, self.signed_notional)
+        return dict(zip(symbols.tolist(), totals.tolist()))
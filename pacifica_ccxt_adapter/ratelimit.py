@@ -0,0 +1,231 @@
+# =========================================================
+# CLIENT-SIDE RATE LIMITER (TOKEN BUCKET, PRIORITY LANES)
+# =========================================================
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from typing import Dict, Optional
+
+# lanes are served strictly in this order whenever requests are queued
+LANE_TRADING = 0
+LANE_ACCOUNT = 1
+LANE_INFO = 2
+LANE_NAMES = {LANE_TRADING: "trading", LANE_ACCOUNT: "account", LANE_INFO: "info"}
+
+# tokens a request costs, endpoints not listed cost 1
+DEFAULT_WEIGHTS = {
+    "/orders/batch": 2,
+    "/kline": 2,
+}
+
+# endpoints not listed go to the info lane
+DEFAULT_LANES = {
+    "/orders/create": LANE_TRADING,
+    "/cancel": LANE_TRADING,
+    "/orders/batch": LANE_TRADING,
+    "/account/leverage": LANE_TRADING,
+    "/orders": LANE_ACCOUNT,
+    "/orders/history": LANE_ACCOUNT,
+    "/orders/history_by_id": LANE_ACCOUNT,
+    "/positions": LANE_ACCOUNT,
+    "/account": LANE_ACCOUNT,
+    "/account/settings": LANE_ACCOUNT,
+    "/trades": LANE_ACCOUNT,
+}
+
+
+class _Waiter:
+    __slots__ = ("key", "cost", "wake")
+
+    def __init__(self, key, cost, wake):
+        self.key = key
+        self.cost = cost
+        self.wake = wake  # callable waking the waiter up when it became head of the queue
+
+    def __lt__(self, other):
+        return self.key < other.key
+
+
+class RateLimiter:
+    """Token bucket shared by every request of one budget.
+
+    ``capacity`` tokens refill at ``refill_rate`` tokens per second and each
+    request takes its endpoint weight. While requests are queued the head of
+    the queue (lowest lane, then arrival order) is served first, so an order
+    create or cancel overtakes queued informational reads. Sync and async
+    callers can share one limiter. Queue wait times are recorded per lane.
+    """
+
+    def __init__(
+        self,
+        capacity: float = 20,
+        refill_rate: float = 10,
+        weights: Optional[Dict[str, float]] = None,
+        lanes: Optional[Dict[str, int]] = None,
+        clock=time.monotonic,
+    ):
+        self.capacity = float(capacity)
+        self.refill_rate = float(refill_rate)
+        self.weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        self.lanes = {**DEFAULT_LANES, **(lanes or {})}
+        self.clock = clock
+
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._queue = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._stats = {lane: {"requests": 0, "queued": 0, "wait": 0.0, "max_wait": 0.0} for lane in LANE_NAMES}
+
+    def cost(self, endpoint: str) -> float:
+        return self.weights.get(endpoint, 1)
+
+    def lane(self, endpoint: str) -> int:
+        return self.lanes.get(endpoint, LANE_INFO)
+
+    # -----------------------------------------------------
+    # bucket state (call with the lock held)
+    # -----------------------------------------------------
+    def _refill(self):
+        now = self.clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.refill_rate)
+        self._updated = now
+
+    def _try_take(self, waiter: Optional[_Waiter], cost: float) -> Optional[float]:
+        """Take the tokens and return None, or the seconds the head has to wait."""
+        self._refill()
+        if self._queue and self._queue[0] is not waiter:
+            return float("inf")
+        if self._tokens >= cost:
+            self._tokens -= cost
+            if waiter is not None:
+                heapq.heappop(self._queue)
+                if self._queue:
+                    self._queue[0].wake()
+            return None
+        return (cost - self._tokens) / self.refill_rate
+
+    def _enqueue(self, lane: int, cost: float, wake) -> _Waiter:
+        waiter = _Waiter((lane, next(self._seq)), min(cost, self.capacity), wake)
+        previous_head = self._queue[0] if self._queue else None
+        heapq.heappush(self._queue, waiter)
+        if previous_head is not None and self._queue[0] is waiter:
+            previous_head.wake()  # let it notice it was overtaken
+        return waiter
+
+    def _record(self, lane: int, waited: float):
+        stats = self._stats[lane]
+        stats["requests"] += 1
+        if waited > 0:
+            stats["queued"] += 1
+            stats["wait"] += waited
+            stats["max_wait"] = max(stats["max_wait"], waited)
+
+    # -----------------------------------------------------
+    # acquire
+    # -----------------------------------------------------
+    def acquire(self, endpoint: str) -> float:
+        """Block until ``endpoint`` may be called, returns the seconds waited."""
+        lane, cost = self.lane(endpoint), self.cost(endpoint)
+        with self._lock:
+            if self._try_take(None, cost) is None:
+                self._record(lane, 0.0)
+                return 0.0
+            event = threading.Event()
+            waiter = self._enqueue(lane, cost, event.set)
+
+        start = time.perf_counter()
+        try:
+            while True:
+                with self._lock:
+                    delay = self._try_take(waiter, waiter.cost)
+                    if delay is None:
+                        waited = time.perf_counter() - start
+                        self._record(lane, waited)
+                        return waited
+                    event.clear()
+                event.wait(None if delay == float("inf") else delay)
+        except BaseException:
+            self._abandon(waiter)
+            raise
+
+    async def acquire_async(self, endpoint: str) -> float:
+        lane, cost = self.lane(endpoint), self.cost(endpoint)
+        with self._lock:
+            if self._try_take(None, cost) is None:
+                self._record(lane, 0.0)
+                return 0.0
+            loop = asyncio.get_running_loop()
+            event = asyncio.Event()
+            waiter = self._enqueue(lane, cost, lambda: loop.call_soon_threadsafe(event.set))
+
+        start = time.perf_counter()
+        try:
+            while True:
+                with self._lock:
+                    delay = self._try_take(waiter, waiter.cost)
+                    if delay is None:
+                        waited = time.perf_counter() - start
+                        self._record(lane, waited)
+                        return waited
+                    event.clear()
+                try:
+                    await asyncio.wait_for(event.wait(), None if delay == float("inf") else delay)
+                except asyncio.TimeoutError:
+                    pass
+        except BaseException:
+            self._abandon(waiter)
+            raise
+
+    def _abandon(self, waiter: _Waiter):
+        with self._lock:
+            if waiter in self._queue:
+                was_head = self._queue[0] is waiter
+                self._queue.remove(waiter)
+                heapq.heapify(self._queue)
+                if was_head and self._queue:
+                    self._queue[0].wake()
+
+    def settings(self) -> Dict:
+        """The budget this limiter enforces, as compared by ``shared_limiter``."""
+        return {"capacity": self.capacity, "refill_rate": self.refill_rate, "weights": self.weights, "lanes": self.lanes}
+
+    def penalize(self):
+        """Empty the bucket after the server answered 429."""
+        with self._lock:
+            self._refill()
+            self._tokens = 0.0
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                LANE_NAMES[lane]: {
+                    **s,
+                    "avg_wait": s["wait"] / s["queued"] if s["queued"] else 0.0,
+                }
+                for lane, s in self._stats.items()
+            }
+
+
+_shared: Dict[str, RateLimiter] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_limiter(key: str, **kwargs) -> RateLimiter:
+    """Process-wide limiter for ``key``, created with ``kwargs`` on first use.
+
+    Raises ``ValueError`` when a later caller asks for a different budget under
+    the same key, instead of silently handing it the first one.
+    """
+    wanted = RateLimiter(**kwargs)
+    with _shared_lock:
+        limiter = _shared.setdefault(key, wanted)
+    if limiter is not wanted and limiter.settings() != wanted.settings():
+        raise ValueError(
+            f"rate limiter {key!r} already exists with {limiter.settings()}, not {wanted.settings()}; "
+            "use the same rateLimits for every exchange sharing it or give it its own rateLimits key"
+        )
+    return limiter
@@ -0,0 +1,204 @@
+# =========================================================
+# LEAN TRADE / CANDLE RECORDS
+# =========================================================
+# Opt-in compact results for high-volume history pulls: slotted trade
+# records and numpy columns instead of one ccxt dict per row. The ccxt
+# dict, its datetime string and the raw payload are only built when a
+# record is converted with to_dict().
+
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+from ccxt.base.exchange import Exchange
+
+# side codes of lean trades (int8), -1 for a side not listed here
+TRADE_SIDES = ("open_long", "open_short", "close_long", "close_short", "buy", "sell")
+_SIDE_CODES = {side: code for code, side in enumerate(TRADE_SIDES)}
+
+
+def side_code(side: str) -> int:
+    return _SIDE_CODES.get(side, -1)
+
+
+def side_name(code: int) -> Optional[str]:
+    return TRADE_SIDES[code] if 0 <= code < len(TRADE_SIDES) else None
+
+
+class TradeRecord:
+    """One own trade as plain attributes (``side`` is a ``TRADE_SIDES`` code)."""
+
+    __slots__ = ("timestamp", "id", "symbol", "side", "price", "amount", "fee", "info")
+
+    def __init__(self, timestamp: int, id: str, symbol: str, side: int, price: float, amount: float, fee: float, info=None):
+        self.timestamp = timestamp
+        self.id = id
+        self.symbol = symbol
+        self.side = side
+        self.price = price
+        self.amount = amount
+        self.fee = fee  # nan when unknown
+        self.info = info
+
+    @classmethod
+    def from_row(cls, t: Dict, symbol: str) -> "TradeRecord":
+        """From one raw ``/trades`` row, kept as ``info``."""
+        fee = t.get("fee")
+        return cls(
+            int(t["timestamp"] * 1000), str(t["trade_id"]), symbol, _SIDE_CODES.get(t["side"], -1),
+            float(t["price"]), float(t["size"]), float(fee) if fee is not None else float("nan"), t,
+        )
+
+    @property
+    def cost(self) -> float:
+        return self.price * self.amount
+
+    @property
+    def datetime(self) -> str:
+        return Exchange.iso8601(self.timestamp)
+
+    def to_dict(self) -> Dict:
+        """The ccxt trade dict ``fetch_my_trades`` returns without ``lean``."""
+        return {
+            "id": self.id,
+            "symbol": self.symbol,
+            "side": self.info["side"] if self.info else side_name(self.side),
+            "price": self.price,
+            "amount": self.amount,
+            "timestamp": self.timestamp,
+            "datetime": self.datetime,
+            "cost": self.cost,
+            "fee": self.info.get("fee") if self.info else (None if self.fee != self.fee else self.fee),
+            "info": self.info,
+        }
+
+    def __repr__(self):
+        return f"TradeRecord({self.id} {self.symbol} {side_name(self.side)} {self.amount}@{self.price} {self.timestamp})"
+
+
+class TradeColumns:
+    """Own trades as parallel arrays, one row per trade.
+
+    ``timestamp`` int64 ms, ``price`` / ``amount`` / ``fee`` float64 (``fee``
+    nan when unknown), ``side`` int8 ``TRADE_SIDES`` codes, ``id`` and
+    ``symbol`` numpy unicode arrays.
+    """
+
+    __slots__ = ("timestamp", "id", "symbol", "side", "price", "amount", "fee")
+
+    def __init__(self, timestamp, id, symbol, side, price, amount, fee):
+        self.timestamp = np.asarray(timestamp, dtype=np.int64)
+        self.id = np.asarray(id, dtype=str)
+        self.symbol = np.asarray(symbol, dtype=str)
+        self.side = np.asarray(side, dtype=np.int8)
+        self.price = np.asarray(price, dtype=np.float64)
+        self.amount = np.asarray(amount, dtype=np.float64)
+        self.fee = np.asarray(fee, dtype=np.float64)
+
+    @classmethod
+    def from_rows(cls, rows: List[Dict], symbol_of: Callable[[str], str]) -> "TradeColumns":
+        """Parse raw ``/trades`` rows; ``symbol_of`` maps a market name to its ccxt symbol."""
+        n = len(rows)
+        symbols: Dict[str, str] = {}
+        timestamp = np.empty(n, dtype=np.int64)
+        side = np.empty(n, dtype=np.int8)
+        price = np.empty(n, dtype=np.float64)
+        amount = np.empty(n, dtype=np.float64)
+        fee = np.empty(n, dtype=np.float64)
+        ids, names = [], []
+        for i, t in enumerate(rows):
+            name = t["symbol"]
+            symbol = symbols.get(name)
+            if symbol is None:
+                symbol = symbols[name] = symbol_of(name)
+            timestamp[i] = int(t["timestamp"] * 1000)
+            side[i] = _SIDE_CODES.get(t["side"], -1)
+            price[i] = float(t["price"])
+            amount[i] = float(t["size"])
+            fee[i] = float(t["fee"]) if t.get("fee") is not None else np.nan
+            ids.append(str(t["trade_id"]))
+            names.append(symbol)
+        return cls(timestamp, ids, names, side, price, amount, fee)
+
+    @classmethod
+    def from_history(cls, rows: np.ndarray) -> "TradeColumns":
+        """Columns of ``history.TRADE_DTYPE`` rows as stored on disk."""
+        sides, inverse = np.unique(rows["side"], return_inverse=True)
+        codes = np.array([side_code(s) for s in sides.tolist()], dtype=np.int8)
+        return cls(rows["timestamp"], rows["id"], rows["symbol"], codes[inverse], rows["price"], rows["amount"], rows["fee"])
+
+    def to_history(self) -> np.ndarray:
+        from pacifica_ccxt_adapter.history import TRADE_DTYPE
+
+        out = np.empty(len(self), dtype=TRADE_DTYPE)
+        out["timestamp"] = self.timestamp
+        out["id"] = self.id
+        out["symbol"] = self.symbol
+        out["price"] = self.price
+        out["amount"] = self.amount
+        out["fee"] = self.fee
+        out["side"] = [side_name(code) or "" for code in self.side.tolist()]
+        return out
+
+    def __len__(self):
+        return len(self.timestamp)
+
+    def __getitem__(self, i) -> TradeRecord:
+        return TradeRecord(
+            int(self.timestamp[i]), str(self.id[i]), str(self.symbol[i]), int(self.side[i]),
+            float(self.price[i]), float(self.amount[i]), float(self.fee[i]),
+        )
+
+    @property
+    def cost(self):
+        return self.price * self.amount
+
+    def take(self, index) -> "TradeColumns":
+        """Subset by boolean mask, slice or index array."""
+        return TradeColumns(*(getattr(self, name)[index] for name in self.__slots__))
+
+    def records(self) -> List[TradeRecord]:
+        return [
+            TradeRecord(*row)
+            for row in zip(
+                self.timestamp.tolist(), self.id.tolist(), self.symbol.tolist(), self.side.tolist(),
+                self.price.tolist(), self.amount.tolist(), self.fee.tolist(),
+            )
+        ]
+
+    def to_dicts(self) -> List[Dict]:
+        return [record.to_dict() for record in self.records()]
+
+
+class Candles:
+    """OHLCV as columns: ``timestamp`` int64 ms and float64 ``open`` .. ``volume``."""
+
+    __slots__ = ("timestamp", "open", "high", "low", "close", "volume")
+
+    def __init__(self, timestamp, open, high, low, close, volume):
+        self.timestamp = np.asarray(timestamp, dtype=np.int64)
+        self.open = np.asarray(open, dtype=np.float64)
+        self.high = np.asarray(high, dtype=np.float64)
+        self.low = np.asarray(low, dtype=np.float64)
+        self.close = np.asarray(close, dtype=np.float64)
+        self.volume = np.asarray(volume, dtype=np.float64)
+
+    @classmethod
+    def from_array(cls, array: np.ndarray) -> "Candles":
+        """From an ``(n, 6)`` float64 array; price columns are views, not copies."""
+        array = np.asarray(array, dtype=np.float64).reshape(-1, 6)
+        return cls(array[:, 0].astype(np.int64), array[:, 1], array[:, 2], array[:, 3], array[:, 4], array[:, 5])
+
+    def __len__(self):
+        return len(self.timestamp)
+
+    def __getitem__(self, i) -> List:
+        return [int(self.timestamp[i]), float(self.open[i]), float(self.high[i]),
+                float(self.low[i]), float(self.close[i]), float(self.volume[i])]
+
+    def to_list(self) -> List[List]:
+        """The ccxt ``[timestamp, open, high, low, close, volume]`` rows."""
+        return [
+            list(row)
+            for row in zip(self.timestamp.tolist(), self.open.tolist(), self.high.tolist(),
+                           self.low.tolist(), self.close.tolist(), self.volume.tolist())
+        ]
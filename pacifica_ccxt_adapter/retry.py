@@ -0,0 +1,51 @@
+# =========================================================
+# RETRY POLICY (ERROR CLASSIFICATION + JITTERED BACKOFF)
+# =========================================================
+
+import random
+from typing import Optional
+
+from ccxt.base.errors import NetworkError, RateLimitExceeded
+
+# the server did not act on the request, resending is always safe
+RETRY = "retry"
+# the request may or may not have been executed (timeout, dropped
+# connection, 5xx), resending is only safe for idempotent calls
+AMBIGUOUS = "ambiguous"
+# rejected on its merits (4xx, success=false), resending cannot help
+FATAL = "fatal"
+
+
+def classify(error: BaseException) -> str:
+    if isinstance(error, RateLimitExceeded):
+        return RETRY
+    if isinstance(error, NetworkError):
+        return AMBIGUOUS
+    return FATAL
+
+
+class RetryPolicy:
+    """Decides whether and when a failed request is sent again.
+
+    Delays grow exponentially from ``base_delay`` up to ``max_delay`` with
+    full jitter, so concurrent callers hitting the same outage do not retry
+    in lockstep.
+    """
+
+    def __init__(self, max_retries: int = 3, base_delay: float = 0.25, max_delay: float = 5.0, rng=random.random):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.rng = rng
+
+    def backoff(self, attempt: int) -> float:
+        return self.rng() * min(self.max_delay, self.base_delay * 2 ** attempt)
+
+    def delay_for(self, error: BaseException, attempt: int, idempotent: bool = True) -> Optional[float]:
+        """Seconds to wait before attempt ``attempt + 1``, ``None`` to give up and raise."""
+        if attempt >= self.max_retries:
+            return None
+        kind = classify(error)
+        if kind == FATAL or (kind == AMBIGUOUS and not idempotent):
+            return None
+        return self.backoff(attempt)
@@ -0,0 +1,80 @@
+# =========================================================
+# SIGNING HELPERS
+# =========================================================
+import json
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, Tuple
+
+if TYPE_CHECKING:
+    from solders.keypair import Keypair
+
+# one shared encoder: json.dumps() with non-default arguments builds a new
+# JSONEncoder on every call. sort_keys orders nested dicts exactly like
+# sort_json_keys() did, without building intermediate sorted copies.
+_ENCODER = json.JSONEncoder(sort_keys=True, separators=(",", ":"))
+canonical_json = _ENCODER.encode
+
+
+def sort_json_keys(value):
+    if isinstance(value, dict):
+        return {k: sort_json_keys(value[k]) for k in sorted(value.keys())}
+    if isinstance(value, list):
+        return [sort_json_keys(v) for v in value]
+    return value
+
+
+def prepare_message(header: dict, payload: dict) -> str:
+    return canonical_json({**header, "data": payload})
+
+
+@lru_cache(maxsize=64)
+def _header_template(type_name: str, expiry_window: int) -> Tuple[str, str]:
+    # sorted header keys are data < expiry_window < timestamp < type, so only
+    # the payload and the timestamp change between two messages of one type
+    return (
+        ',"expiry_window":' + canonical_json(expiry_window) + ',"timestamp":',
+        ',"type":' + canonical_json(type_name) + "}",
+    )
+
+
+def prepare_signed_message(
+    type_name: str,
+    timestamp: int,
+    expiry_window: int,
+    payload: dict,
+    dumps: Callable[[dict], str] = canonical_json,
+) -> str:
+    """Same bytes as ``prepare_message({"type", "timestamp", "expiry_window"}, payload)``."""
+    middle, tail = _header_template(type_name, expiry_window)
+    return '{"data":' + dumps(payload) + middle + str(int(timestamp)) + tail
+
+
+def json_backend(name: str = "json") -> Callable[[dict], str]:
+    """Canonical serializer for signing payloads, ``"json"`` (default) or ``"orjson"``.
+
+    orjson output matches the stdlib for the string / int payloads the adapter
+    signs; anything it would encode differently (non-ASCII text, integers over
+    64 bit) falls back to the stdlib encoder. Floats are not guaranteed to match.
+    """
+    if name == "json":
+        return canonical_json
+    if name != "orjson":
+        raise ValueError(f"unknown signing json backend '{name}'")
+
+    import orjson
+
+    def dumps(value) -> str:
+        try:
+            out = orjson.dumps(value, option=orjson.OPT_SORT_KEYS)
+        except TypeError:
+            return canonical_json(value)
+        if not out.isascii():
+            return canonical_json(value)
+        return out.decode("ascii")
+
+    return dumps
+
+
+def sign_message(message: str, keypair: "Keypair") -> str:
+    # str() of a solders Signature is its base58 encoding, computed natively
+    return str(keypair.sign_message(message.encode("utf-8")))
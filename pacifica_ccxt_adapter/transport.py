@@ -0,0 +1,225 @@
+# =========================================================
+# HTTP TRANSPORT (POOLED KEEP-ALIVE SESSION)
+# =========================================================
+
+import json
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Union
+
+import ccxt
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from pacifica_ccxt_adapter.ratelimit import RateLimiter
+
+
+@dataclass
+class RequestTiming:
+    method: str
+    endpoint: str
+    status: int
+    connect: float  # TCP + TLS handshake, 0.0 when a pooled connection was reused
+    wait: float  # request sent -> response headers received
+    transfer: float  # response body download
+    total: float
+    queued: float = 0.0  # time spent waiting for the rate limiter, not part of total
+    sign: float = 0.0  # building a callable (signed) body
+    serialize: float = 0.0  # json encoding of the body
+    parse: float = 0.0  # json decoding of the response
+
+    @property
+    def reused(self) -> bool:
+        return self.connect == 0.0
+
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def _status_error(status: int, content: bytes) -> Optional[Exception]:
+    if status == 200:
+        return None
+    text = content.decode("utf-8", "replace")
+    if status == 429:
+        return ccxt.RateLimitExceeded(text)
+    if status >= 500:
+        return ccxt.ExchangeNotAvailable(text)
+    return ccxt.ExchangeError(text)
+
+
+# ---------------------------------------------------------
+# urllib3 connections that remember how long connect() took
+# ---------------------------------------------------------
+class _TimedHTTPConnection(HTTPConnection):
+    connect_time = 0.0
+
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        self.connect_time = time.perf_counter() - start
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    connect_time = 0.0
+
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        self.connect_time = time.perf_counter() - start
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _TimedAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+
+class HttpTransport:
+    """Single code path for every Pacifica REST call.
+
+    Wraps one keep-alive ``requests.Session`` whose connection pool is sized by
+    ``pool_size``, applies per-endpoint timeouts and records connect / wait /
+    transfer timings for each request in ``timings``. With a ``limiter`` every
+    request first waits for its rate limit tokens.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        session: Optional[requests.Session] = None,
+        pool_size: int = 10,
+        timeout: float = 10,
+        timeouts: Optional[Dict[str, float]] = None,
+        max_timings: int = 1000,
+        limiter: Optional[RateLimiter] = None,
+    ):
+        self.base_url = base_url
+        self.limiter = limiter
+        # called with (RequestTiming, error or None) after every request
+        self.observer: Optional[Callable[[RequestTiming, Optional[BaseException]], None]] = None
+        self.timeout = timeout
+        self.timeouts = dict(timeouts or {})
+        self.timings = deque(maxlen=max_timings)
+        self.last_timing: Optional[RequestTiming] = None
+
+        self.pool_size = pool_size
+        self.use_session(session)
+
+    def use_session(self, session: Optional[requests.Session] = None) -> requests.Session:
+        """Send through ``session`` (a new pooled one by default) from now on."""
+        self.session = session if session is not None else requests.Session()
+        # a session shared by several transports keeps the pool mounted first
+        if not isinstance(self.session.get_adapter(self.base_url), _TimedAdapter):
+            adapter = _TimedAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+            self.session.mount("https://", adapter)
+            self.session.mount("http://", adapter)
+        self.session.headers.update({"Connection": "keep-alive"})
+        return self.session
+
+    def timeout_for(self, endpoint: str, default: Optional[float] = None) -> float:
+        if endpoint in self.timeouts:
+            return self.timeouts[endpoint]
+        return default if default is not None else self.timeout
+
+    def request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        body: Union[Dict[str, Any], Callable[[], Dict[str, Any]], None] = None,
+        timeout: Optional[float] = None,
+    ):
+        # a callable body is built only once the rate limiter let the request
+        # through, so signatures are not aged by the queue wait
+        queued = self.limiter.acquire(endpoint) if self.limiter is not None else 0.0
+        sign = serialize = 0.0
+        if callable(body):
+            t = time.perf_counter()
+            body = body()
+            sign = time.perf_counter() - t
+        data = None
+        if body is not None:
+            t = time.perf_counter()
+            data = json.dumps(body, allow_nan=False).encode("utf-8")
+            serialize = time.perf_counter() - t
+
+        start = time.perf_counter()
+        try:
+            r = self.session.request(
+                method,
+                self.base_url + endpoint,
+                params=params,
+                data=data,
+                headers=_JSON_HEADERS if data is not None else None,
+                timeout=self.timeout_for(endpoint, timeout),
+                stream=True,
+            )
+            headers_at = time.perf_counter()
+            conn = r.raw.connection
+            connect = getattr(conn, "connect_time", 0.0)
+            if conn is not None:
+                # only the first request on a fresh connection pays the handshake
+                conn.connect_time = 0.0
+            content = r.content
+        except requests.exceptions.RequestException as e:
+            error_type = ccxt.RequestTimeout if isinstance(e, requests.exceptions.Timeout) else ccxt.NetworkError
+            error = error_type(f"{method} {endpoint}: {e}")
+            elapsed = time.perf_counter() - start
+            self._observe(RequestTiming(method, endpoint, 0, 0.0, elapsed, 0.0, elapsed, queued, sign, serialize), error)
+            raise error
+        end = time.perf_counter()
+
+        timing = RequestTiming(
+            method=method,
+            endpoint=endpoint,
+            status=r.status_code,
+            connect=connect,
+            wait=headers_at - start - connect,
+            transfer=end - headers_at,
+            total=end - start,
+            queued=queued,
+            sign=sign,
+            serialize=serialize,
+        )
+        self.timings.append(timing)
+        self.last_timing = timing
+
+        error = _status_error(r.status_code, content)
+        if error is not None:
+            if isinstance(error, ccxt.RateLimitExceeded) and self.limiter is not None:
+                self.limiter.penalize()
+            self._observe(timing, error)
+            raise error
+
+        t = time.perf_counter()
+        result = json.loads(content)
+        timing.parse = time.perf_counter() - t
+        self._observe(timing, None)
+        return result
+
+    def _observe(self, timing: RequestTiming, error: Optional[BaseException]):
+        if self.observer is not None:
+            self.observer(timing, error)
+
+    def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None):
+        return self.request("GET", endpoint, params=params, timeout=timeout)
+
+    def post(self, endpoint: str, body: Union[Dict[str, Any], Callable[[], Dict[str, Any]]], timeout: Optional[float] = None):
+        return self.request("POST", endpoint, body=body, timeout=timeout)
+
+    def close(self):
+        self.session.close()
@@ -15,6 +15,10 @@ REQUIRES = [
     "python-dotenv",
     "ccxt",
 ]
+# historyDir, lean / compact results, fetch_portfolio and the array rounding helpers
+EXTRAS = {
+    "numpy": ["numpy"],
+}
 
 setup(
     name=NAME,
@@ -25,7 +29,8 @@ setup(
     url="",
     keywords=["pacifica", "ccxt", ""],
     install_requires=REQUIRES,
-    packages=find_packages(exclude=["test", "tests"]),
+    extras_require=EXTRAS,
+    packages=find_packages(exclude=["test", "tests", "benchmarks"]),
     include_package_data=True,
     long_description_content_type="text/markdown",
     long_description="""\
@@ -0,0 +1,96 @@
+# =========================================================
+# SHARED FIXTURES (MOCK SERVER + EXCHANGES)
+# =========================================================
+# Tests that need the REST API run against benchmarks/mock_server.py on a
+# random local port, one fresh server per test. FlakyTransport sits in front
+# of an exchange's transport to inject failures.
+
+import pytest
+from ccxt.base.errors import RequestTimeout
+from solders.keypair import Keypair
+
+from benchmarks.mock_server import MockConfig, MockPacifica
+
+SYMBOL = "BTC/USDC:USDC"
+
+
+def exchange_config(server: MockPacifica, **config) -> dict:
+    return {
+        "l1walletAddress": "test",
+        "privateKey": str(Keypair()),
+        "baseUrl": server.url,
+        "wsUrl": server.ws_url,
+        "enableRateLimit": False,
+        **config,
+        "options": {"retryDelay": 0, "executionFillDelay": 0, **config.get("options", {})},
+    }
+
+
+@pytest.fixture
+def server():
+    server = MockPacifica(MockConfig(markets=4, open_orders=4, history_rows=40)).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def exchange(server):
+    from pacifica_ccxt_adapter.Pacifica import Pacifica
+
+    exchange = Pacifica(exchange_config(server))
+    exchange.load_markets()
+    yield exchange
+    exchange.close()
+
+
+class FlakyTransport:
+    """POSTs follow ``script``, then go through once it runs out.
+
+    An entry is "lost" (never sent), "landed" (sent, then timed out), an
+    exception to raise instead of sending, or a function applied to the response.
+    """
+
+    def __init__(self, transport, script):
+        self.transport = transport
+        self.script = list(script)
+        self.posts = []
+        self.errors = []
+
+    def __getattr__(self, name):
+        return getattr(self.transport, name)
+
+    def _outcome(self, endpoint):
+        self.posts.append(endpoint)
+        return self.script.pop(0) if self.script else "ok"
+
+    def _fail(self, outcome, endpoint):
+        error = outcome if isinstance(outcome, Exception) else RequestTimeout(f"POST {endpoint}: timed out")
+        self.errors.append(error)
+        raise error
+
+    def post(self, endpoint, body, timeout=None):
+        outcome = self._outcome(endpoint)
+        if outcome == "ok":
+            return self.transport.post(endpoint, body, timeout)
+        if callable(outcome):
+            return outcome(self.transport.post(endpoint, body, timeout))
+        if outcome == "landed":
+            self.transport.post(endpoint, body, timeout)
+        self._fail(outcome, endpoint)
+
+
+class AsyncFlakyTransport(FlakyTransport):
+    async def post(self, endpoint, body, timeout=None):
+        outcome = self._outcome(endpoint)
+        if outcome == "ok":
+            return await self.transport.post(endpoint, body, timeout)
+        if callable(outcome):
+            return outcome(await self.transport.post(endpoint, body, timeout))
+        if outcome == "landed":
+            await self.transport.post(endpoint, body, timeout)
+        self._fail(outcome, endpoint)
+
+
+def flaky(exchange, *script):
+    exchange.transport = FlakyTransport(exchange.transport, script)
+    return exchange.transport
@@ -0,0 +1,77 @@
+# =========================================================
+# ACCOUNT HISTORY (RESUMABLE CURSORS, FUNDING HISTORY RANGES)
+# =========================================================
+
+import asyncio
+
+from benchmarks.mock_server import BASE_TIME, MINUTE
+from pacifica_ccxt_adapter.async_support import Pacifica as AsyncPacifica
+from pacifica_ccxt_adapter.pagination import HistoryCursor
+
+from tests.conftest import SYMBOL, exchange_config
+
+
+def ids(items):
+    return [item["id"] for item in items]
+
+
+def test_cursor_resumes_with_the_row_being_handled(server, exchange):
+    exchange.options["historyPageSize"] = 7
+    everything = ids(exchange.iter_my_trades())
+    assert len(everything) == 40
+
+    cursor = HistoryCursor()
+    handled = []
+    for trade in exchange.iter_my_trades(params={"cursor": cursor}):
+        handled.append(trade["id"])
+        if len(handled) == 10:
+            break  # the job dies while handling the 10th row
+    assert (cursor.page, cursor.offset, cursor.done) == ("7", 2, False)
+
+    saved = cursor.dumps()
+    resumed = HistoryCursor.loads(saved)
+    rest = ids(exchange.iter_my_trades(params={"cursor": resumed}))
+    assert handled[:9] + rest == everything
+    assert resumed.done
+
+    # a dumps() string resumes at the same row, the parsed cursor stays internal
+    assert ids(exchange.iter_my_trades(params={"cursor": saved})) == rest
+
+
+def test_funding_history_since_until_limit(server, exchange):
+    since = BASE_TIME - 20 * MINUTE
+    # the first payments after since, not the latest ones
+    first = exchange.fetch_funding_history(since=since, limit=3)
+    assert [p["timestamp"] for p in first] == [since, since + MINUTE, since + 2 * MINUTE]
+
+    latest = exchange.fetch_funding_history(limit=3)
+    assert [p["timestamp"] for p in latest] == [BASE_TIME - 2 * MINUTE, BASE_TIME - MINUTE, BASE_TIME]
+
+    ranged = exchange.fetch_funding_history(since=since, params={"until": since + 10 * MINUTE})
+    assert [p["timestamp"] for p in ranged] == list(range(since, since + 10 * MINUTE, MINUTE))
+
+    # BTC is every fourth row
+    btc = exchange.fetch_funding_history(SYMBOL, since, 2)
+    assert [p["timestamp"] for p in btc] == [since, since + 4 * MINUTE]
+    assert all(p["symbol"] == SYMBOL for p in btc)
+
+
+def test_async_funding_history_and_cursor(server):
+    async def main():
+        exchange = AsyncPacifica(exchange_config(server, options={"historyPageSize": 7}))
+        try:
+            await exchange.load_markets()
+            since = BASE_TIME - 20 * MINUTE
+            first = await exchange.fetch_funding_history(since=since, limit=3)
+            assert [p["timestamp"] for p in first] == [since, since + MINUTE, since + 2 * MINUTE]
+
+            cursor = HistoryCursor()
+            async for order in exchange.iter_orders_history(params={"cursor": cursor}):
+                if order["id"] == 900009:
+                    break
+            rest = [o["id"] async for o in exchange.iter_orders_history(params={"cursor": cursor.dumps()})]
+            assert rest[0] == 900009 and len(rest) == 31
+        finally:
+            await exchange.close()
+
+    asyncio.run(main())
@@ -0,0 +1,103 @@
+# =========================================================
+# BATCH ORDERS (CHUNKING, CANCEL-REPLACE, PARTIAL FAILURES)
+# =========================================================
+
+import asyncio
+
+from ccxt.base.errors import ExchangeError
+
+from pacifica_ccxt_adapter.async_support import Pacifica as AsyncPacifica
+
+from tests.conftest import SYMBOL, AsyncFlakyTransport, exchange_config, flaky
+
+
+def order(price=99.0):
+    return {"symbol": SYMBOL, "type": "limit", "side": "buy", "amount": 0.5, "price": price}
+
+
+def live(server, orders):
+    return [int(o["id"]) for o in orders if o["id"] is not None and int(o["id"]) in server._orders]
+
+
+def drop_last(response):
+    response["data"]["results"].pop()
+    return response
+
+
+def test_create_orders_are_chunked(server, exchange):
+    exchange.options["maxBatchSize"] = 4
+    orders = exchange.create_orders([order(90.0 + i) for i in range(10)])
+
+    assert server.counts["POST /orders/batch"] == 3
+    assert [o["status"] for o in orders] == ["open"] * 10
+    # results line up with the orders they were sent for
+    assert [server._orders[int(o["id"])]["price"] for o in orders] == [f"{90.0 + i:.2f}" for i in range(10)]
+
+
+def test_failed_chunk_keeps_the_others(server, exchange):
+    exchange.options["maxBatchSize"] = 2
+    flaky(exchange, "ok", ExchangeError("rejected"), "landed")
+    orders = exchange.create_orders([order() for _ in range(6)])
+
+    assert [o["status"] for o in orders] == ["open", "open", "rejected", "rejected", "unknown", "unknown"]
+    assert orders[2]["error"] == "rejected"
+    # the timed out chunk landed but is not resent
+    assert server.counts["POST /orders/batch"] == 2
+    assert len(live(server, orders)) == 2
+
+
+def test_short_results_fail_the_chunk(server, exchange):
+    exchange.options["maxBatchSize"] = 3
+    flaky(exchange, drop_last)
+    orders = exchange.create_orders([order() for _ in range(5)])
+
+    assert [o["status"] for o in orders] == ["unknown"] * 3 + ["open"] * 2
+    assert "2 results for 3 actions" in orders[0]["error"]
+
+
+def test_cancel_orders(server, exchange):
+    ids = [str(i) for i in server._orders][:2] + ["999"]
+    canceled = exchange.cancel_orders(ids, SYMBOL)
+    assert [c["status"] for c in canceled] == ["canceled", "canceled", "rejected"]
+    assert not set(int(i) for i in ids) & set(server._orders)
+
+
+def test_edit_orders_keep_pairs_in_one_request(server, exchange):
+    exchange.options["maxBatchSize"] = 3
+    edits = [{**order(95.0 + i), "id": str(i)} for i in server._orders]
+    replaced = exchange.edit_orders(edits)
+
+    # 3 is rounded down to one pair per request
+    assert server.counts["POST /orders/batch"] == 4
+    assert [r["replaced"]["status"] for r in replaced] == ["canceled"] * 4
+    assert sorted(server._orders) == sorted(int(r["id"]) for r in replaced)
+
+
+def test_replacement_of_an_order_that_was_not_canceled_is_undone(server, exchange):
+    existing = next(iter(server._orders))
+    replaced = exchange.edit_orders([{**order(95.0), "id": "999"}, {**order(96.0), "id": str(existing)}])
+
+    assert replaced[0]["replaced"]["status"] == "rejected"
+    # the replacement went in with the batch and was canceled right after
+    assert replaced[0]["status"] == "canceled" and int(replaced[0]["id"]) not in server._orders
+    assert replaced[1]["status"] == "open" and int(replaced[1]["id"]) in server._orders
+    assert server.counts["POST /orders/batch"] == 2
+
+
+def test_async_chunks_and_short_results(server):
+    async def main():
+        exchange = AsyncPacifica(exchange_config(server, options={"maxBatchSize": 2}))
+        try:
+            await exchange.load_markets()
+            exchange.transport = AsyncFlakyTransport(exchange.transport, [drop_last])
+            orders = await exchange.create_orders([order() for _ in range(6)])
+            # chunks go out concurrently, the stub fails whichever is sent first
+            assert sorted(o["status"] for o in orders) == ["open"] * 4 + ["unknown"] * 2
+            assert server.counts["POST /orders/batch"] == 3
+
+            replaced = await exchange.edit_orders([{**order(95.0), "id": "999"}])
+            assert replaced[0]["status"] == "canceled" and int(replaced[0]["id"]) not in server._orders
+        finally:
+            await exchange.close()
+
+    asyncio.run(main())
@@ -0,0 +1,131 @@
+# =========================================================
+# RESPONSE CACHE (TTLS, INVALIDATION, COALESCING)
+# =========================================================
+
+import asyncio
+import threading
+
+from pacifica_ccxt_adapter.async_support import Pacifica as AsyncPacifica
+from pacifica_ccxt_adapter.cache import TTLCache
+from pacifica_ccxt_adapter.Pacifica import Pacifica
+
+from tests.conftest import SYMBOL, exchange_config
+
+ACCOUNT_TTLS = {"/positions": 60, "/account": 60, "/account/settings": 60}
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_their_endpoint_ttl():
+    clock = Clock()
+    cache = TTLCache(ttls={"/kline": 2}, clock=clock)
+    cache.set("/info/prices", None, "prices")
+    cache.set("/kline", {"symbol": "BTC"}, "btc")
+    cache.set("/trades", None, "never cached")
+
+    clock.now = 0.4
+    assert cache.get("/info/prices") == (True, "prices")
+    assert cache.get("/kline", {"symbol": "BTC"}) == (True, "btc")
+    assert cache.get("/kline", {"symbol": "ETH"}) == (False, None)
+    assert cache.get("/trades") == (False, None)
+
+    clock.now = 0.5
+    assert cache.get("/info/prices") == (False, None)
+    assert cache.get("/kline", {"symbol": "BTC"}) == (True, "btc")
+    clock.now = 2.0
+    assert cache.get("/kline", {"symbol": "BTC"}) == (False, None)
+
+    # an explicit ttl wins over the endpoint's
+    cache.set("fundingRates", None, "rates", ttl=1)
+    clock.now = 3.0
+    assert cache.get("fundingRates") == (False, None)
+    assert cache.stats()["hits"] == {"/info/prices": 1, "/kline": 2}
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(max_size=2)
+    cache.set("/info", {"n": 1}, 1)
+    cache.set("/info", {"n": 2}, 2)
+    assert cache.get("/info", {"n": 1}) == (True, 1)
+    cache.set("/info", {"n": 3}, 3)
+    assert cache.get("/info", {"n": 2}) == (False, None)
+    assert cache.get("/info", {"n": 1}) == (True, 1)
+
+
+def test_public_reads_are_served_from_the_cache(server, exchange):
+    exchange.fetch_tickers()
+    exchange.fetch_ticker(SYMBOL)
+    exchange.fetch_positions()
+    assert server.counts["GET /info/prices"] == 1
+    assert server.counts["GET /account/settings"] == 1
+
+    exchange.cache.clear()
+    exchange.fetch_ticker(SYMBOL)
+    assert server.counts["GET /info/prices"] == 2
+
+
+def test_mutating_calls_invalidate_what_they_change(server):
+    exchange = Pacifica(exchange_config(server, cacheTTL=ACCOUNT_TTLS))
+    exchange.load_markets()
+    try:
+        def reads():
+            exchange.fetch_positions()
+            exchange.fetch_balance()
+            return server.counts["GET /positions"], server.counts["GET /account"], server.counts["GET /account/settings"]
+
+        assert reads() == (1, 1, 1)
+        assert reads() == (1, 1, 1)
+
+        order = exchange.create_order(SYMBOL, "limit", "buy", 0.5, 99.0)
+        assert reads() == (2, 2, 1)
+        exchange.cancel_order(order["id"], SYMBOL)
+        assert reads() == (3, 3, 1)
+        exchange.create_orders([{"symbol": SYMBOL, "type": "limit", "side": "buy", "amount": 0.5, "price": 99.0}])
+        assert reads() == (4, 4, 1)
+        exchange.set_leverage(5, SYMBOL)
+        assert reads() == (5, 5, 2)
+    finally:
+        exchange.close()
+
+
+def test_concurrent_misses_send_one_request(server, exchange):
+    server.config.latency = 0.05
+    threads = 8
+    barrier = threading.Barrier(threads)
+    results = []
+
+    def read():
+        barrier.wait()
+        results.append(exchange.fetch_ticker(SYMBOL))
+
+    workers = [threading.Thread(target=read) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert len(results) == threads and server.counts["GET /info/prices"] == 1
+    assert exchange.cache.stats()["misses"]["/info/prices"] >= threads
+
+
+def test_async_concurrent_misses_await_one_request(server):
+    server.config.latency = 0.05
+
+    async def main():
+        exchange = AsyncPacifica(exchange_config(server))
+        try:
+            await exchange.load_markets()
+            tickers = await asyncio.gather(*[exchange.fetch_ticker(SYMBOL) for _ in range(8)])
+            assert all(t == tickers[0] for t in tickers)
+            assert server.counts["GET /info/prices"] == 1
+            assert exchange.cache._pending == {}
+        finally:
+            await exchange.close()
+
+    asyncio.run(main())
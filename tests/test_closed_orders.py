@@ -0,0 +1,75 @@
+# =========================================================
+# CLOSED ORDERS (ORDER STORE + /orders/history FALLBACK)
+# =========================================================
+
+import asyncio
+
+from benchmarks.mock_server import BASE_TIME, MINUTE
+from pacifica_ccxt_adapter.async_support import Pacifica as AsyncPacifica
+
+from tests.conftest import SYMBOL, exchange_config
+
+
+def test_cold_store_reads_the_order_history(server, exchange):
+    orders = exchange.fetch_closed_orders(SYMBOL)
+    # BTC is every fourth of the 40 synthetic rows
+    assert len(orders) == 10
+    assert all(o["symbol"] == SYMBOL and o["status"] == "closed" for o in orders)
+    assert [o["timestamp"] for o in orders] == sorted(o["timestamp"] for o in orders)
+    assert server.counts["GET /orders/history"] == 1
+
+    # answered from the store now
+    assert exchange.fetch_closed_orders(SYMBOL) == orders
+    assert server.counts["GET /orders/history"] == 1
+
+
+def test_since_and_limit(server, exchange):
+    since = BASE_TIME - 20 * MINUTE
+    orders = exchange.fetch_closed_orders(SYMBOL, since, 2)
+    # the first two after since, not the latest two
+    assert [o["timestamp"] for o in orders] == [since, since + 4 * MINUTE]
+
+    latest = exchange.fetch_closed_orders(SYMBOL, limit=3)
+    assert [o["timestamp"] for o in latest] == [BASE_TIME - 8 * MINUTE, BASE_TIME - 4 * MINUTE, BASE_TIME]
+
+    requests = server.counts["GET /orders/history"]
+    # older than anything read so far: back to the API
+    exchange.fetch_closed_orders(SYMBOL, BASE_TIME - 36 * MINUTE)
+    assert server.counts["GET /orders/history"] == requests + 1
+
+
+def test_refresh_picks_up_orders_closed_elsewhere(server, exchange):
+    exchange.fetch_closed_orders(SYMBOL)
+    # a seeded BTC order, closed by another client
+    server.close_order(1000)
+
+    assert 1000 not in [o["id"] for o in exchange.fetch_closed_orders(SYMBOL)]
+    refreshed = exchange.fetch_closed_orders(SYMBOL, params={"refresh": True})
+    assert [o["status"] for o in refreshed if o["id"] == 1000] == ["closed"]
+
+
+def test_order_moves_from_open_to_closed(server, exchange):
+    created = exchange.create_order(SYMBOL, "limit", "buy", 0.5, 99.0)
+    assert created["id"] in [str(o["id"]) for o in exchange.fetch_open_orders(SYMBOL)]
+
+    server.close_order(int(created["id"]))
+    closed = exchange.fetch_closed_orders(SYMBOL, params={"refresh": True})
+    order = next(o for o in closed if str(o["id"]) == created["id"])
+    assert order["status"] == "closed" and order["filled"] == 0.5
+    assert order["clientOrderId"] == created["clientOrderId"]
+    assert exchange.fetch_order(created["clientOrderId"])["status"] == "closed"
+    assert created["id"] not in [str(o["id"]) for o in exchange.fetch_open_orders(SYMBOL, params={"refresh": True})]
+
+
+def test_async_cold_store(server):
+    async def main():
+        exchange = AsyncPacifica(exchange_config(server))
+        try:
+            await exchange.load_markets()
+            orders = await exchange.fetch_closed_orders(SYMBOL, limit=4)
+            assert len(orders) == 4 and orders[-1]["timestamp"] == BASE_TIME
+            assert server.counts["GET /orders/history"] == 1
+        finally:
+            await exchange.close()
+
+    asyncio.run(main())
@@ -0,0 +1,104 @@
+# =========================================================
+# ON-DISK HISTORY STORE
+# =========================================================
+
+import threading
+
+import numpy as np
+
+from benchmarks.mock_server import BASE_TIME, MINUTE
+from pacifica_ccxt_adapter.history import TRADE_DTYPE, HistoryStore
+from pacifica_ccxt_adapter.Pacifica import Pacifica
+
+from tests.conftest import SYMBOL, exchange_config
+
+START = BASE_TIME - BASE_TIME % MINUTE  # a candle boundary
+
+
+def candles(start, end):
+    return [[t, 1.0, 2.0, 0.5, 1.5, 10.0] for t in range(start, end, MINUTE)]
+
+
+def trades(ids, timestamp=BASE_TIME):
+    return np.array([(timestamp + int(i), str(i), "BTC", 100.0, 1.0, 0.01, "buy") for i in ids], dtype=TRADE_DTYPE)
+
+
+def write(store, start, end, now=START + 1000 * MINUTE):
+    store.write_ohlcv("BTC", "1m", candles(start, end), start, end, MINUTE, now)
+
+
+def test_missing_ranges_and_coverage_merge(tmp_path):
+    store = HistoryStore(str(tmp_path))
+    since, until = START, START + 100 * MINUTE
+    assert store.missing_ohlcv("BTC", "1m", since, until) == [(since, until)]
+
+    write(store, since + 20 * MINUTE, since + 40 * MINUTE)
+    write(store, since + 60 * MINUTE, since + 70 * MINUTE)
+    assert store.missing_ohlcv("BTC", "1m", since, until) == [
+        (since, since + 20 * MINUTE), (since + 40 * MINUTE, since + 60 * MINUTE), (since + 70 * MINUTE, until),
+    ]
+
+    # overlapping and touching writes merge into one range
+    write(store, since + 30 * MINUTE, since + 60 * MINUTE)
+    assert store.ohlcv_coverage("BTC", "1m") == [(since + 20 * MINUTE, since + 70 * MINUTE)]
+    stored = store.read_ohlcv("BTC", "1m", since, until)
+    assert stored[:, 0].tolist() == list(range(since + 20 * MINUTE, since + 70 * MINUTE, MINUTE))
+
+
+def test_in_progress_candle_is_not_stored(tmp_path):
+    store = HistoryStore(str(tmp_path))
+    since, now = START, START + 10 * MINUTE + 30000
+    write(store, since, since + 20 * MINUTE, now)
+
+    # coverage and rows stop at the start of the candle open at now
+    assert store.ohlcv_coverage("BTC", "1m") == [(since, since + 10 * MINUTE)]
+    assert store.read_ohlcv("BTC", "1m", since, since + 20 * MINUTE)[-1, 0] == since + 9 * MINUTE
+    assert store.missing_ohlcv("BTC", "1m", since, now) == [(since + 10 * MINUTE, now)]
+
+
+def test_trades_are_deduplicated_by_id(tmp_path):
+    store = HistoryStore(str(tmp_path))
+    assert store.write_trades("acct", trades([3, 1, 2])) == 3
+    assert store.write_trades("acct", trades([2, 3, 4])) == 1
+    assert store.write_trades("acct", trades([4])) == 0
+
+    stored = store.read_trades("acct")
+    assert stored["id"].tolist() == ["1", "2", "3", "4"]
+    assert store.read_trades("acct", since=BASE_TIME + 3)["id"].tolist() == ["3", "4"]
+
+
+def test_concurrent_writers_keep_each_others_rows(tmp_path):
+    store = HistoryStore(str(tmp_path))
+    writers = 8
+    barrier = threading.Barrier(writers)
+
+    def writer(n):
+        other = HistoryStore(str(tmp_path))  # one store per writer, like separate processes
+        barrier.wait()
+        for batch in range(5):
+            other.write_trades("acct", trades(range(n * 100 + batch * 10, n * 100 + batch * 10 + 10)))
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(store.read_trades("acct")) == writers * 50
+
+
+def test_fetch_ohlcv_downloads_only_the_missing_tail(server, tmp_path):
+    exchange = Pacifica(exchange_config(server, historyDir=str(tmp_path)))
+    exchange.load_markets()
+    since = START - 500 * MINUTE
+    try:
+        first = exchange.fetch_ohlcv(SYMBOL, "1m", since, 200)
+        assert len(first) == 200 and server.counts["GET /kline"] == 1
+
+        again = exchange.fetch_ohlcv(SYMBOL, "1m", since, 200)
+        assert again == first and server.counts["GET /kline"] == 1
+
+        longer = exchange.fetch_ohlcv(SYMBOL, "1m", since, 300)
+        assert len(longer) == 300 and server.counts["GET /kline"] == 2
+        assert exchange.history.ohlcv_coverage("BTC", "1m") == [(since, since + 300 * MINUTE)]
+    finally:
+        exchange.close()
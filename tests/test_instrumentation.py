@@ -0,0 +1,44 @@
+# =========================================================
+# INSTRUMENTATION (SPAN NESTING)
+# =========================================================
+
+import asyncio
+
+from benchmarks.mock_server import BASE_TIME, MINUTE
+from pacifica_ccxt_adapter.async_support import Pacifica as AsyncPacifica
+from pacifica_ccxt_adapter.instrumentation import CallbackExporter
+
+from tests.conftest import SYMBOL, exchange_config
+
+OPTIONS = {"ohlcvChunkSize": 50, "ohlcvConcurrency": 4}
+
+
+def test_paginated_ohlcv_requests_nest_under_the_call(server, exchange):
+    exchange.options.update(OPTIONS)
+    spans = []
+    exchange.instrumentation.add_exporter(CallbackExporter(spans.append))
+    exchange.fetch_ohlcv(SYMBOL, "1m", BASE_TIME - 200 * MINUTE, 200)
+
+    call = next(s for s in spans if s.kind == "call")
+    klines = [s for s in spans if s.kind == "request" and s.attributes["endpoint"] == "/kline"]
+    assert call.name == "fetch_ohlcv" and call.parent is None
+    assert len(klines) == 4
+    assert all(s.parent is call for s in klines)
+
+
+def test_async_paginated_ohlcv_requests_nest_under_the_call(server):
+    async def main():
+        exchange = AsyncPacifica(exchange_config(server, options=OPTIONS))
+        spans = []
+        try:
+            await exchange.load_markets()
+            exchange.instrumentation.add_exporter(CallbackExporter(spans.append))
+            await exchange.fetch_ohlcv(SYMBOL, "1m", BASE_TIME - 200 * MINUTE, 200)
+        finally:
+            await exchange.close()
+        return spans
+
+    spans = asyncio.run(main())
+    call = next(s for s in spans if s.kind == "call" and s.name == "fetch_ohlcv")
+    klines = [s for s in spans if s.kind == "request" and s.attributes["endpoint"] == "/kline"]
+    assert len(klines) == 4 and all(s.parent is call for s in klines)
@@ -0,0 +1,26 @@
+# =========================================================
+# ORDER NORMALIZER INPUT TYPES
+# =========================================================
+
+from decimal import Decimal
+
+import pytest
+
+from pacifica_ccxt_adapter.normalizer import MarketNormalizer
+
+NORMALIZER = MarketNormalizer("BTC/USDC:USDC", "0.25", "0.001")
+
+
+@pytest.mark.parametrize("price, amount", [
+    (100.1, 1.0005),
+    (Decimal("100.1"), Decimal("1.0005")),
+    ("100.1", "1.0005"),
+])
+def test_normalize_accepts_float_decimal_and_str(price, amount):
+    assert NORMALIZER.normalize(price, amount, "buy") == ("100.00", "1.000")
+    assert NORMALIZER.normalize(price, amount, "sell") == ("100.25", "1.000")
+
+
+def test_decimal_on_step_is_not_moved():
+    assert NORMALIZER.normalize(Decimal("100.25"), Decimal("2"), "buy") == ("100.25", "2.000")
+    assert NORMALIZER.normalize(1.15, 0.3, "sell") == ("1.25", "0.300")
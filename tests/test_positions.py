@@ -0,0 +1,29 @@
+# =========================================================
+# POSITIONS
+# =========================================================
+
+from tests.conftest import SYMBOL
+
+
+def test_positions_are_valued_at_the_mid_price(server, exchange):
+    positions = exchange.fetch_positions()
+    btc = next(p for p in positions if p["symbol"] == SYMBOL)
+    assert btc["markPrice"] == 100.01
+    assert btc["unrealisedPnl"] == (98.0 - 100.01) * 1.5
+
+
+def test_position_missing_from_the_prices_snapshot(server, exchange):
+    prices = server._prices
+    server._prices = lambda: [p for p in prices() if p["symbol"] != "BTC"]
+    positions = exchange.fetch_positions()
+
+    assert len(positions) == server.config.positions
+    btc = next(p for p in positions if p["symbol"] == SYMBOL)
+    assert btc["markPrice"] is None and btc["unrealisedPnl"] is None
+    assert btc["entryPrice"] == 98.0 and btc["amount"] == 1.5
+    assert all(p["markPrice"] == 100.01 for p in positions if p["symbol"] != SYMBOL)
+
+    # the portfolio values it at its entry price instead
+    portfolio = exchange.fetch_portfolio()
+    index = list(portfolio.symbols).index(SYMBOL)
+    assert portfolio.mark[index] == 98.0 and portfolio.unrealized_pnl[index] == 0
@@ -0,0 +1,143 @@
+# =========================================================
+# RATE LIMITER (LANES, 429 PENALTY, SHARED BUDGETS)
+# =========================================================
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from pacifica_ccxt_adapter.ratelimit import RateLimiter, shared_limiter
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def wait_for_queue(limiter, size):
+    deadline = time.monotonic() + 5
+    while len(limiter._queue) < size:
+        assert time.monotonic() < deadline, "requests did not queue"
+        time.sleep(0.001)
+
+
+def test_bucket_refills_at_its_rate():
+    clock = Clock()
+    limiter = RateLimiter(capacity=4, refill_rate=2, clock=clock)
+    assert [limiter.acquire("/info") for _ in range(4)] == [0.0] * 4
+    # empty: the next token is half a second away
+    assert limiter._try_take(None, 1) == 0.5
+    clock.now = 0.5
+    assert limiter.acquire("/info") == 0.0
+    assert limiter._try_take(None, limiter.cost("/kline")) == 1.0
+
+
+def test_penalty_empties_the_bucket():
+    clock = Clock()
+    limiter = RateLimiter(capacity=10, refill_rate=5, clock=clock)
+    limiter.penalize()
+    assert limiter._try_take(None, 1) == 0.2
+    clock.now = 2.0
+    assert limiter.acquire("/info") == 0.0
+
+    # with the real clock, the request after a 429 waits for the refill
+    limiter = RateLimiter(capacity=10, refill_rate=50)
+    limiter.penalize()
+    assert limiter.acquire("/info") >= 0.015
+
+
+def test_queued_requests_are_served_by_lane():
+    limiter = RateLimiter(capacity=1, refill_rate=20)
+    limiter.acquire("/info")
+    served = []
+
+    def call(endpoint):
+        limiter.acquire(endpoint)
+        served.append(endpoint)
+
+    threads = []
+    # queued in reverse priority order
+    for size, endpoint in enumerate(["/info", "/positions", "/orders/create"], 1):
+        threads.append(threading.Thread(target=call, args=(endpoint,)))
+        threads[-1].start()
+        wait_for_queue(limiter, size)
+    for thread in threads:
+        thread.join()
+
+    assert served == ["/orders/create", "/positions", "/info"]
+    stats = limiter.stats()
+    assert stats["trading"]["queued"] == 1 and stats["info"]["requests"] == 2
+
+
+def test_trading_request_preempts_a_waiting_head():
+    # an info request heads the queue waiting for a 2 token kline
+    limiter = RateLimiter(capacity=2, refill_rate=4)
+    limiter.acquire("/kline")
+    served = []
+
+    def call(endpoint):
+        limiter.acquire(endpoint)
+        served.append((endpoint, time.monotonic()))
+
+    info = threading.Thread(target=call, args=("/kline",))
+    info.start()
+    wait_for_queue(limiter, 1)
+    started = time.monotonic()
+    call("/cancel")
+    info.join()
+
+    assert [endpoint for endpoint, _ in served] == ["/cancel", "/kline"]
+    # served on the first token instead of after the kline's two
+    assert served[0][1] - started < 0.4
+
+
+def test_async_acquire_waits_and_respects_lanes():
+    limiter = RateLimiter(capacity=1, refill_rate=20)
+    served = []
+
+    async def call(endpoint):
+        waited = await limiter.acquire_async(endpoint)
+        served.append(endpoint)
+        return waited
+
+    async def main():
+        assert await call("/info") == 0.0
+        info = asyncio.create_task(call("/info"))
+        while not limiter._queue:
+            await asyncio.sleep(0)
+        waited = await call("/orders/batch")
+        await info
+        return waited
+
+    waited = asyncio.run(main())
+    assert served == ["/info", "/orders/batch", "/info"]
+    assert waited > 0
+
+
+def test_async_acquire_abandoned_on_cancel():
+    limiter = RateLimiter(capacity=1, refill_rate=1)
+
+    async def main():
+        await limiter.acquire_async("/info")
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(limiter.acquire_async("/info"), 0.05)
+
+    asyncio.run(main())
+    assert limiter._queue == []
+
+
+def test_shared_limiter_rejects_a_different_budget():
+    key = "test_shared_limiter_rejects_a_different_budget"
+    limiter = shared_limiter(key, capacity=20, refill_rate=10)
+    # defaults and int / float spellings are the same budget
+    assert shared_limiter(key, capacity=20.0, refill_rate=10, weights={"/kline": 2}) is limiter
+
+    with pytest.raises(ValueError, match="already exists"):
+        shared_limiter(key, capacity=5, refill_rate=10)
+    with pytest.raises(ValueError):
+        shared_limiter(key, capacity=20, refill_rate=10, lanes={"/info": 0})
@@ -0,0 +1,119 @@
+# =========================================================
+# RETRIES (CLASSIFICATION, CONFIRM BEFORE RESEND, CANCEL)
+# =========================================================
+# FlakyTransport (conftest) decides per POST whether the request is lost
+# before the server, lands and then times out, fails with a given error or
+# goes through.
+
+import asyncio
+
+import pytest
+from ccxt.base.errors import ExchangeError, ExchangeNotAvailable, InvalidOrder, OrderNotFound, RateLimitExceeded, RequestTimeout
+
+from pacifica_ccxt_adapter.async_support import Pacifica as AsyncPacifica
+from pacifica_ccxt_adapter.retry import AMBIGUOUS, FATAL, RETRY, RetryPolicy, classify
+
+from tests.conftest import SYMBOL, AsyncFlakyTransport, exchange_config, flaky
+
+
+def test_classification():
+    assert classify(ExchangeNotAvailable("502")) == AMBIGUOUS
+    assert classify(RequestTimeout("timeout")) == AMBIGUOUS
+    assert classify(ExchangeError("bad price")) == FATAL
+    assert classify(RateLimitExceeded("429")) == RETRY
+
+    policy = RetryPolicy(max_retries=2, base_delay=1, max_delay=3, rng=lambda: 1.0)
+    assert [policy.delay_for(RequestTimeout(""), n) for n in range(3)] == [1, 2, None]
+    assert policy.delay_for(RequestTimeout(""), 0, idempotent=False) is None
+    assert policy.delay_for(RateLimitExceeded(""), 0, idempotent=False) == 1
+    assert policy.delay_for(ExchangeError(""), 0) is None
+    # full jitter: anywhere between 0 and the capped exponential delay
+    assert RetryPolicy(base_delay=1, max_delay=3, rng=lambda: 0.5).backoff(5) == 1.5
+
+
+def test_create_that_landed_is_not_sent_again(server, exchange):
+    transport = flaky(exchange, "landed")
+    order = exchange.create_order(SYMBOL, "limit", "buy", 0.5, 99.0)
+
+    assert transport.posts == ["/orders/create"]
+    assert server.counts["POST /orders/create"] == 1
+    # the order the first attempt created, found by its client order id
+    landed = next(o for o in server._orders.values() if o["client_order_id"] == order["clientOrderId"])
+    assert order["id"] == str(landed["order_id"])
+
+
+def test_create_that_did_not_land_is_resent_once(server, exchange):
+    transport = flaky(exchange, "lost")
+    order = exchange.create_order(SYMBOL, "limit", "buy", 0.5, 99.0)
+
+    assert transport.posts == ["/orders/create", "/orders/create"]
+    assert server.counts["POST /orders/create"] == 1
+    assert [o["order_id"] for o in server._orders.values() if o["client_order_id"] == order["clientOrderId"]] == [int(order["id"])]
+    # confirmed absent (open orders + order history) before the resend
+    assert server.counts["GET /orders"] == 1 and server.counts["GET /orders/history"] == 1
+
+
+def test_fatal_error_is_not_retried(server, exchange):
+    transport = flaky(exchange, ExchangeError("price out of range"))
+    with pytest.raises(InvalidOrder, match="price out of range"):
+        exchange.create_order(SYMBOL, "limit", "buy", 0.5, 99.0)
+    assert transport.posts == ["/orders/create"]
+    assert server.counts["GET /orders"] == 0
+
+
+def test_retries_exhausted_raise_the_original_error(server, exchange):
+    exchange.retry_policy.max_retries = 2
+    transport = flaky(exchange, "lost", "lost", "lost")
+    with pytest.raises(RequestTimeout) as raised:
+        exchange.create_order(SYMBOL, "limit", "buy", 0.5, 99.0)
+
+    assert raised.value is transport.errors[-1]
+    assert len(transport.posts) == 3
+    # confirmed before each of the two resends, not after the last failure
+    assert server.counts["GET /orders/history"] == 2
+    assert server.counts["POST /orders/create"] == 0
+
+
+def test_failed_confirm_raises_the_original_error(server, exchange):
+    def get(endpoint, params=None, timeout=None):
+        raise ExchangeError("orders down")
+
+    transport = flaky(exchange, "lost")
+    transport.get = get
+    with pytest.raises(RequestTimeout):
+        exchange.create_order(SYMBOL, "limit", "buy", 0.5, 99.0)
+    assert transport.posts == ["/orders/create"]
+
+
+def test_resent_cancel_not_found_is_canceled(server, exchange):
+    order_id = next(iter(server._orders))
+    flaky(exchange, "landed", ExchangeError("Order not found"))
+    result = exchange.cancel_order(str(order_id), SYMBOL)
+
+    assert result["status"] == "canceled"
+    assert order_id not in server._orders
+
+
+def test_cancel_not_found_on_first_attempt(server, exchange):
+    flaky(exchange, ExchangeError("Order not found"))
+    with pytest.raises(OrderNotFound):
+        exchange.cancel_order("123", SYMBOL)
+
+
+def test_async_create_that_landed_and_resent_cancel(server):
+    async def main():
+        exchange = AsyncPacifica(exchange_config(server))
+        try:
+            await exchange.load_markets()
+            exchange.transport = transport = AsyncFlakyTransport(exchange.transport, ["landed"])
+            order = await exchange.create_order(SYMBOL, "limit", "buy", 0.5, 99.0)
+            assert transport.posts == ["/orders/create"]
+            assert server.counts["POST /orders/create"] == 1
+
+            transport.script = ["landed", ExchangeError("Order not found")]
+            result = await exchange.cancel_order(order["id"], SYMBOL)
+            assert result["status"] == "canceled" and int(order["id"]) not in server._orders
+        finally:
+            await exchange.close()
+
+    asyncio.run(main())
@@ -0,0 +1,79 @@
+# =========================================================
+# SIGNING GOLDEN VECTORS
+# =========================================================
+# The signed message must stay byte for byte what the original
+# sort_json_keys + json.dumps implementation produced, for every backend.
+
+import json
+
+import base58
+import pytest
+from solders.keypair import Keypair
+
+from pacifica_ccxt_adapter.signing import (
+    json_backend,
+    prepare_message,
+    prepare_signed_message,
+    sign_message,
+    sort_json_keys,
+)
+
+KEYPAIR = Keypair.from_seed(bytes(range(32)))
+TIMESTAMP = 1700000000123
+EXPIRY_WINDOW = 5000
+
+PAYLOADS = {
+    "create_order": {
+        "symbol": "BTC", "side": "bid", "amount": "0.001", "price": "100000.5",
+        "client_order_id": "0b3d1f9e-7c55-4f0e-9b1e-1a2b3c4d5e6f", "tif": "gtc", "reduce_only": False,
+    },
+    "nested": {
+        "z": {"b": [3, {"y": 1, "x": [{"d": None, "c": True}]}], "a": {}},
+        "take_profit": {"stop_price": "1", "limit_price": "1", "client_order_id": "tp"},
+        "empty": [], "zero": 0, "negative": -7,
+    },
+    "unicode": {"label": "café ✓ 日本", "emoji": "🚀", "symbol": "kBONK"},
+    "escaped": {"quote": 'say "hi"', "backslash": "a\\b", "control": "\t\n\r\x00\x1f", "slash": "a/b", "sep": " "},
+    "big_int": {"order_id": 2 ** 64 + 1, "nonce": -(2 ** 70), "max_u64": 2 ** 64 - 1, "max_i64": 2 ** 63 - 1},
+    "empty": {},
+}
+
+
+def reference_message(type_name: str, payload: dict) -> str:
+    # the implementation the adapter shipped with
+    header = {"type": type_name, "timestamp": TIMESTAMP, "expiry_window": EXPIRY_WINDOW}
+    return json.dumps(sort_json_keys({**header, "data": payload}), separators=(",", ":"))
+
+
+@pytest.mark.parametrize("name", sorted(PAYLOADS))
+@pytest.mark.parametrize("backend", ["json", "orjson"])
+def test_prepare_signed_message_matches_reference(name, backend):
+    payload = PAYLOADS[name]
+    message = prepare_signed_message(name, TIMESTAMP, EXPIRY_WINDOW, payload, json_backend(backend))
+    assert message.encode("utf-8") == reference_message(name, payload).encode("utf-8")
+
+
+@pytest.mark.parametrize("name", sorted(PAYLOADS))
+def test_prepare_message_matches_reference(name):
+    header = {"type": name, "timestamp": TIMESTAMP, "expiry_window": EXPIRY_WINDOW}
+    assert prepare_message(header, PAYLOADS[name]) == reference_message(name, PAYLOADS[name])
+
+
+def test_golden_message_bytes():
+    message = prepare_signed_message("cancel_order", TIMESTAMP, EXPIRY_WINDOW, {"symbol": "BTC", "order_id": 42})
+    assert message == (
+        '{"data":{"order_id":42,"symbol":"BTC"},"expiry_window":5000,'
+        '"timestamp":1700000000123,"type":"cancel_order"}'
+    )
+
+
+@pytest.mark.parametrize("name", sorted(PAYLOADS))
+def test_sign_message_matches_base58_of_signature_bytes(name):
+    message = reference_message(name, PAYLOADS[name])
+    expected = base58.b58encode(bytes(KEYPAIR.sign_message(message.encode("utf-8")))).decode("utf-8")
+    assert sign_message(message, KEYPAIR) == expected
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        json_backend("ujson")
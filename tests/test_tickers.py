@@ -0,0 +1,23 @@
+# =========================================================
+# TICKERS (ONE INDEXED PRICES SNAPSHOT)
+# =========================================================
+
+from tests.conftest import SYMBOL
+
+
+def test_ticker_scan_indexes_the_snapshot_once(server, exchange):
+    exchange.cache.ttls["/info/prices"] = 60  # one snapshot for the whole test
+    index = exchange._index_prices
+    calls = []
+    exchange._index_prices = lambda prices: calls.append(len(prices)) or index(prices)
+
+    tickers = [exchange.fetch_ticker(symbol) for symbol in exchange.symbols]
+    assert [t["symbol"] for t in tickers] == exchange.symbols
+    assert calls == [len(exchange.symbols)]
+    assert server.counts["GET /info/prices"] == 1
+
+    # positions and funding rates read the same indexed snapshot
+    exchange.fetch_positions()
+    assert SYMBOL in exchange.fetch_funding_rates()
+    assert calls == [len(exchange.symbols)]
+    assert server.counts["GET /info/prices"] == 1
@@ -0,0 +1,104 @@
+# =========================================================
+# WEBSOCKET BOOK REPLAY
+# =========================================================
+# Recorded book frames are fed through the websocket client's dispatch
+# into the async exchange, without a network connection.
+
+import asyncio
+import json
+
+from solders.keypair import Keypair
+
+from pacifica_ccxt_adapter.async_support import Pacifica
+
+SYMBOL = "BTC/USDC:USDC"
+
+
+def frame(sequence, best_bid, best_ask, size="1.0"):
+    return {"channel": "book", "data": {"s": "BTC", "t": 1700000000000 + sequence, "li": sequence, "l": [
+        [{"p": str(best_bid - i), "a": size, "n": 1} for i in range(3)],
+        [{"p": str(best_ask + i), "a": size, "n": 1} for i in range(3)],
+    ]}}
+
+
+RECORDED = [
+    frame(10, 100, 101),
+    frame(11, 99, 100, "2.5"),
+    frame(9, 50, 51),  # replayed out of order: older than the book
+    frame(12, 98, 99),
+]
+
+
+def replay(exchange, frames):
+    for message in frames:
+        exchange.ws._dispatch(json.dumps(message))
+        yield exchange.local_books.get(SYMBOL)
+
+
+def run(test):
+    async def main():
+        exchange = Pacifica({"l1walletAddress": "replay", "privateKey": str(Keypair()), "enableRateLimit": False})
+        exchange._ws_client()
+        resubscribed = []
+
+        async def resubscribe(key):
+            resubscribed.append(key)
+
+        exchange.ws.resubscribe = resubscribe
+        try:
+            await test(exchange, resubscribed)
+        finally:
+            await exchange.close()
+
+    asyncio.run(main())
+
+
+def test_snapshots_replace_the_book():
+    async def test(exchange, resubscribed):
+        books = list(replay(exchange, RECORDED[:2]))
+        book = books[-1]
+        assert book.valid and book.sequence == 11 and book.timestamp == 1700000000011
+        assert book.bids(2) == [[99.0, 2.5], [98.0, 2.5]]
+        assert book.asks(1) == [[100.0, 2.5]]
+        assert resubscribed == []
+
+    run(test)
+
+
+def test_stale_frame_invalidates_and_resubscribes():
+    async def test(exchange, resubscribed):
+        books = list(replay(exchange, RECORDED[:3]))
+        await asyncio.sleep(0)  # let the scheduled resubscribe run
+        assert not books[-1].valid
+        assert books[-1].sequence == 11  # the stale frame was not applied
+        assert resubscribed == ["book:BTC"]
+
+        book = list(replay(exchange, RECORDED[3:]))[-1]
+        assert book.valid and book.sequence == 12 and book.best_bid() == 98.0
+
+    run(test)
+
+
+def test_reconnect_invalidates_until_next_snapshot():
+    async def test(exchange, resubscribed):
+        book = list(replay(exchange, RECORDED[:1]))[-1]
+        assert book.valid
+
+        exchange._on_ws_connect()
+        assert not book.valid
+
+        book = list(replay(exchange, [frame(20, 97, 98)]))[-1]
+        assert book.valid and book.best_ask() == 98.0
+
+    run(test)
+
+
+def test_watch_order_book_resolves_from_replayed_frame():
+    async def test(exchange, resubscribed):
+        future = exchange.ws.future("orderbook:" + SYMBOL)
+        list(replay(exchange, RECORDED[:1]))
+        book = exchange._local_book_to_ccxt(await asyncio.wait_for(future, 1), limit=2)
+        assert book["bids"] == [[100.0, 1.0], [99.0, 1.0]]
+        assert book["nonce"] == 10
+
+    run(test)